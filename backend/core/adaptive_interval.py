@@ -0,0 +1,137 @@
+"""
+Adaptive polling interval
+Polls fast when price is volatile or close to a trigger level, slowly in
+quiet markets, and never faster than the request budget allows
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .events import TickEvent
+
+
+@dataclass
+class _PairState:
+    variance: Optional[float] = None  # EWMA of squared log return per second
+    last_ts: Optional[float] = None
+    last_price: Optional[float] = None
+    triggers: List[float] = field(default_factory=list)
+
+
+class AdaptiveScheduler:
+    """Chooses the delay before the next price poll.
+
+    Volatility is an EWMA of squared log returns per second (time-decayed,
+    so irregular tick spacing is fine). Treating price as a random walk, the
+    time for a `z_score`-sigma move to cover the log distance `d` to the
+    nearest trigger is `(d / (z * sigma))**2`; that is the desired interval,
+    clamped to `[min_interval, max_interval]`. A token bucket refilled at
+    `max_requests_per_hour` (each poll costs `requests_per_poll`) then
+    stretches the interval whenever the budget is running low.
+
+    Use it as `PollingFeed(interval_seconds=scheduler)`; strategies keep
+    `set_triggers()` up to date with the prices they act on.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 5.0,
+        max_interval: float = 60.0,
+        max_requests_per_hour: float = 360.0,
+        requests_per_poll: float = 1.0,
+        halflife_seconds: float = 600.0,
+        z_score: float = 2.0,
+        burst_seconds: float = 300.0,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Need 0 < min_interval <= max_interval")
+        if max_requests_per_hour <= 0:
+            raise ValueError("max_requests_per_hour must be positive")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_poll = requests_per_poll
+        self.halflife_seconds = halflife_seconds
+        self.z_score = z_score
+        self._refill_rate = max_requests_per_hour / 3600.0
+        self._capacity = max(requests_per_poll, self._refill_rate * burst_seconds)
+        self._tokens = self._capacity
+        self._last_poll: Optional[float] = None
+
+        self._series: Dict[str, _PairState] = {}
+        self.last_interval = max_interval
+
+    def _state(self, pair: str) -> "_PairState":
+        state = self._series.get(pair)
+        if state is None:
+            state = self._series[pair] = _PairState()
+        return state
+
+    def volatility(self, pair: str = "SOL/USDC") -> Optional[float]:
+        """EWMA volatility of log returns per sqrt(second)."""
+        variance = self._state(pair).variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def set_triggers(self, levels: Iterable[Optional[float]], pair: str = "SOL/USDC") -> None:
+        """Prices that would make a strategy act (buy dip, take profit, stop...)."""
+        self._state(pair).triggers = [float(p) for p in levels if p]
+
+    def observe(self, timestamp: float, price: float, pair: str = "SOL/USDC") -> None:
+        if price <= 0:
+            return
+        state = self._state(pair)
+        if state.last_ts is not None and timestamp > state.last_ts:
+            dt = timestamp - state.last_ts
+            sample = math.log(price / state.last_price) ** 2 / dt
+            if state.variance is None:
+                state.variance = sample
+            else:
+                decay = 0.5 ** (dt / self.halflife_seconds)
+                state.variance = decay * state.variance + (1 - decay) * sample
+        state.last_ts = timestamp
+        state.last_price = price
+
+    def trigger_distance(self, pair: str = "SOL/USDC") -> Optional[float]:
+        """Absolute log distance from the last price to the nearest trigger."""
+        state = self._state(pair)
+        if not state.last_price or not state.triggers:
+            return None
+        return min(abs(math.log(level / state.last_price)) for level in state.triggers)
+
+    def desired_interval(self) -> float:
+        """Interval from volatility and trigger distance alone (no budget).
+
+        With several pairs the most urgent one decides.
+        """
+        interval = self.max_interval
+        for pair in self._series:
+            distance = self.trigger_distance(pair)
+            sigma = self.volatility(pair)
+            if distance is None or not sigma:
+                continue
+            seconds = (distance / (self.z_score * sigma)) ** 2
+            interval = min(interval, max(self.min_interval, seconds))
+        return interval
+
+    def next_interval(self, now: float) -> float:
+        """Spend one poll's worth of budget at `now` and return the delay to the next."""
+        if self._last_poll is not None:
+            elapsed = max(0.0, now - self._last_poll)
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._refill_rate)
+        self._last_poll = now
+        self._tokens -= self.requests_per_poll
+
+        interval = self.desired_interval()
+        shortfall = self.requests_per_poll - (self._tokens + interval * self._refill_rate)
+        if shortfall > 0:
+            interval += shortfall / self._refill_rate
+        self.last_interval = interval
+        return interval
+
+    def __call__(self, ticks: Sequence[TickEvent], now: float) -> float:
+        """`PollingFeed` hook: learn from the ticks just polled, return the next delay."""
+        for tick in ticks:
+            self.observe(tick.timestamp, tick.price, tick.pair)
+        return self.next_interval(now)
@@ -0,0 +1,367 @@
+"""
+Vectorized backtesting for the buy-dip / sell-rise / stop-loss strategy
+Replays recorded tick arrays with NumPy instead of one wall-clock tick at a time
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .price_buffer import PriceWindow
+
+
+# ---------------------------------------------------------------------------
+# Tick files
+# ---------------------------------------------------------------------------
+
+def load_ticks(path) -> PriceWindow:
+    """Load recorded ticks from `.npz` (timestamps, prices[, volumes]) or
+    `.csv` (timestamp, price[, volume] columns, optional header row).
+
+    Ticks are returned sorted by timestamp.
+    """
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            ts = np.asarray(data["timestamps"], dtype=np.float64)
+            prices = np.asarray(data["prices"], dtype=np.float64)
+            volumes = (
+                np.asarray(data["volumes"], dtype=np.float64)
+                if "volumes" in data.files else np.zeros_like(prices)
+            )
+    elif path.suffix == ".csv":
+        with open(path, newline="") as f:
+            first = f.readline()
+        has_header = not first.split(",")[0].strip().replace(".", "", 1).isdigit()
+        raw = np.loadtxt(path, delimiter=",", skiprows=1 if has_header else 0, ndmin=2)
+        ts, prices = raw[:, 0], raw[:, 1]
+        volumes = raw[:, 2] if raw.shape[1] > 2 else np.zeros_like(prices)
+    else:
+        raise ValueError(f"Unsupported tick file: {path} (expected .npz or .csv)")
+
+    if not (ts.shape == prices.shape == volumes.shape):
+        raise ValueError("timestamps, prices and volumes must have the same length")
+    if ts.size > 1 and np.any(np.diff(ts) < 0):
+        order = np.argsort(ts, kind="stable")
+        ts, prices, volumes = ts[order], prices[order], volumes[order]
+    return PriceWindow(ts, prices, volumes)
+
+
+def save_ticks(path, timestamps, prices, volumes=None) -> None:
+    """Write ticks in the format `load_ticks` reads (by file extension)."""
+    path = Path(path)
+    ts = np.asarray(timestamps, dtype=np.float64)
+    px = np.asarray(prices, dtype=np.float64)
+    vol = np.zeros_like(px) if volumes is None else np.asarray(volumes, dtype=np.float64)
+    if path.suffix == ".npz":
+        np.savez_compressed(path, timestamps=ts, prices=px, volumes=vol)
+    elif path.suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "price", "volume"])
+            writer.writerows(zip(ts.tolist(), px.tolist(), vol.tolist()))
+    else:
+        raise ValueError(f"Unsupported tick file: {path} (expected .npz or .csv)")
+
+
+def synthetic_ticks(days: float, start_price: float = 150.0, seed: int = 7, start_time: float = 0.0) -> PriceWindow:
+    """Per-second geometric random walk, for trying the tools without recorded data."""
+    n = int(days * 86_400)
+    rng = np.random.default_rng(seed)
+    ts = start_time + np.arange(n, dtype=np.float64)
+    prices = start_price * np.exp(np.cumsum(rng.normal(0.0, 0.0003, n)))
+    return PriceWindow(ts, prices, np.zeros(n))
+
+
+# ---------------------------------------------------------------------------
+# Rolling extremes over time windows
+# ---------------------------------------------------------------------------
+
+def _block_scans(values: np.ndarray, block: int, offset: int, ufunc, fill: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-block prefix and suffix scans on a grid shifted right by `offset`."""
+    n = values.size + offset
+    padded = np.full(-(-n // block) * block, fill)
+    padded[offset:n] = values
+    blocks = padded.reshape(-1, block)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return prefix, suffix
+
+
+def _range_reduce(values: np.ndarray, lo: np.ndarray, hi: np.ndarray, ufunc, fill: float) -> np.ndarray:
+    """ufunc-reduce values[lo[k]:hi[k] + 1] for every query k.
+
+    Van Herk / Gil-Werman: with blocks of size S >= length, a range spans at
+    most two blocks and its extreme is ufunc(suffix[lo], prefix[hi]). Queries
+    are grouped by S = next power of two >= length; a range that sits inside
+    one block of the base grid always straddles a block boundary of the grid
+    offset by S/2, so every query is answered exactly in O(n) per group.
+    """
+    out = np.empty(lo.size)
+    length = hi - lo + 1
+    levels = np.ceil(np.log2(length)).astype(np.int64)
+    for level in np.unique(levels):
+        sel = np.flatnonzero(levels == level)
+        size = 1 << int(level)
+        qlo, qhi = lo[sel], hi[sel]
+        if size == 1:
+            out[sel] = values[qhi]
+            continue
+        prefix, suffix = _block_scans(values, size, 0, ufunc, fill)
+        res = ufunc(suffix[qlo], prefix[qhi])
+        same = (qlo // size) == (qhi // size)
+        # Inside one block the scans overshoot unless the range touches an edge
+        at_start = same & (qlo % size == 0)
+        res[at_start] = prefix[qhi[at_start]]
+        at_end = same & ~at_start & (qhi % size == size - 1)
+        res[at_end] = suffix[qlo[at_end]]
+        inexact = same & ~at_start & ~at_end
+        if inexact.any():
+            off = size // 2
+            prefix, suffix = _block_scans(values, size, off, ufunc, fill)
+            res[inexact] = ufunc(suffix[qlo[inexact] + off], prefix[qhi[inexact] + off])
+        out[sel] = res
+    return out
+
+
+def rolling_extremes(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    window_seconds: float,
+    chunk: int = 1 << 20,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Max and min of `values` over [t - window_seconds, t] for every tick t.
+
+    Works on irregular timestamps and matches `RollingWindow` exactly. Runs in
+    chunks so scratch memory stays O(chunk + window) for any series length.
+    """
+    ts = np.asarray(timestamps, dtype=np.float64)
+    vals = np.asarray(values, dtype=np.float64)
+    n = vals.size
+    starts = np.searchsorted(ts, ts - window_seconds, side="left")
+    highs = np.empty(n)
+    lows = np.empty(n)
+    for a in range(0, n, chunk):
+        b = min(n, a + chunk)
+        base = int(starts[a])
+        local = vals[base:b]
+        qlo = starts[a:b] - base
+        qhi = np.arange(a, b) - base
+        highs[a:b] = _range_reduce(local, qlo, qhi, np.maximum, -np.inf)
+        lows[a:b] = _range_reduce(local, qlo, qhi, np.minimum, np.inf)
+    return highs, lows
+
+
+def _first_crossing(prices: np.ndarray, start: int, level: float, below: bool) -> int:
+    """First index >= start where price <= level (below) or >= level; -1 if none.
+
+    Scans in doubling chunks so the work is proportional to the distance found.
+    """
+    n = prices.size
+    step = 256
+    while start < n:
+        seg = prices[start:start + step]
+        hits = seg <= level if below else seg >= level
+        if hits.any():
+            return start + int(hits.argmax())
+        start += seg.size
+        step = min(step * 2, 1 << 20)
+    return -1
+
+
+def _next_index(sorted_idx: np.ndarray, start: int) -> int:
+    k = int(np.searchsorted(sorted_idx, start, side="left"))
+    return int(sorted_idx[k]) if k < sorted_idx.size else -1
+
+
+# ---------------------------------------------------------------------------
+# Backtest
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BacktestConfig:
+    """Strategy and cost parameters (names follow `SOLTradingStrategy`)."""
+    buy_dip_threshold: float = 3.0  # Buy when price drops X% from recent high
+    sell_rise_threshold: float = 5.0  # Take profit at X% rise (see take_profit_from)
+    stop_loss_pct: float = 2.0  # Stop loss at X% below entry
+    lookback_minutes: float = 30.0  # Window for recent high / low
+    take_profit_from: str = "recent_low"  # "recent_low" (SOLTradingStrategy) or "entry" (SimpleTradingBot)
+    initial_usdc: float = 1000.0
+    min_trade_usdc: float = 5.0
+    max_trade_usdc: float = 100.0
+    balance_fraction: float = 0.2  # Use at most 20% of available USDC per buy
+    fee_bps: float = 30.0  # Pool fee charged on each fill
+    slippage_bps: float = 50.0  # Fill price worse than mid by this much
+    min_history: int = 3  # Ticks needed before the first signal
+
+
+@dataclass
+class BacktestTrade:
+    entry_index: int
+    exit_index: int  # -1 while still open at the end of the data
+    entry_time: float
+    exit_time: Optional[float]
+    entry_price: float  # Fill price including slippage
+    exit_price: Optional[float]
+    sol_amount: float
+    usdc_in: float
+    usdc_out: float
+    fees_usdc: float
+    pnl_usdc: float
+    reason: str  # "take_profit", "stop_loss" or "open"
+
+
+@dataclass
+class BacktestResult:
+    config: BacktestConfig
+    timestamps: np.ndarray
+    equity: np.ndarray  # Portfolio value in USDC at every tick
+    trades: List[BacktestTrade] = field(default_factory=list)
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity[-1]) if self.equity.size else self.config.initial_usdc
+
+    @property
+    def total_return_pct(self) -> float:
+        return (self.final_equity / self.config.initial_usdc - 1.0) * 100.0
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        if not self.equity.size:
+            return 0.0
+        peak = np.maximum.accumulate(self.equity)
+        return float(((peak - self.equity) / peak).max() * 100.0)
+
+    def summary(self) -> Dict[str, float]:
+        closed = [t for t in self.trades if t.reason != "open"]
+        wins = sum(1 for t in closed if t.pnl_usdc > 0)
+        return {
+            "ticks": int(self.equity.size),
+            "trades": len(closed),
+            "open_trades": len(self.trades) - len(closed),
+            "win_rate_pct": wins / len(closed) * 100.0 if closed else 0.0,
+            "fees_usdc": sum(t.fees_usdc for t in self.trades),
+            "final_equity": self.final_equity,
+            "total_return_pct": self.total_return_pct,
+            "max_drawdown_pct": self.max_drawdown_pct,
+        }
+
+
+class Backtester:
+    """Evaluate the dip/rise/stop strategy over a whole recorded series.
+
+    Signal masks (drop from rolling high, rise from rolling low) are computed
+    once with NumPy; the position state machine then jumps from signal to
+    signal, so Python-level work is per trade, not per tick. Rolling extremes
+    are cached per lookback, which makes repeated runs with different
+    thresholds (parameter sweeps) cheap.
+    """
+
+    def __init__(self, timestamps: np.ndarray, prices: np.ndarray) -> None:
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.float64)
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        if self.timestamps.shape != self.prices.shape:
+            raise ValueError("timestamps and prices must have the same length")
+        self._extremes: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_file(cls, path) -> "Backtester":
+        ticks = load_ticks(path)
+        return cls(ticks.timestamps, ticks.prices)
+
+    def extremes(self, lookback_minutes: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached (rolling high, rolling low) for a lookback."""
+        key = float(lookback_minutes)
+        if key not in self._extremes:
+            self._extremes[key] = rolling_extremes(self.timestamps, self.prices, key * 60.0)
+        return self._extremes[key]
+
+    def run(self, config: Optional[BacktestConfig] = None) -> BacktestResult:
+        cfg = config or BacktestConfig()
+        if cfg.take_profit_from not in ("recent_low", "entry"):
+            raise ValueError("take_profit_from must be 'recent_low' or 'entry'")
+        ts, px = self.timestamps, self.prices
+        n = px.size
+        if n == 0:
+            return BacktestResult(cfg, ts, np.empty(0))
+
+        high, low = self.extremes(cfg.lookback_minutes)
+        warm = np.arange(n) >= cfg.min_history - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            buy_idx = np.flatnonzero(warm & ((high - px) / high * 100.0 >= cfg.buy_dip_threshold))
+            rise_idx = np.flatnonzero((px - low) / low * 100.0 >= cfg.sell_rise_threshold)
+
+        fee = cfg.fee_bps / 10_000.0
+        slip = cfg.slippage_bps / 10_000.0
+        cash = cfg.initial_usdc
+        trades: List[BacktestTrade] = []
+
+        t = 0
+        while t < n:
+            i = _next_index(buy_idx, t)
+            if i < 0:
+                break
+            usdc_in = min(cfg.max_trade_usdc, cash * cfg.balance_fraction)
+            if usdc_in < cfg.min_trade_usdc:
+                break  # cash only changes on trades, so no later buy can size up either
+
+            signal_price = float(px[i])
+            fill_in = signal_price * (1.0 + slip)
+            fee_in = usdc_in * fee
+            sol = (usdc_in - fee_in) / fill_in
+            cash -= usdc_in
+
+            stop_j = _first_crossing(px, i + 1, signal_price * (1.0 - cfg.stop_loss_pct / 100.0), below=True)
+            if cfg.take_profit_from == "entry":
+                tp_j = _first_crossing(px, i + 1, signal_price * (1.0 + cfg.sell_rise_threshold / 100.0), below=False)
+            else:
+                tp_j = _next_index(rise_idx, i + 1)
+
+            candidates = [j for j in (stop_j, tp_j) if j >= 0]
+            if not candidates:
+                trades.append(BacktestTrade(
+                    i, -1, float(ts[i]), None, fill_in, None, sol,
+                    usdc_in, 0.0, fee_in, sol * float(px[-1]) - usdc_in, "open",
+                ))
+                break
+
+            j = min(candidates)
+            fill_out = float(px[j]) * (1.0 - slip)
+            gross = sol * fill_out
+            fee_out = gross * fee
+            usdc_out = gross - fee_out
+            cash += usdc_out
+            # Stop loss wins ties, matching the strategy's risk-first intent
+            reason = "stop_loss" if j == stop_j else "take_profit"
+            trades.append(BacktestTrade(
+                i, j, float(ts[i]), float(ts[j]), fill_in, fill_out, sol,
+                usdc_in, usdc_out, fee_in + fee_out, usdc_out - usdc_in, reason,
+            ))
+            t = j + 1
+
+        return BacktestResult(cfg, ts, self._equity_curve(cfg, trades), trades)
+
+    def _equity_curve(self, cfg: BacktestConfig, trades: List[BacktestTrade]) -> np.ndarray:
+        n = self.prices.size
+        sol_delta = np.zeros(n)
+        cash_delta = np.zeros(n)
+        for tr in trades:
+            sol_delta[tr.entry_index] += tr.sol_amount
+            cash_delta[tr.entry_index] -= tr.usdc_in
+            if tr.exit_index >= 0:
+                sol_delta[tr.exit_index] -= tr.sol_amount
+                cash_delta[tr.exit_index] += tr.usdc_out
+        sol = np.cumsum(sol_delta)
+        cash = cfg.initial_usdc + np.cumsum(cash_delta)
+        return cash + sol * self.prices
+
+
+def run_backtest(timestamps: np.ndarray, prices: np.ndarray, config: Optional[BacktestConfig] = None) -> BacktestResult:
+    """One-shot convenience wrapper around `Backtester`."""
+    return Backtester(timestamps, prices).run(config)
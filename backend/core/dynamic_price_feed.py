@@ -1,14 +1,20 @@
 """
-Dynamic Real-Time Price Feed for SOL
+Dynamic Real-Time Price Feed for SOL (and any other universe token)
 Updates constantly, no caching, always fresh market data
 """
 
+import json
 import requests
 import time
-from typing import Optional, Dict
+from typing import Iterable, Optional, Dict
 from dataclasses import dataclass
 from datetime import datetime
 
+from .clock import Clock, RealClock
+from .event_log import get_logger
+from .metrics import MetricsRegistry
+from .universe import Token, Universe
+
 
 @dataclass
 class LivePrice:
@@ -26,7 +32,9 @@ class DynamicPriceFeed:
     Every call gets NEW data from the market
     """
     
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None, metrics: Optional[MetricsRegistry] = None):
+        self.clock = clock or RealClock()
+        self.metrics = metrics  # Per-source request latency / failures
         self.last_update_time = 0
         self.update_count = 0
         
@@ -50,18 +58,36 @@ class DynamicPriceFeed:
         
         for fetch_func in sources:
             try:
-                price_data = fetch_func()
+                price_data = self._call_source(fetch_func)
                 if price_data and price_data.price_usd > 0:
-                    print(f"✅ Live price from {price_data.source}: ${price_data.price_usd:.2f} (update #{self.update_count})")
-                    self.last_update_time = time.time()
+                    get_logger().debug("live_price", "✅ Live price from {source}: ${price:.2f} (update #{update})",
+                                       source=price_data.source, price=price_data.price_usd, update=self.update_count)
+                    self.last_update_time = self.clock.time()
                     return price_data
             except Exception as e:
-                print(f"⚠️ {fetch_func.__name__} failed: {e}")
+                get_logger().warning("price_source_failed", "⚠️ {source} failed: {error}",
+                                     source=fetch_func.__name__, error=str(e))
                 continue
         
         # If all sources fail, raise error - DO NOT use stale/cached data
         raise RuntimeError("CRITICAL: All price sources failed! Cannot get live price.")
     
+    def _call_source(self, fetch_func, *args):
+        """Run one source request, recording its latency and failures per source"""
+        if self.metrics is None:
+            return fetch_func(*args)
+        source = fetch_func.__name__.replace("_fetch_", "").replace("_batch", "")
+        started = time.perf_counter()
+        try:
+            return fetch_func(*args)
+        except Exception:
+            self.metrics.counter("price_source_errors_total", "Failed price source requests").inc(source=source)
+            raise
+        finally:
+            self.metrics.histogram("price_source_seconds", "Price source request latency").observe(
+                time.perf_counter() - started, source=source
+            )
+    
     def _fetch_binance(self) -> LivePrice:
         """Binance - most liquid, fastest updates"""
         url = "https://api.binance.com/api/v3/ticker/bookTicker?symbol=SOLUSDT"
@@ -75,7 +101,7 @@ class DynamicPriceFeed:
         
         return LivePrice(
             price_usd=mid,
-            timestamp=time.time(),
+            timestamp=self.clock.time(),
             source="Binance",
             bid=bid,
             ask=ask
@@ -92,7 +118,7 @@ class DynamicPriceFeed:
         
         return LivePrice(
             price_usd=price,
-            timestamp=time.time(),
+            timestamp=self.clock.time(),
             source="CoinGecko"
         )
     
@@ -107,10 +133,107 @@ class DynamicPriceFeed:
         
         return LivePrice(
             price_usd=price,
-            timestamp=time.time(),
+            timestamp=self.clock.time(),
             source="Coinbase"
         )
     
+    def get_live_prices(self, tokens: Iterable[Token]) -> Dict[str, LivePrice]:
+        """
+        Get LIVE USD prices for many tokens in one cycle
+        
+        Each source is asked for every still-missing token in a single
+        batched request (Binance and CoinGecko) before falling back to the
+        next source, so N tokens cost about one request, not N.
+        USD-pegged tokens are priced at $1 without a lookup.
+        """
+        
+        self.update_count += 1
+        now = self.clock.time()
+        prices: Dict[str, LivePrice] = {}
+        missing = []
+        for token in tokens:
+            if token.usd_peg:
+                prices[token.symbol] = LivePrice(price_usd=1.0, timestamp=now, source="Peg")
+            else:
+                missing.append(token)
+        
+        sources = [
+            self._fetch_binance_batch,
+            self._fetch_coingecko_batch,
+            self._fetch_coinbase_batch,
+        ]
+        
+        for fetch_func in sources:
+            if not missing:
+                break
+            try:
+                found = self._call_source(fetch_func, missing)
+            except Exception as e:
+                get_logger().warning("price_source_failed", "⚠️ {source} failed: {error}",
+                                     source=fetch_func.__name__, error=str(e))
+                continue
+            for token in missing:
+                price_data = found.get(token.symbol)
+                if price_data and price_data.price_usd > 0:
+                    prices[token.symbol] = price_data
+            missing = [t for t in missing if t.symbol not in prices]
+        
+        if missing:
+            # DO NOT use stale/cached data for any token
+            raise RuntimeError(f"CRITICAL: No live price for {', '.join(t.symbol for t in missing)}")
+        
+        self.last_update_time = self.clock.time()
+        return prices
+    
+    def _fetch_binance_batch(self, tokens) -> Dict[str, LivePrice]:
+        """Binance - all USDT books in one request"""
+        symbols = {f"{t.symbol}USDT": t.symbol for t in tokens}
+        url = "https://api.binance.com/api/v3/ticker/bookTicker"
+        r = requests.get(url, params={"symbols": json.dumps(list(symbols), separators=(",", ":"))}, timeout=5)
+        r.raise_for_status()
+        
+        result = {}
+        for row in r.json():
+            bid = float(row["bidPrice"])
+            ask = float(row["askPrice"])
+            result[symbols[row["symbol"]]] = LivePrice(
+                price_usd=(bid + ask) / 2,
+                timestamp=self.clock.time(),
+                source="Binance",
+                bid=bid,
+                ask=ask
+            )
+        return result
+    
+    def _fetch_coingecko_batch(self, tokens) -> Dict[str, LivePrice]:
+        """CoinGecko - all ids in one request"""
+        ids = {t.coingecko_id: t.symbol for t in tokens if t.coingecko_id}
+        if not ids:
+            return {}
+        url = "https://api.coingecko.com/api/v3/simple/price"
+        r = requests.get(url, params={"ids": ",".join(ids), "vs_currencies": "usd"}, timeout=5)
+        r.raise_for_status()
+        
+        return {
+            ids[cg_id]: LivePrice(price_usd=float(row["usd"]), timestamp=self.clock.time(), source="CoinGecko")
+            for cg_id, row in r.json().items()
+            if cg_id in ids and "usd" in row
+        }
+    
+    def _fetch_coinbase_batch(self, tokens) -> Dict[str, LivePrice]:
+        """Coinbase - one USD rate table gives every listed token"""
+        url = "https://api.coinbase.com/v2/exchange-rates?currency=USD"
+        r = requests.get(url, timeout=5)
+        r.raise_for_status()
+        rates = r.json()["data"]["rates"]
+        
+        result = {}
+        for token in tokens:
+            rate = float(rates.get(token.symbol, 0) or 0)
+            if rate > 0:
+                result[token.symbol] = LivePrice(price_usd=1 / rate, timestamp=self.clock.time(), source="Coinbase")
+        return result
+    
     def get_spread_info(self) -> Dict:
         """Get bid-ask spread for better trade execution"""
         try:
@@ -136,10 +259,18 @@ class LivePriceOrcaClient:
     """
     Orca client with DYNAMIC real-time pricing
     Price updates before EVERY operation
+    Quotes any pair of tokens in the trading universe
     """
     
-    def __init__(self):
-        self.price_feed = DynamicPriceFeed()
+    def __init__(
+        self,
+        clock: Optional[Clock] = None,
+        universe: Optional[Universe] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.price_feed = DynamicPriceFeed(clock=clock, metrics=metrics)
+        self.metrics = metrics
+        self.universe = universe or Universe.default()
         self.base_url = "https://api.orca.so"
         self.timeout = 20
         
@@ -148,6 +279,17 @@ class LivePriceOrcaClient:
         live_data = self.price_feed.get_live_sol_price(force_fresh=True)
         return live_data.price_usd
     
+    def get_prices(self) -> Dict[str, float]:
+        """
+        Fresh price of every universe pair (QUOTE per 1 BASE)
+        One batched price fetch covers all pairs
+        """
+        live = self.price_feed.get_live_prices(self.universe.pair_tokens)
+        return {
+            pair.name: live[pair.base.symbol].price_usd / live[pair.quote.symbol].price_usd
+            for pair in self.universe
+        }
+    
     def get_quote(
         self,
         input_mint: str,
@@ -160,42 +302,41 @@ class LivePriceOrcaClient:
         Price is fetched NEW for this specific quote
         """
         
-        # CRITICAL: Get FRESH price for THIS quote
-        live_price_data = self.price_feed.get_live_sol_price(force_fresh=True)
-        current_sol_price = live_price_data.price_usd
-        
-        print(f"📊 Using LIVE price: ${current_sol_price:.2f} from {live_price_data.source}")
-        
-        # Token setup
-        SOL_MINT = "So11111111111111111111111111111111111111112"
-        USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
-        
-        # Calculate output based on CURRENT LIVE PRICE
-        if input_mint == SOL_MINT and output_mint == USDC_MINT:
-            # SOL → USDC
-            sol_amount = amount / 1_000_000_000  # Convert lamports to SOL
-            usdc_raw = sol_amount * current_sol_price
-            usdc_lamports = int(usdc_raw * 1_000_000)  # USDC has 6 decimals
-            
-            # Apply slippage
-            slippage_factor = (10000 - slippage_bps) / 10000
-            final_output = int(usdc_lamports * slippage_factor)
-            
-        elif input_mint == USDC_MINT and output_mint == SOL_MINT:
-            # USDC → SOL
-            usdc_amount = amount / 1_000_000  # Convert to USDC
-            sol_raw = usdc_amount / current_sol_price
-            sol_lamports = int(sol_raw * 1_000_000_000)  # SOL has 9 decimals
-            
-            # Apply slippage
-            slippage_factor = (10000 - slippage_bps) / 10000
-            final_output = int(sol_lamports * slippage_factor)
-            
-        else:
+        if self.metrics is None:
+            return self._live_quote(input_mint, output_mint, amount, slippage_bps)
+        with self.metrics.histogram("quote_seconds", "Quote latency").time(venue="orca"):
+            return self._live_quote(input_mint, output_mint, amount, slippage_bps)
+    
+    def _live_quote(self, input_mint: str, output_mint: str, amount: int, slippage_bps: int) -> Dict:
+        input_token = self.universe.token_by_mint(input_mint)
+        output_token = self.universe.token_by_mint(output_mint)
+        if input_token is None or output_token is None or input_token == output_token:
             raise RuntimeError(f"Unsupported pair: {input_mint} -> {output_mint}")
         
+        # CRITICAL: Get FRESH prices for THIS quote (both legs in one fetch)
+        live = self.price_feed.get_live_prices([input_token, output_token])
+        input_price = live[input_token.symbol]
+        output_price = live[output_token.symbol]
+        live_price_data = input_price if not input_token.usd_peg else output_price
+        
+        get_logger().debug(
+            "quote_price", "📊 Using LIVE price: {input} ${input_price:.4f}, {output} ${output_price:.4f} from {source}",
+            input=input_token.symbol, input_price=input_price.price_usd,
+            output=output_token.symbol, output_price=output_price.price_usd, source=live_price_data.source,
+        )
+        
+        # Calculate output based on CURRENT LIVE PRICES
+        input_amount = input_token.from_raw(amount)
+        output_amount = input_amount * input_price.price_usd / output_price.price_usd
+        output_raw = output_token.to_raw(output_amount)
+        
+        # Apply slippage
+        slippage_factor = (10000 - slippage_bps) / 10000
+        final_output = int(output_raw * slippage_factor)
+        
         # Get spread info for better execution
-        spread_info = self.price_feed.get_spread_info()
+        spread_info = self.price_feed.get_spread_info() if "SOL" in (input_token.symbol, output_token.symbol) else {}
+        sol_price = live.get("SOL")
         
         return {
             "inputMint": input_mint,
@@ -204,7 +345,9 @@ class LivePriceOrcaClient:
             "outAmount": str(final_output),
             "slippageBps": slippage_bps,
             "dex": "Orca",
-            "liveSolPrice": current_sol_price,
+            "liveSolPrice": sol_price.price_usd if sol_price else None,
+            "inputPriceUsd": input_price.price_usd,
+            "outputPriceUsd": output_price.price_usd,
             "priceSource": live_price_data.source,
             "priceTimestamp": live_price_data.timestamp,
             "spread": spread_info,
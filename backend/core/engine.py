@@ -0,0 +1,310 @@
+"""
+Event-driven strategy engine
+Feeds publish ticks, strategies react in on_tick / on_fill, and an execution
+worker consumes order intents from a queue
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Type, Union
+
+from .clock import Clock, RealClock, SimulatedClock
+from .events import ConfigChanged, FillEvent, OrderIntent, TickEvent
+from .metrics import MetricsRegistry
+from .tracing import Tracer, maybe_span
+
+Handler = Callable[[object], None]
+
+
+class EventEngine:
+    """Routes events from feeds and execution to subscribed handlers.
+
+    `publish` is thread-safe; handlers always run on the engine's dispatch
+    thread, one event at a time, so strategy state needs no locking.
+    Strategies are any object with `on_tick(TickEvent)` and/or
+    `on_fill(FillEvent)`; they trade by calling `engine.submit(intent)`.
+    Components with `on_config(ConfigChanged)` receive reloaded settings.
+
+    With a `risk` engine (`RiskEngine`), every submitted intent must pass
+    `risk.admit(intent)`; a refused one is answered with a REJECTED fill
+    instead of being queued. The risk engine sees ticks and fills before
+    any strategy.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, risk=None) -> None:
+        self.clock = clock or RealClock()
+        self.events: "queue.Queue[object]" = queue.Queue()
+        self.orders: "queue.Queue[OrderIntent]" = queue.Queue()
+        self._handlers: Dict[Type, List[Handler]] = {}
+        self._stop = threading.Event()
+        self.risk = risk
+        if risk is not None:
+            self.register(risk)
+
+    # --- Wiring ---
+    def subscribe(self, event_type: Type, handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def register(self, strategy) -> None:
+        """Subscribe a strategy's on_tick / on_fill / on_config and hand it the engine."""
+        if hasattr(strategy, "on_tick"):
+            self.subscribe(TickEvent, strategy.on_tick)
+        if hasattr(strategy, "on_fill"):
+            self.subscribe(FillEvent, strategy.on_fill)
+        if hasattr(strategy, "on_config"):
+            self.subscribe(ConfigChanged, strategy.on_config)
+        if hasattr(strategy, "attach"):
+            strategy.attach(self)
+
+    # --- Publishing ---
+    def publish(self, event: object) -> None:
+        self.events.put(event)
+
+    def submit(self, intent: OrderIntent) -> None:
+        """Queue an order intent for the execution component (after the risk check)."""
+        if self.risk is not None:
+            reason = self.risk.admit(intent)
+            if reason:
+                self.publish(FillEvent(intent, "REJECTED", self.clock.time(), detail=reason))
+                return
+        self.orders.put(intent)
+
+    # --- Dispatch ---
+    def dispatch(self, event: object) -> None:
+        for handler in self._handlers.get(type(event), ()):
+            handler(event)
+
+    def process_pending(self) -> int:
+        """Dispatch everything queued right now (synchronous/simulated use)."""
+        handled = 0
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return handled
+            self.dispatch(event)
+            handled += 1
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run(self, feeds: Sequence["PollingFeed"] = (), workers: Sequence["ExecutionWorker"] = ()) -> None:
+        """Run until `stop()` (or until a feed/handler raises).
+
+        With a `SimulatedClock` everything runs on this thread: feed polls are
+        scheduled on the clock's event queue and each one is followed by a
+        full drain of ticks, orders and fills, so replays are deterministic.
+        Otherwise feeds and workers get their own threads and this thread
+        dispatches events the moment they arrive.
+        """
+        self._stop.clear()
+        if isinstance(self.clock, SimulatedClock):
+            self._run_simulated(feeds, workers)
+        else:
+            self._run_threaded(feeds, workers)
+
+    def _run_simulated(self, feeds, workers) -> None:
+        clock = self.clock
+        for feed in feeds:
+            feed.schedule_on(clock)
+        self._drain(workers)
+        while not self._stop.is_set() and clock.pending():
+            clock.advance_to(clock.next_event_time())
+            self._drain(workers)
+
+    def _drain(self, workers) -> None:
+        while True:
+            busy = self.process_pending()
+            for worker in workers:
+                busy += worker.process_pending()
+            if not busy:
+                return
+
+    def _run_threaded(self, feeds, workers) -> None:
+        for worker in workers:
+            worker.start()
+        for feed in feeds:
+            feed.start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    event = self.events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.dispatch(event)
+        finally:
+            for feed in feeds:
+                feed.stop()
+            for worker in workers:
+                worker.stop()
+
+
+class PollingFeed:
+    """Polls a price source and publishes a `TickEvent` per observation.
+
+    `fetch` returns either a float price or an object with `price_usd`,
+    `timestamp`, `source` (and optionally `bid` / `ask`), such as `LivePrice`.
+    It may also return a mapping of pair name to either of those (e.g.
+    `LivePriceOrcaClient.get_prices`): every pair is then published from the
+    same poll, so one cycle updates the whole universe. One feed serves
+    every strategy registered on the engine.
+
+    `interval_seconds` is a fixed delay or a callable
+    `(ticks_just_polled, now) -> delay` such as `AdaptiveScheduler`.
+
+    With `metrics`, each poll's fetch time, failures and (in real time) how
+    late the poll started versus its schedule are recorded; with `tracer`,
+    each fetch is a "feed_fetch" span.
+    """
+
+    def __init__(
+        self,
+        engine: EventEngine,
+        fetch: Callable[[], object],
+        interval_seconds: Union[float, Callable[[List[TickEvent], float], float]],
+        pair: str = "SOL/USDC",
+        on_error: Optional[Callable[[Exception], None]] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        self.engine = engine
+        self.fetch = fetch
+        self.interval_seconds = interval_seconds
+        self.pair = pair
+        self.on_error = on_error
+        self.metrics = metrics
+        self.tracer = tracer
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def poll_once(self) -> List[TickEvent]:
+        with maybe_span(self.tracer, "feed_fetch", feed=self.pair):
+            data = self._fetch()
+        now = self.engine.clock.time()
+        items = data.items() if isinstance(data, Mapping) else [(self.pair, data)]
+        ticks = [self._tick(pair, value, now) for pair, value in items]
+        for tick in ticks:
+            self.engine.publish(tick)
+        return ticks
+
+    def _fetch(self) -> object:
+        if self.metrics is None:
+            data = self.fetch()
+        else:
+            started = time.perf_counter()
+            try:
+                data = self.fetch()
+            except Exception:
+                self.metrics.counter("feed_errors_total", "Failed feed polls").inc(feed=self.pair)
+                raise
+            self.metrics.histogram("feed_poll_seconds", "Feed fetch latency").observe(
+                time.perf_counter() - started, feed=self.pair
+            )
+        return data
+
+    def next_delay(self, ticks: List[TickEvent]) -> float:
+        if callable(self.interval_seconds):
+            return self.interval_seconds(ticks, self.engine.clock.time())
+        return self.interval_seconds
+
+    @staticmethod
+    def _tick(pair: str, data: object, now: float) -> TickEvent:
+        if isinstance(data, (int, float)):
+            return TickEvent(pair, float(data), now)
+        return TickEvent(
+            pair,
+            float(data.price_usd),
+            getattr(data, "timestamp", now),
+            getattr(data, "source", ""),
+            bid=getattr(data, "bid", None),
+            ask=getattr(data, "ask", None),
+        )
+
+    # --- Simulated time ---
+    def schedule_on(self, clock: SimulatedClock) -> None:
+        def poll() -> None:
+            ticks = self.poll_once()  # errors (e.g. ReplayFinished) end the simulation
+            clock.call_later(self.next_delay(ticks), poll)
+        clock.schedule(clock.time(), poll)
+
+    # --- Real time ---
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"feed-{self.pair}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        due: Optional[float] = None
+        while not self._stop.is_set():
+            if self.metrics is not None and due is not None:
+                self.metrics.histogram("loop_lag_seconds", "Poll start delay past its schedule").observe(
+                    max(0.0, time.monotonic() - due), feed=self.pair
+                )
+            ticks: List[TickEvent] = []
+            try:
+                ticks = self.poll_once()
+            except Exception as e:  # noqa: BLE001 - keep polling through source outages
+                if self.on_error:
+                    self.on_error(e)
+            delay = self.next_delay(ticks)
+            due = time.monotonic() + delay
+            self._stop.wait(delay)
+
+
+class ExecutionWorker:
+    """Consumes order intents and publishes the resulting fills.
+
+    `executor(intent) -> FillEvent` does the actual work (quote, swap,
+    confirmation...). It runs on the worker's own thread, so a slow
+    execution never holds up tick dispatch.
+    """
+
+    def __init__(self, engine: EventEngine, executor: Callable[[OrderIntent], FillEvent]) -> None:
+        self.engine = engine
+        self.executor = executor
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def execute(self, intent: OrderIntent) -> FillEvent:
+        try:
+            fill = self.executor(intent)
+        except Exception as e:  # noqa: BLE001 - report failures as rejected fills
+            fill = FillEvent(intent, "REJECTED", self.engine.clock.time(), detail=str(e))
+        self.engine.publish(fill)
+        return fill
+
+    def process_pending(self) -> int:
+        handled = 0
+        while True:
+            try:
+                intent = self.engine.orders.get_nowait()
+            except queue.Empty:
+                return handled
+            self.execute(intent)
+            handled += 1
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="execution", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                intent = self.engine.orders.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.execute(intent)
@@ -0,0 +1,214 @@
+"""
+Structured event logging for the hot path
+Callers hand over an event name and raw fields; filtering happens up front,
+formatting and I/O happen later on a background writer thread
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+from .clock import Clock, RealClock
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+_LEVEL_NAMES = {v: k for k, v in LEVELS.items()}
+
+Record = Tuple[float, int, str, Optional[str], Dict[str, Any]]
+
+
+class EventLogger:
+    """Buffered structured logger with a background JSON-lines writer.
+
+    `info("tick", "📊 Check #{iteration}", iteration=n, price=p)` costs a
+    level check, a sampling check and a deque append on the calling thread.
+    Field values that are callables are only called once the record passed
+    both checks, so expensive fields cost nothing when filtered out.
+
+    The writer thread wakes every `flush_interval` seconds and emits each
+    record as compact JSON (`{"ts":..,"level":"INFO","event":"tick",...}`)
+    to `json_path` and/or `json_stream`, and — when `console` is on — the
+    human-readable `msg` template formatted with the record's fields (plus
+    `{time}` as HH:MM:SS) to stdout. All output of one wake-up is a single
+    write per sink.
+
+    `sample` maps event names to the fraction of DEBUG/INFO records kept
+    (e.g. `{"tick": 0.1}` keeps every 10th tick); warnings and errors are
+    never sampled. When more than `capacity` records are waiting, new ones
+    are dropped and counted in `dropped` — or, with `block_when_full`
+    (replays, where every record matters more than latency), the caller
+    flushes them itself.
+    """
+
+    def __init__(
+        self,
+        level: Union[int, str] = INFO,
+        console: bool = True,
+        json_path: Optional[Union[str, Path]] = None,
+        json_stream: Optional[IO[str]] = None,
+        sample: Optional[Mapping[str, float]] = None,
+        capacity: int = 10_000,
+        flush_interval: float = 0.5,
+        clock: Optional[Clock] = None,
+        block_when_full: bool = False,
+    ) -> None:
+        self.level = LEVELS[level.upper()] if isinstance(level, str) else int(level)
+        self.console = console
+        self.json_stream = json_stream
+        self.sample = dict(sample or {})
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.block_when_full = block_when_full
+        self.clock = clock or RealClock()
+        self.dropped = 0
+
+        self._json_file = None
+        if json_path:
+            path = Path(json_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._json_file = open(path, "a", buffering=1 << 16)
+
+        self._has_sink = bool(console or self._json_file is not None or json_stream is not None)
+        self._records: Deque[Record] = deque()
+        self._sample_credit: Dict[str, float] = {}
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    # --- Producer side (any thread) ---
+    def is_enabled(self, level: int) -> bool:
+        return level >= self.level and self._has_sink
+
+    def log(self, level: int, event: str, msg: Optional[str] = None, **fields: Any) -> None:
+        if level < self.level or not self._has_sink or self._closed:
+            return
+        rate = self.sample.get(event)
+        if rate is not None and level < WARNING:
+            credit = self._sample_credit.get(event, 1.0)
+            if credit < 1.0:
+                self._sample_credit[event] = credit + rate
+                return
+            self._sample_credit[event] = credit - 1.0 + rate
+        if len(self._records) >= self.capacity:
+            if not self.block_when_full:
+                self.dropped += 1
+                return
+            self.flush()
+        for key, value in fields.items():
+            if callable(value):
+                fields[key] = value()
+        self._records.append((self.clock.time(), level, event, msg, fields))
+        if self._thread is None:
+            self._start()
+
+    def debug(self, event: str, msg: Optional[str] = None, **fields: Any) -> None:
+        self.log(DEBUG, event, msg, **fields)
+
+    def info(self, event: str, msg: Optional[str] = None, **fields: Any) -> None:
+        self.log(INFO, event, msg, **fields)
+
+    def warning(self, event: str, msg: Optional[str] = None, **fields: Any) -> None:
+        self.log(WARNING, event, msg, **fields)
+
+    def error(self, event: str, msg: Optional[str] = None, **fields: Any) -> None:
+        self.log(ERROR, event, msg, **fields)
+
+    # --- Writer ---
+    def _start(self) -> None:
+        with self._write_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="event-log", daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything buffered so far (safe from any thread)."""
+        with self._write_lock:
+            batch: List[Record] = []
+            while self._records:
+                batch.append(self._records.popleft())
+            if not batch:
+                return
+            if self._json_file is not None or self.json_stream is not None:
+                lines = "".join(_json_line(record) for record in batch)
+                for sink in (self._json_file, self.json_stream):
+                    if sink is not None:
+                        sink.write(lines)
+                        sink.flush()
+            if self.console:
+                text = "".join(_console_line(record) for record in batch)
+                if text:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._closed = True
+        self._wake.set()
+        with self._write_lock:
+            if self._json_file is not None:
+                self._json_file.close()
+                self._json_file = None
+
+
+def _json_line(record: Record) -> str:
+    ts, level, event, _, fields = record
+    data = {"ts": round(ts, 3), "level": _LEVEL_NAMES.get(level, str(level)), "event": event}
+    data.update(fields)
+    return json.dumps(data, separators=(",", ":"), default=str, ensure_ascii=False) + "\n"
+
+
+def _console_line(record: Record) -> str:
+    ts, level, event, msg, fields = record
+    if msg is None:
+        details = " ".join(f"{k}={v}" for k, v in fields.items())
+        return f"{_LEVEL_NAMES.get(level, level)} {event} {details}\n"
+    try:
+        return msg.format(time=time.strftime("%H:%M:%S", time.localtime(ts)), **fields) + "\n"
+    except Exception:  # e.g. None into {price:.2f}: one bad record must not stop the writer
+        return msg + "\n"
+
+
+_logger: Optional[EventLogger] = None
+_logger_lock = threading.Lock()
+
+
+def configure(**kwargs: Any) -> EventLogger:
+    """Replace the process-wide logger (see `EventLogger` for options)."""
+    global _logger
+    with _logger_lock:
+        previous, _logger = _logger, EventLogger(**kwargs)
+    if previous is not None:
+        previous.close()
+    return _logger
+
+
+def get_logger() -> EventLogger:
+    """Process-wide logger; console output at INFO until `configure()` is called."""
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = EventLogger()
+    return _logger
+
+
+def parse_sample(spec: str) -> Dict[str, float]:
+    """Parse "tick=0.1,price=0.05" into `{"tick": 0.1, "price": 0.05}`."""
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        event, _, rate = part.partition("=")
+        rates[event.strip()] = float(rate)
+    return rates
@@ -0,0 +1,60 @@
+"""
+Event types shared by feeds, strategies and execution
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+_intent_ids = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class TickEvent:
+    """A new market price published by a feed."""
+    pair: str  # e.g. "SOL/USDC"
+    price: float
+    timestamp: float
+    source: str = ""
+    volume: float = 0.0
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+
+
+@dataclass
+class OrderIntent:
+    """A strategy's request to trade, consumed by the execution component."""
+    strategy_id: str
+    pair: str
+    side: str  # "BUY" or "SELL" (of the base token)
+    amount: float  # Base token units (e.g. SOL)
+    price: float  # Reference price the decision was made at
+    timestamp: float
+    reason: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    intent_id: int = field(default_factory=lambda: next(_intent_ids))
+
+
+@dataclass
+class FillEvent:
+    """Outcome of executing an `OrderIntent`."""
+    intent: OrderIntent
+    status: str  # "FILLED", "CANCELLED", "REJECTED" or "UNCONFIRMED" (sent, outcome unknown)
+    timestamp: float
+    filled_amount: float = 0.0
+    fill_price: Optional[float] = None
+    signature: Optional[str] = None
+    detail: str = ""
+
+    @property
+    def filled(self) -> bool:
+        return self.status == "FILLED"
+
+
+@dataclass(frozen=True)
+class ConfigChanged:
+    """New validated settings (e.g. `BotSettings`), delivered to every `on_config` handler."""
+    settings: Any
+    source: str = ""
@@ -0,0 +1,413 @@
+"""
+HTTP record and replay
+Captures every outgoing HTTP/RPC exchange (requests and httpx, so price
+sources, Orca, Jupiter, Solana RPC and Discord) to a compressed tape, and
+serves a tape back in place of the network for offline sessions
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Deque, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:  # solana-py's RPC client
+    import httpx
+except ImportError:  # pragma: no cover - httpx ships with solana
+    httpx = None
+
+TAPE_VERSION = 1
+
+# Hosts grouped per service, for summaries (first match wins)
+SERVICES = (
+    ("binance", "binance.com"),
+    ("coingecko", "coingecko.com"),
+    ("coinbase", "coinbase.com"),
+    ("orca", "orca.so"),
+    ("jupiter", "jup.ag"),
+    ("discord", "discord.com"),
+    ("discord", "discordapp.com"),
+    ("rpc", "solana.com"),
+    ("rpc", "helius"),
+    ("rpc", "quiknode"),
+)
+
+# Response headers worth keeping (content decoding and rate limits)
+_KEEP_HEADER = re.compile(r"content-type|retry-after|x-ratelimit-.*", re.IGNORECASE)
+_SECRET_PARAM = re.compile(r"key|token|secret|auth", re.IGNORECASE)
+_WEBHOOK_PATH = re.compile(r"(/api/webhooks/\d+/)[^/?]+")
+# Framing headers that no longer apply once the body has been read (decoded)
+_FRAMING_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def redact_url(url: str, rpc_hosts: Collection[str] = ()) -> str:
+    """URL with credentials masked.
+
+    Masks API key query parameters and Discord webhook tokens. RPC
+    endpoints (known RPC providers, plus `rpc_hosts`, e.g. the host of
+    RPC_URL) keep only scheme and host, since providers put the key in the
+    path (`https://x.solana-mainnet.quiknode.pro/<key>/`).
+    """
+    parts = urlsplit(url)
+    params = [(k, "***" if _SECRET_PARAM.search(k) else v) for k, v in parse_qsl(parts.query, True)]
+    query = urlencode(params, safe="*")
+    path = _WEBHOOK_PATH.sub(r"\1***", parts.path)
+    if path.strip("/") and service_of(url, rpc_hosts) == "rpc":
+        path = "/***"
+    return urlunsplit((parts.scheme, parts.netloc, path, query, ""))
+
+
+def service_of(url: str, rpc_hosts: Collection[str] = ()) -> str:
+    host = urlsplit(url).netloc.lower()
+    if host in rpc_hosts:
+        return "rpc"
+    for service, pattern in SERVICES:
+        if pattern in host:
+            return service
+    return "rpc" if "rpc" in host else host or "other"
+
+
+def rpc_hosts_of(urls: Iterable[Optional[str]]) -> FrozenSet[str]:
+    """Hosts of the given RPC endpoint URLs (empty entries skipped)."""
+    return frozenset(urlsplit(url).netloc.lower() for url in urls if url)
+
+
+def _rpc_method(body: Optional[bytes]) -> Optional[str]:
+    """JSON-RPC method name of a request body (Solana RPC), if it is one."""
+    if not body or not body.lstrip().startswith(b"{"):
+        return None
+    try:
+        return json.loads(body).get("method")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _kept_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    return {name: value for name, value in headers.items() if _KEEP_HEADER.fullmatch(name)}
+
+
+def _encode(body: Optional[bytes]) -> Tuple[str, bool]:
+    """Body as text, or base64 when it is not UTF-8 (second item True)."""
+    if not body:
+        return "", False
+    try:
+        return body.decode("utf-8"), False
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode("ascii"), True
+
+
+@dataclass
+class Exchange:
+    """One recorded request and its response."""
+    seq: int
+    offset: float  # Seconds since the recording started
+    elapsed: float  # Request latency in seconds
+    service: str
+    method: str
+    url: str  # Redacted
+    body: str = ""
+    body_b64: bool = False
+    status: int = 0
+    headers: Dict[str, str] = field(default_factory=dict)  # Content type and rate-limit headers
+    response: str = ""
+    response_b64: bool = False
+    error: str = ""  # Connection-level failure instead of a response
+
+    @property
+    def request_body(self) -> bytes:
+        return base64.b64decode(self.body) if self.body_b64 else self.body.encode("utf-8")
+
+    @property
+    def content(self) -> bytes:
+        return base64.b64decode(self.response) if self.response_b64 else self.response.encode("utf-8")
+
+    @property
+    def exact_key(self) -> Tuple[str, str, bytes]:
+        return self.method, self.url, self.request_body
+
+    @property
+    def loose_key(self) -> Tuple[str, str, Optional[str]]:
+        return self.method, self.url, _rpc_method(self.request_body)
+
+    def to_json(self) -> Dict[str, Any]:
+        row = {"seq": self.seq, "t": round(self.offset, 6), "dt": round(self.elapsed, 6),
+               "svc": self.service, "m": self.method, "url": self.url, "st": self.status}
+        for key, value in (("b", self.body), ("b64", self.body_b64), ("h", self.headers),
+                           ("r", self.response), ("r64", self.response_b64), ("err", self.error)):
+            if value:
+                row[key] = value
+        return row
+
+    @classmethod
+    def from_json(cls, row: Dict[str, Any]) -> "Exchange":
+        return cls(
+            row["seq"], row["t"], row["dt"], row["svc"], row["m"], row["url"],
+            row.get("b", ""), row.get("b64", False), row["st"], row.get("h", {}),
+            row.get("r", ""), row.get("r64", False), row.get("err", ""),
+        )
+
+
+def read_tape(path: Union[str, Path]) -> Tuple[Dict[str, Any], List[Exchange]]:
+    """(header, exchanges) of a tape; a tape cut short by a crash reads up to the damage."""
+    header: Dict[str, Any] = {}
+    exchanges: List[Exchange] = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                row = json.loads(line)
+                if "version" in row:
+                    header = row
+                else:
+                    exchanges.append(Exchange.from_json(row))
+        except (EOFError, ValueError):
+            pass
+    return header, exchanges
+
+
+class _Interceptor:
+    """Installs itself as the HTTP transport of requests and httpx until `uninstall()`."""
+
+    _active: Optional["_Interceptor"] = None
+    _original_send = HTTPAdapter.send
+    _original_handle = httpx.HTTPTransport.handle_request if httpx else None
+    rpc_hosts: FrozenSet[str] = frozenset()
+
+    def _redact(self, url: str) -> str:
+        return redact_url(url, self.rpc_hosts)
+
+    def install(self) -> "_Interceptor":
+        if _Interceptor._active is not None:
+            raise RuntimeError("An HTTP recorder or replayer is already installed")
+        _Interceptor._active = self
+        interceptor = self
+
+        def send(adapter, request, **kwargs):
+            return interceptor._requests_send(adapter, request, **kwargs)
+
+        HTTPAdapter.send = send
+        if httpx is not None:
+            def handle_request(transport, request):
+                return interceptor._httpx_handle(transport, request)
+
+            httpx.HTTPTransport.handle_request = handle_request
+        return self
+
+    def uninstall(self) -> None:
+        if _Interceptor._active is self:
+            HTTPAdapter.send = _Interceptor._original_send
+            if httpx is not None:
+                httpx.HTTPTransport.handle_request = _Interceptor._original_handle
+            _Interceptor._active = None
+
+    def __enter__(self) -> "_Interceptor":
+        return self.install()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.uninstall()
+
+    def _requests_send(self, adapter, request, **kwargs):
+        raise NotImplementedError
+
+    def _httpx_handle(self, transport, request):
+        raise NotImplementedError
+
+
+class HttpRecorder(_Interceptor):
+    """Records every HTTP exchange to a gzip-compressed JSON-lines tape.
+
+    `install()` (or `with HttpRecorder(path):`) wraps the transports under
+    `requests` (every `requests.get`/`post` and `Session`) and `httpx`
+    (solana-py's RPC client). Calls go to the network as usual, and each
+    request and its response, or its connection error, is appended with
+    its start offset and latency. Request headers are not kept, and
+    credentials in URLs are masked (`redact_url`): API key query
+    parameters, Discord webhook tokens and RPC endpoint paths. Pass the
+    configured RPC endpoints as `rpc_urls` so custom RPC hosts are masked
+    too (and pass the same to `HttpReplayer`). The tape is flushed every `flush_every` exchanges and on `close()`.
+    """
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 50, rpc_urls: Iterable[Optional[str]] = ()) -> None:
+        self.path = Path(path)
+        self.rpc_hosts = rpc_hosts_of(rpc_urls)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._write({"version": TAPE_VERSION, "started_at": self.started_at})
+        self.counts: Counter = Counter()
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+    def record(self, method: str, url: str, body: Optional[bytes], started: float, elapsed: float,
+               status: int = 0, headers: Optional[Mapping[str, str]] = None, content: Optional[bytes] = None,
+               error: str = "") -> None:
+        body_text, body_b64 = _encode(body)
+        response_text, response_b64 = _encode(content)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._seq += 1
+            exchange = Exchange(self._seq, started - self._origin, elapsed, service_of(url, self.rpc_hosts),
+                                method, self._redact(url), body_text, body_b64, status, _kept_headers(headers or {}),
+                                response_text, response_b64, error)
+            self._write(exchange.to_json())
+            self.counts[exchange.service] += 1
+            if self._seq % self.flush_every == 0:
+                self._file.flush()
+
+    def close(self) -> None:
+        self.uninstall()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _requests_send(self, adapter, request, **kwargs):
+        started = time.perf_counter()
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        try:
+            response = _Interceptor._original_send(adapter, request, **kwargs)
+        except requests.RequestException as e:
+            self.record(request.method, request.url, body, started, time.perf_counter() - started, error=repr(e))
+            raise
+        content = response.content  # Reads the body (streamed responses included)
+        self.record(request.method, request.url, body, started, time.perf_counter() - started,
+                    response.status_code, response.headers, content)
+        return response
+
+    def _httpx_handle(self, transport, request):
+        started = time.perf_counter()
+        body = request.read()
+        try:
+            response = _Interceptor._original_handle(transport, request)
+            content = response.read()
+        except httpx.HTTPError as e:
+            self.record(request.method, str(request.url), body, started, time.perf_counter() - started,
+                        error=repr(e))
+            raise
+        self.record(request.method, str(request.url), body, started, time.perf_counter() - started,
+                    response.status_code, response.headers, content)
+        # `content` is already decompressed: rebuilding with Content-Encoding
+        # would make httpx decode it a second time
+        headers = [(name, value) for name, value in response.headers.multi_items()
+                   if name.lower() not in _FRAMING_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=content,
+                              request=request, extensions=response.extensions)
+
+
+class HttpReplayer(_Interceptor):
+    """Serves a recorded tape instead of the network.
+
+    Every request is answered from the tape: first the next unused
+    exchange with the same method, URL (credentials masked) and body, then
+    the next with the same method, URL and JSON-RPC method (bodies with
+    request ids or timestamps), each in recorded order. The same session
+    therefore gets the same responses in the same order. A request the
+    tape cannot answer fails as a connection error, like an outage would.
+
+    Each response is held back for its recorded latency divided by
+    `speed` (1.0 is real time; 0 answers immediately). Run the bot on a
+    `ScaledClock` with the same speed, started at `started_at`, to replay
+    a whole session accelerated.
+    """
+
+    def __init__(self, path: Union[str, Path], speed: float = 1.0, rpc_urls: Iterable[Optional[str]] = ()) -> None:
+        self.path = Path(path)
+        self.rpc_hosts = rpc_hosts_of(rpc_urls)
+        self.header, self.exchanges = read_tape(self.path)
+        self.started_at = float(self.header.get("started_at", 0.0))
+        self.speed = speed
+        self.served = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._used = [False] * len(self.exchanges)
+        self._exact: Dict[Tuple, Deque[int]] = {}
+        self._loose: Dict[Tuple, Deque[int]] = {}
+        for i, exchange in enumerate(self.exchanges):
+            self._exact.setdefault(exchange.exact_key, deque()).append(i)
+            self._loose.setdefault(exchange.loose_key, deque()).append(i)
+
+    def _next(self, index: Dict[Tuple, Deque[int]], key: Tuple) -> Optional[int]:
+        queue = index.get(key)
+        while queue:
+            i = queue.popleft()
+            if not self._used[i]:
+                return i
+        return None
+
+    def match(self, method: str, url: str, body: Optional[bytes]) -> Optional[Exchange]:
+        """The exchange that answers a request (marked used), or None."""
+        url = self._redact(url)
+        body = body or b""
+        with self._lock:
+            i = self._next(self._exact, (method, url, body))
+            if i is None:
+                i = self._next(self._loose, (method, url, _rpc_method(body)))
+            if i is None:
+                self.misses += 1
+                return None
+            self._used[i] = True
+            self.served += 1
+        exchange = self.exchanges[i]
+        if self.speed > 0 and exchange.elapsed > 0:
+            time.sleep(exchange.elapsed / self.speed)
+        return exchange
+
+    def remaining(self) -> int:
+        return self._used.count(False)
+
+    def _requests_send(self, adapter, request, **kwargs):
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        exchange = self.match(request.method, request.url, body)
+        if exchange is None or exchange.error:
+            reason = exchange.error if exchange else f"not on tape: {request.method} {self._redact(request.url)}"
+            raise requests.ConnectionError(f"Replay: {reason}", request=request)
+        response = requests.Response()
+        response.status_code = exchange.status
+        response._content = exchange.content
+        response.headers.update(exchange.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
+
+    def _httpx_handle(self, transport, request):
+        exchange = self.match(request.method, str(request.url), request.read())
+        if exchange is None or exchange.error:
+            reason = exchange.error if exchange else f"not on tape: {request.method} {self._redact(str(request.url))}"
+            raise httpx.ConnectError(f"Replay: {reason}", request=request)
+        return httpx.Response(exchange.status, headers=exchange.headers, content=exchange.content, request=request)
+
+
+def summarize(exchanges: List[Exchange]) -> Dict[str, Dict[str, float]]:
+    """Per-service request count, errors, latency (mean / max) and response bytes."""
+    rows: Dict[str, Dict[str, float]] = {}
+    for exchange in exchanges:
+        row = rows.setdefault(exchange.service, {"requests": 0, "errors": 0, "latency_sum": 0.0,
+                                                 "latency_max": 0.0, "bytes": 0})
+        row["requests"] += 1
+        row["errors"] += bool(exchange.error) or exchange.status >= 400
+        row["latency_sum"] += exchange.elapsed
+        row["latency_max"] = max(row["latency_max"], exchange.elapsed)
+        row["bytes"] += len(exchange.response)
+    for row in rows.values():
+        row["latency_mean"] = row.pop("latency_sum") / row["requests"]
+    return rows
@@ -0,0 +1,440 @@
+"""
+Technical indicators for live ticks and backtests
+
+Every indicator comes in two flavours that produce the same numbers:
+
+- a streaming class with `update(...)` that costs O(1) per tick, for the live loop
+- a vectorized function over NumPy arrays, for backtests and warm-up
+
+Batch functions return float64 arrays aligned with their input, with NaN where
+the streaming version would still return None (not enough data yet).
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Recompute running window sums from scratch this often to stop float drift
+_RESYNC_EVERY = 4096
+
+
+def _alpha(period: Optional[int], alpha: Optional[float]) -> float:
+    if alpha is None:
+        if not period or period < 1:
+            raise ValueError("Provide period >= 1 or alpha")
+        alpha = 2.0 / (period + 1)
+    if not 0.0 < alpha <= 1.0:
+        raise ValueError("alpha must be in (0, 1]")
+    return alpha
+
+
+# ---------------------------------------------------------------------------
+# Streaming indicators
+# ---------------------------------------------------------------------------
+
+class EMA:
+    """Exponential moving average, seeded with the first value."""
+
+    def __init__(self, period: Optional[int] = None, alpha: Optional[float] = None) -> None:
+        self.alpha = _alpha(period, alpha)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = float(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class RSI:
+    """Wilder's relative strength index (SMA-seeded, then Wilder smoothing)."""
+
+    def __init__(self, period: int = 14) -> None:
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.value: Optional[float] = None
+        self._prev: Optional[float] = None
+        self._n = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def update(self, price: float) -> Optional[float]:
+        if self._prev is None:
+            self._prev = price
+            return None
+        change = price - self._prev
+        self._prev = price
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        self._n += 1
+        if self._n <= self.period:
+            # Seed phase: plain average of the first `period` changes
+            self._avg_gain += gain / self.period
+            self._avg_loss += loss / self.period
+            if self._n < self.period:
+                return None
+        else:
+            a = 1.0 / self.period
+            self._avg_gain += a * (gain - self._avg_gain)
+            self._avg_loss += a * (loss - self._avg_loss)
+
+        self.value = _rsi_value(self._avg_gain, self._avg_loss)
+        return self.value
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class BollingerBands:
+    """Rolling mean +/- `num_std` population standard deviations."""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0) -> None:
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.num_std = num_std
+        self.value: Optional[Tuple[float, float, float]] = None
+        self._window: Deque[float] = deque()
+        self._ref: Optional[float] = None  # shift for numerically stable variance
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._updates = 0
+
+    def update(self, price: float) -> Optional[Tuple[float, float, float]]:
+        """Returns (lower, middle, upper) once `period` prices are in."""
+        if self._ref is None:
+            self._ref = price
+        d = price - self._ref
+        self._window.append(price)
+        self._sum += d
+        self._sumsq += d * d
+        if len(self._window) > self.period:
+            old = self._window.popleft() - self._ref
+            self._sum -= old
+            self._sumsq -= old * old
+
+        self._updates += 1
+        if self._updates % _RESYNC_EVERY == 0:
+            # Re-anchor the shift near current prices and rebuild the sums
+            self._ref = price
+            self._sum = math.fsum(v - price for v in self._window)
+            self._sumsq = math.fsum((v - price) ** 2 for v in self._window)
+
+        if len(self._window) < self.period:
+            return None
+        mean_d = self._sum / self.period
+        var = max(self._sumsq / self.period - mean_d * mean_d, 0.0)
+        mid = self._ref + mean_d
+        band = self.num_std * math.sqrt(var)
+        self.value = (mid - band, mid, mid + band)
+        return self.value
+
+
+class ATR:
+    """Wilder's average true range.
+
+    For raw ticks call `update(price)`; the true range then reduces to the
+    absolute tick-to-tick move.
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.value: Optional[float] = None
+        self._prev_close: Optional[float] = None
+        self._n = 0
+        self._seed = 0.0
+
+    def update(self, high: float, low: Optional[float] = None, close: Optional[float] = None) -> Optional[float]:
+        low = high if low is None else low
+        close = high if close is None else close
+
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+
+        self._n += 1
+        if self._n <= self.period:
+            self._seed += tr / self.period
+            if self._n == self.period:
+                self.value = self._seed
+            return self.value
+        self.value += (tr - self.value) / self.period
+        return self.value
+
+
+class VWAP:
+    """Volume-weighted average price, cumulative or over the last `window` ticks."""
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        if window is not None and window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.value: Optional[float] = None
+        self._ticks: Deque[Tuple[float, float]] = deque()
+        self._pv = 0.0
+        self._v = 0.0
+        self._updates = 0
+
+    def update(self, price: float, volume: float) -> Optional[float]:
+        pv = price * volume
+        self._pv += pv
+        self._v += volume
+        if self.window is not None:
+            self._ticks.append((pv, volume))
+            if len(self._ticks) > self.window:
+                old_pv, old_v = self._ticks.popleft()
+                self._pv -= old_pv
+                self._v -= old_v
+            self._updates += 1
+            if self._updates % _RESYNC_EVERY == 0:
+                self._pv = math.fsum(t[0] for t in self._ticks)
+                self._v = math.fsum(t[1] for t in self._ticks)
+            if len(self._ticks) < self.window:
+                return None
+        self.value = self._pv / self._v if self._v > 0 else None
+        return self.value
+
+
+class RealizedVolatility:
+    """Root-mean-square of log returns over the last `period` returns.
+
+    Pass `periods_per_year` to annualize (e.g. 365 * 24 * 3600 / tick_seconds).
+    """
+
+    def __init__(self, period: int = 30, periods_per_year: Optional[float] = None) -> None:
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.scale = math.sqrt(periods_per_year) if periods_per_year else 1.0
+        self.value: Optional[float] = None
+        self._prev: Optional[float] = None
+        self._sq: Deque[float] = deque()
+        self._sum = 0.0
+        self._updates = 0
+
+    def update(self, price: float) -> Optional[float]:
+        if self._prev is None or self._prev <= 0 or price <= 0:
+            self._prev = price
+            return self.value
+        r = math.log(price / self._prev)
+        self._prev = price
+        sq = r * r
+        self._sq.append(sq)
+        self._sum += sq
+        if len(self._sq) > self.period:
+            self._sum -= self._sq.popleft()
+
+        self._updates += 1
+        if self._updates % _RESYNC_EVERY == 0:
+            self._sum = math.fsum(self._sq)
+
+        if len(self._sq) < self.period:
+            return None
+        self.value = math.sqrt(max(self._sum, 0.0) / self.period) * self.scale
+        return self.value
+
+
+class IndicatorSet:
+    """Bundle of streaming indicators fed from a single tick stream."""
+
+    def __init__(
+        self,
+        ema_fast: int = 12,
+        ema_slow: int = 26,
+        rsi_period: int = 14,
+        bb_period: int = 20,
+        bb_std: float = 2.0,
+        atr_period: int = 14,
+        vwap_window: Optional[int] = None,
+        vol_period: int = 30,
+    ) -> None:
+        self.ema_fast = EMA(ema_fast)
+        self.ema_slow = EMA(ema_slow)
+        self.rsi = RSI(rsi_period)
+        self.bollinger = BollingerBands(bb_period, bb_std)
+        self.atr = ATR(atr_period)
+        self.vwap = VWAP(vwap_window)
+        self.volatility = RealizedVolatility(vol_period)
+
+    def update(self, price: float, volume: float = 0.0) -> None:
+        self.ema_fast.update(price)
+        self.ema_slow.update(price)
+        self.rsi.update(price)
+        self.bollinger.update(price)
+        self.atr.update(price)
+        if volume > 0:
+            self.vwap.update(price, volume)
+        self.volatility.update(price)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        bands = self.bollinger.value
+        return {
+            "ema_fast": self.ema_fast.value,
+            "ema_slow": self.ema_slow.value,
+            "rsi": self.rsi.value,
+            "bb_lower": bands[0] if bands else None,
+            "bb_middle": bands[1] if bands else None,
+            "bb_upper": bands[2] if bands else None,
+            "atr": self.atr.value,
+            "vwap": self.vwap.value,
+            "volatility": self.volatility.value,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Vectorized batch versions
+# ---------------------------------------------------------------------------
+
+def _ewm(x: np.ndarray, alpha: float, init: float) -> np.ndarray:
+    """Solve y[t] = y[t-1] + alpha * (x[t] - y[t-1]) with y[-1] = init.
+
+    Vectorized in chunks: inside a chunk the recurrence is a scaled cumsum,
+    with the chunk length bounded so the decay weights cannot overflow.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    if x.size == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = x
+        return out
+    chunk = int(min(65_536, max(1, math.floor(230.0 / -math.log(decay)))))
+    powers = decay ** np.arange(chunk, dtype=np.float64)
+    inv_powers = 1.0 / powers
+    prev = float(init)
+    for start in range(0, x.size, chunk):
+        seg = x[start:start + chunk]
+        k = seg.size
+        p = powers[:k]
+        acc = np.cumsum(seg * inv_powers[:k])
+        y = decay * p * prev + alpha * p * acc
+        out[start:start + k] = y
+        prev = y[-1]
+    return out
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing `window` values; NaN for the first window-1."""
+    n = x.size
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    # Chunked cumsums keep the running totals (and their rounding error) small
+    step = 1 << 16
+    for start in range(window - 1, n, step):
+        stop = min(n, start + step)
+        seg = x[start - window + 1:stop]
+        c = np.concatenate(([0.0], np.cumsum(seg)))
+        out[start:stop] = c[window:] - c[:-window]
+    return out
+
+
+def ema(values: np.ndarray, period: Optional[int] = None, alpha: Optional[float] = None) -> np.ndarray:
+    x = np.asarray(values, dtype=np.float64)
+    a = _alpha(period, alpha)
+    out = np.empty_like(x)
+    if x.size == 0:
+        return out
+    out[0] = x[0]
+    out[1:] = _ewm(x[1:], a, x[0])
+    return out
+
+
+def rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    p = np.asarray(prices, dtype=np.float64)
+    out = np.full(p.size, np.nan)
+    if p.size <= period:
+        return out
+    change = np.diff(p)
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change < 0, -change, 0.0)
+
+    avg_gain = np.empty(change.size - period + 1)
+    avg_loss = np.empty_like(avg_gain)
+    avg_gain[0] = gains[:period].mean()
+    avg_loss[0] = losses[:period].mean()
+    a = 1.0 / period
+    avg_gain[1:] = _ewm(gains[period:], a, avg_gain[0])
+    avg_loss[1:] = _ewm(losses[period:], a, avg_loss[0])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    flat = avg_loss == 0.0
+    values[flat] = np.where(avg_gain[flat] > 0.0, 100.0, 50.0)
+    out[period:] = values
+    return out
+
+
+def bollinger(prices: np.ndarray, period: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (lower, middle, upper) arrays."""
+    p = np.asarray(prices, dtype=np.float64)
+    mid = np.full(p.size, np.nan)
+    var = np.full(p.size, np.nan)
+    step = _RESYNC_EVERY
+    for start in range(period - 1, p.size, step):
+        stop = min(p.size, start + step)
+        seg = p[start - period + 1:stop]
+        d = seg - seg[0]  # local shift keeps the variance well conditioned
+        mean_d = _rolling_sum(d, period)[period - 1:] / period
+        sq = _rolling_sum(d * d, period)[period - 1:] / period
+        mid[start:stop] = seg[0] + mean_d
+        var[start:stop] = np.maximum(sq - mean_d * mean_d, 0.0)
+    band = num_std * np.sqrt(var)
+    return mid - band, mid, mid + band
+
+
+def atr(high: np.ndarray, low: Optional[np.ndarray] = None, close: Optional[np.ndarray] = None, period: int = 14) -> np.ndarray:
+    h = np.asarray(high, dtype=np.float64)
+    l = h if low is None else np.asarray(low, dtype=np.float64)
+    c = h if close is None else np.asarray(close, dtype=np.float64)
+    out = np.full(h.size, np.nan)
+    if h.size < period:
+        return out
+    tr = h - l
+    prev_c = c[:-1]
+    tr[1:] = np.maximum.reduce([tr[1:], np.abs(h[1:] - prev_c), np.abs(l[1:] - prev_c)])
+    seed = tr[:period].mean()
+    out[period - 1] = seed
+    out[period:] = _ewm(tr[period:], 1.0 / period, seed)
+    return out
+
+
+def vwap(prices: np.ndarray, volumes: np.ndarray, window: Optional[int] = None) -> np.ndarray:
+    p = np.asarray(prices, dtype=np.float64)
+    v = np.asarray(volumes, dtype=np.float64)
+    pv = p * v
+    if window is None:
+        num = np.cumsum(pv)
+        den = np.cumsum(v)
+    else:
+        num = _rolling_sum(pv, window)
+        den = _rolling_sum(v, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def realized_volatility(prices: np.ndarray, period: int = 30, periods_per_year: Optional[float] = None) -> np.ndarray:
+    p = np.asarray(prices, dtype=np.float64)
+    out = np.full(p.size, np.nan)
+    if p.size <= period:
+        return out
+    r = np.diff(np.log(p))
+    scale = math.sqrt(periods_per_year) if periods_per_year else 1.0
+    out[1:] = np.sqrt(np.maximum(_rolling_sum(r * r, period), 0.0) / period) * scale
+    return out
@@ -0,0 +1,154 @@
+"""
+Write-ahead state journal
+Append-only record of fills, position changes and recent ticks, with
+periodic snapshots, so a restarted bot resumes where it stopped
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class StateJournal:
+    """Append-only JSON-lines journal plus a compact snapshot file.
+
+    Layout in `directory`:
+      - `snapshot.json`: full state as of record `seq` (written to a temp
+        file, fsynced, then renamed over the old one, so it is never torn)
+      - `journal.log`: one JSON record per line, each with a rising `seq`
+
+    Records are buffered and fsynced in batches — every `fsync_every`
+    records or `fsync_interval` seconds, whichever comes first — so ticks
+    cost a buffered write, not a disk flush. Records that must not be lost
+    (fills) pass `sync=True`. After `snapshot_every` records the owner
+    should call `snapshot(state)`, which also truncates the journal.
+
+    `recover()` returns the last snapshot and every later record; a torn
+    final line from a crash mid-write is ignored and cut off the file, so
+    the next append starts on a clean line.
+    """
+
+    SNAPSHOT = "snapshot.json"
+    LOG = "journal.log"
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+        snapshot_every: int = 2_000,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+
+        self.seq = 0
+        self._since_snapshot = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+
+    # --- Recovery ---
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(snapshot state or None, records written after it), oldest first.
+
+        Also positions the journal to continue after the last record, so
+        call this before appending.
+        """
+        state = None
+        snapshot_seq = 0
+        snapshot_path = self.directory / self.SNAPSHOT
+        if snapshot_path.exists():
+            data = json.loads(snapshot_path.read_text())
+            state = data["state"]
+            snapshot_seq = data["seq"]
+
+        records = []
+        log_path = self.directory / self.LOG
+        if log_path.exists():
+            good = 0  # Byte offset just past the last complete record
+            with open(log_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Torn write at the tail
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    good += len(line)
+                    if record["seq"] > snapshot_seq:
+                        records.append(record)
+            if good < log_path.stat().st_size:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                with open(log_path, "r+b") as f:
+                    f.truncate(good)
+                    os.fsync(f.fileno())
+        self.seq = records[-1]["seq"] if records else snapshot_seq
+        self._since_snapshot = len(records)
+        return state, records
+
+    # --- Writing ---
+    def append(self, kind: str, sync: bool = False, **data: Any) -> None:
+        if self._file is None:
+            self._file = open(self.directory / self.LOG, "a", buffering=1 << 16)
+        self.seq += 1
+        data["seq"] = self.seq
+        data["kind"] = kind
+        self._file.write(json.dumps(data, separators=(",", ":")) + "\n")
+        self._unsynced += 1
+        self._since_snapshot += 1
+        if sync or self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync them to disk."""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @property
+    def snapshot_due(self) -> bool:
+        return self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, state: Dict[str, Any]) -> None:
+        """Durably store `state` as of the last record and start a fresh journal."""
+        self.sync()
+        tmp = self.directory / (self.SNAPSHOT + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"seq": self.seq, "state": state}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.directory / self.SNAPSHOT)
+        self._fsync_directory()
+
+        # Records up to `seq` are now in the snapshot; recovery skips any
+        # left behind if we crash before the truncate below lands
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.directory / self.LOG, "w", buffering=1 << 16)
+        self._since_snapshot = 0
+
+    def _fsync_directory(self) -> None:
+        if os.name != "posix":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,354 @@
+"""
+Persistent trade ledger
+Every fill in SQLite (WAL mode, written by a background thread), with FIFO
+lot accounting for realized and unrealized P&L
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .clock import Clock, RealClock
+from .events import FillEvent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    pair TEXT NOT NULL,
+    strategy_id TEXT NOT NULL,
+    side TEXT NOT NULL,
+    amount REAL NOT NULL,
+    price REAL NOT NULL,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    signature TEXT,
+    intent_id INTEGER,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS fills_ts ON fills(ts);
+CREATE INDEX IF NOT EXISTS fills_pair_ts ON fills(pair, ts);
+CREATE INDEX IF NOT EXISTS fills_strategy_ts ON fills(strategy_id, ts);
+CREATE INDEX IF NOT EXISTS fills_day ON fills(day, strategy_id);
+
+CREATE TABLE IF NOT EXISTS lots (
+    id INTEGER PRIMARY KEY,
+    fill_id INTEGER NOT NULL REFERENCES fills(id),
+    opened_at REAL NOT NULL,
+    pair TEXT NOT NULL,
+    strategy_id TEXT NOT NULL,
+    amount REAL NOT NULL,
+    remaining REAL NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lots_open ON lots(pair, strategy_id, id) WHERE remaining > 0;
+
+CREATE TABLE IF NOT EXISTS lot_closes (
+    id INTEGER PRIMARY KEY,
+    lot_id INTEGER NOT NULL REFERENCES lots(id),
+    fill_id INTEGER NOT NULL REFERENCES fills(id),
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    amount REAL NOT NULL,
+    entry_price REAL NOT NULL,
+    exit_price REAL NOT NULL,
+    pnl REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lot_closes_day ON lot_closes(day);
+"""
+
+_EPSILON = 1e-12  # Remaining amounts below this count as fully closed
+
+
+def trading_day(timestamp: float) -> str:
+    """UTC calendar day of an epoch timestamp ("2024-05-01")."""
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+@dataclass
+class Lot:
+    """An open buy, closed first-in first-out by later sells of the same pair and strategy."""
+    lot_id: int
+    pair: str
+    strategy_id: str
+    opened_at: float
+    price: float
+    remaining: float
+
+
+class TradeLedger:
+    """Fills and FIFO lots in a SQLite database.
+
+    `record_fill(fill)` updates the in-memory books and returns the
+    realized P&L (quote currency) of that fill; the SQL is handed to a
+    background writer thread, which commits whatever has queued up in one
+    transaction (up to `batch_size` fills, never splitting a fill). A
+    failed write is retried fill by fill; a fill that still fails is
+    reported to `on_error(message)` and counted in `write_errors`, and the
+    writer keeps going. The database runs in WAL mode, so queries (and other
+    processes, e.g. `scripts/ledger_report.py`) read while it writes.
+
+    Open lots and today's realized P&L are loaded once at startup through
+    indexed queries and then kept incrementally, so the checks done on
+    every signal — `open_lot_count()`, `exposure()`, `realized_pnl()` —
+    never touch the database. History queries (`fills()`,
+    `daily_pnl()`) go to SQLite and use the time/pair/strategy indexes.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        clock: Optional[Clock] = None,
+        batch_size: int = 500,
+        on_error: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.clock = clock or RealClock()
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.write_errors = 0
+
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self._read_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        # Ids are assigned here so lots and closes can reference fills before they are written
+        self._next_fill_id = self._max_id("fills") + 1
+        self._next_lot_id = self._max_id("lots") + 1
+        self._lots: Dict[Tuple[str, str], Deque[Lot]] = {}
+        self._open_lots = 0
+        self._day = trading_day(self.clock.time())
+        self._day_realized = 0.0
+        self._load()
+
+        self._queue: "queue.Queue[Optional[List[Tuple[str, Sequence[Any]]]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="ledger", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _max_id(self, table: str) -> int:
+        return self._reader.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+
+    def _load(self) -> None:
+        rows = self._reader.execute(
+            "SELECT id, pair, strategy_id, opened_at, price, remaining FROM lots WHERE remaining > 0 ORDER BY id"
+        )
+        for lot_id, pair, strategy_id, opened_at, price, remaining in rows:
+            self._lots.setdefault((pair, strategy_id), deque()).append(
+                Lot(lot_id, pair, strategy_id, opened_at, price, remaining)
+            )
+            self._open_lots += 1
+        self._day_realized = self._reader.execute(
+            "SELECT COALESCE(SUM(pnl), 0) FROM lot_closes WHERE day = ?", (self._day,)
+        ).fetchone()[0]
+
+    # --- Recording (engine thread) ---
+    def record_fill(self, fill: FillEvent) -> float:
+        """Book a FILLED fill; returns its realized P&L (0 for buys and non-fills)."""
+        if not fill.filled:
+            return 0.0
+        intent = fill.intent
+        amount, price = fill.filled_amount, fill.fill_price
+        day = trading_day(fill.timestamp)
+        key = (intent.pair, intent.strategy_id)
+        statements: List[Tuple[str, Sequence[Any]]] = []
+        realized = 0.0
+
+        with self._lock:
+            self._roll_day(day)
+            fill_id = self._next_fill_id
+            self._next_fill_id += 1
+
+            if intent.side == "BUY":
+                lot = Lot(self._next_lot_id, intent.pair, intent.strategy_id, fill.timestamp, price, amount)
+                self._next_lot_id += 1
+                self._lots.setdefault(key, deque()).append(lot)
+                self._open_lots += 1
+                statements.append((
+                    "INSERT INTO lots (id, fill_id, opened_at, pair, strategy_id, amount, remaining, price) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (lot.lot_id, fill_id, lot.opened_at, lot.pair, lot.strategy_id, amount, amount, price),
+                ))
+            else:
+                lots = self._lots.get(key, deque())
+                left = amount
+                while left > _EPSILON and lots:
+                    lot = lots[0]
+                    closed = min(left, lot.remaining)
+                    pnl = (price - lot.price) * closed
+                    lot.remaining -= closed
+                    left -= closed
+                    realized += pnl
+                    if lot.remaining <= _EPSILON:
+                        lot.remaining = 0.0
+                        lots.popleft()
+                        self._open_lots -= 1
+                    statements.append(("UPDATE lots SET remaining = ? WHERE id = ?", (lot.remaining, lot.lot_id)))
+                    statements.append((
+                        "INSERT INTO lot_closes (lot_id, fill_id, ts, day, amount, entry_price, exit_price, pnl) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (lot.lot_id, fill_id, fill.timestamp, day, closed, lot.price, price, pnl),
+                    ))
+                if day == self._day:
+                    self._day_realized += realized
+
+            statements.insert(0, (
+                "INSERT INTO fills (id, ts, day, pair, strategy_id, side, amount, price, realized_pnl, "
+                "signature, intent_id, reason) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (fill_id, fill.timestamp, day, intent.pair, intent.strategy_id, intent.side, amount, price,
+                 realized, fill.signature, intent.intent_id, intent.reason),
+            ))
+        self._queue.put(statements)  # One unit: a fill is committed whole or not at all
+        return realized
+
+    def _roll_day(self, day: str) -> None:
+        if day > self._day:
+            self._day = day
+            self._day_realized = 0.0
+
+    # --- Cached aggregates (no I/O) ---
+    def open_lots(self, pair: Optional[str] = None, strategy_id: Optional[str] = None) -> List[Lot]:
+        with self._lock:
+            return [
+                lot for (p, s), lots in self._lots.items()
+                if (pair is None or p == pair) and (strategy_id is None or s == strategy_id)
+                for lot in lots
+            ]
+
+    def open_lot_count(self) -> int:
+        return self._open_lots
+
+    def exposure(self, pair: str, strategy_id: Optional[str] = None) -> float:
+        """Base-token amount held in open lots."""
+        return sum(lot.remaining for lot in self.open_lots(pair, strategy_id))
+
+    def realized_pnl(self) -> float:
+        """Realized P&L of the current UTC day."""
+        with self._lock:
+            self._roll_day(trading_day(self.clock.time()))
+            return self._day_realized
+
+    def unrealized_pnl(self, prices: Mapping[str, float]) -> float:
+        """Mark-to-market P&L of open lots at `prices` (pair -> price); pairs without a price are skipped."""
+        return sum(
+            (prices[lot.pair] - lot.price) * lot.remaining
+            for lot in self.open_lots() if lot.pair in prices
+        )
+
+    # --- History (SQLite, indexed) ---
+    def fills(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        pair: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        latest: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Fills in time order, optionally filtered by time range, pair and strategy.
+
+        With `latest`, `limit` keeps the most recent fills instead of the
+        oldest (read newest-first through the `ts` index, so the cost does
+        not grow with history).
+        """
+        self.flush()
+        where, params = [], []
+        for clause, value in (("ts >= ?", since), ("ts < ?", until), ("pair = ?", pair), ("strategy_id = ?", strategy_id)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = "SELECT * FROM fills" + (" WHERE " + " AND ".join(where) if where else "")
+        sql += " ORDER BY ts DESC" if latest else " ORDER BY ts"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._query(sql, params)
+        if latest:
+            rows.reverse()
+        return rows
+
+    def daily_pnl(
+        self,
+        since_day: Optional[str] = None,
+        pair: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Realized P&L, fill count and volume per day and strategy, optionally of one pair and strategy."""
+        self.flush()
+        where, params = [], []
+        for clause, value in (("day >= ?", since_day), ("pair = ?", pair), ("strategy_id = ?", strategy_id)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = (
+            "SELECT day, strategy_id, COUNT(*) AS fills, SUM(amount * price) AS volume, "
+            "SUM(realized_pnl) AS realized_pnl FROM fills"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " GROUP BY day, strategy_id ORDER BY day, strategy_id"
+        )
+        return self._query(sql, params)
+
+    def _query(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        with self._read_lock:
+            cursor = self._reader.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # --- Writer thread ---
+    def _writer(self) -> None:
+        conn = self._connect()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                units = [unit for unit in batch if unit is not None]
+                stop = len(units) < len(batch)
+                try:
+                    self._commit(conn, units)
+                except Exception:
+                    # Retry one fill at a time so a bad fill doesn't take the batch with it
+                    for unit in units:
+                        try:
+                            self._commit(conn, [unit])
+                        except Exception as e:
+                            self.write_errors += 1
+                            if self.on_error:
+                                self.on_error(f"Ledger write failed, fill not stored: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection, units: List[List[Tuple[str, Sequence[Any]]]]) -> None:
+        with conn:
+            for statements in units:
+                for statement in statements:
+                    conn.execute(*statement)
+
+    def flush(self) -> None:
+        """Block until every recorded fill is committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._reader.close()
@@ -0,0 +1,334 @@
+"""
+In-process metrics
+Counters, gauges and HDR-style latency histograms, served in Prometheus
+text format from a background HTTP thread
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count, optionally split by labels (`inc(source="Binance")`)."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Current value: set explicitly, or computed by a callback at scrape time.
+
+    Callbacks (`set_function`) cost nothing between scrapes, which suits
+    state the bot already holds (positions, cache hit rates, queue sizes).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+        self._functions: Dict[LabelKey, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._values[_key(labels)] = float(value)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        self._functions[_key(labels)] = fn
+
+    def value(self, **labels) -> Optional[float]:
+        key = _key(labels)
+        if key in self._functions:
+            return float(self._functions[key]())
+        return self._values.get(key)
+
+    def _samples(self) -> List[str]:
+        values = dict(self._values)
+        for key, fn in list(self._functions.items()):
+            try:
+                values[key] = float(fn())
+            except Exception:  # noqa: BLE001 - a broken callback must not break the scrape
+                continue
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in values.items()]
+
+
+class _HdrCounts:
+    """Log-linear bucket counts (the HdrHistogram layout).
+
+    Values are recorded as integers in `unit` (microseconds for seconds).
+    Below `2**sub_bits` every integer has its own bucket; above it each
+    power of two is split into `2**(sub_bits - 1)` buckets, so any value's
+    bucket is within `2**-(sub_bits - 1)` of it (~3% for sub_bits=6)
+    regardless of magnitude. Buckets are sparse, so memory follows the
+    range actually seen.
+    """
+
+    def __init__(self, sub_bits: int) -> None:
+        self.sub_bits = sub_bits
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def index(self, raw: int) -> int:
+        shift = raw.bit_length() - self.sub_bits
+        if shift <= 0:
+            return raw
+        return (shift << (self.sub_bits - 1)) + (raw >> shift)
+
+    def upper(self, index: int) -> int:
+        """Largest raw value in bucket `index`."""
+        half = 1 << (self.sub_bits - 1)
+        if index < 2 * half:
+            return index
+        shift = (index >> (self.sub_bits - 1)) - 1
+        mantissa = index - (shift << (self.sub_bits - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, raw: int, value: float) -> None:
+        idx = self.index(raw)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.total += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantiles(self, qs: Sequence[float]) -> List[int]:
+        """Raw bucket upper bounds at each quantile (qs ascending)."""
+        if not self.total:
+            return []
+        targets = [max(1, math.ceil(q * self.total)) for q in qs]
+        result: List[int] = []
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            while len(result) < len(targets) and seen >= targets[len(result)]:
+                result.append(self.upper(idx))
+            if len(result) == len(targets):
+                break
+        return result
+
+
+class Histogram(_Metric):
+    """Latency distribution with HDR-style bounded relative error.
+
+    `observe(seconds, **labels)` is O(1); quantiles are computed only when
+    scraped (or asked for), and exported as a Prometheus summary with
+    `quantiles` plus `_sum` / `_count`.
+    """
+    kind = "summary"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+        unit: float = 1e-6,  # Recording resolution (1 µs)
+        sub_bits: int = 6,
+    ) -> None:
+        super().__init__(name, help_text)
+        self.quantile_levels = tuple(sorted(quantiles))
+        self.unit = unit
+        self.sub_bits = sub_bits
+        self._series: Dict[LabelKey, _HdrCounts] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _key(labels)
+        raw = max(0, int(value / self.unit))
+        with self._lock:
+            counts = self._series.get(key)
+            if counts is None:
+                counts = self._series[key] = _HdrCounts(self.sub_bits)
+            counts.record(raw, value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of a `with` block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        counts = self._series.get(_key(labels))
+        return counts.total if counts else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        with self._lock:
+            counts = self._series.get(_key(labels))
+            values = counts.quantiles([q]) if counts else []
+        return round(values[0] * self.unit, 9) if values else None
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            series = [(k, c, c.quantiles(self.quantile_levels)) for k, c in self._series.items()]
+        for key, counts, values in series:
+            for q, raw in zip(self.quantile_levels, values):
+                value = min(round(raw * self.unit, 9), counts.max)
+                lines.append(f"{self.name}{_format_labels(key, [('quantile', repr(q))])} {_format_value(value)}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(counts.sum)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {counts.total}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics for one process; `render()` gives the Prometheus text format.
+
+    Asking for an existing name returns the same metric, so components can
+    share a registry without coordinating who creates what.
+    """
+
+    def __init__(self, prefix: str = "") -> None:
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kwargs):
+        full = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(full)
+            if metric is None:
+                metric = self._metrics[full] = cls(full, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {full} is already a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "", **kwargs) -> Histogram:
+        return self._get(Histogram, name, help_text, **kwargs)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves `/metrics` (Prometheus text) and `/health` from a daemon thread.
+
+    `/health` answers 200 while `health()` returns True and 503 otherwise;
+    by default it is always healthy while the process serves requests.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        host: str = "0.0.0.0",
+        port: int = 9108,
+        health: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.registry = registry
+        self.health = health or (lambda: True)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    self._reply(200, server.registry.render(), "text/plain; version=0.0.4; charset=utf-8")
+                elif path == "/health":
+                    try:
+                        healthy = bool(server.health())
+                    except Exception:  # noqa: BLE001
+                        healthy = False
+                    self._reply(200 if healthy else 503, "ok\n" if healthy else "unhealthy\n", "text/plain")
+                else:
+                    self._reply(404, "not found\n", "text/plain")
+
+            def _reply(self, status: int, body: str, content_type: str) -> None:
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args) -> None:  # noqa: A002 - keep scrapes out of the console
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
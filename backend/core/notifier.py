@@ -0,0 +1,206 @@
+"""
+Background Discord webhook notifier
+Trading code enqueues embeds and returns immediately; a worker thread
+batches them into webhook posts and deals with Discord's rate limits
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+Embed = Dict[str, Any]
+
+MAX_EMBEDS_PER_MESSAGE = 10  # Discord webhook limit
+MAX_EMBED_CHARS_PER_MESSAGE = 6000  # Discord limit on total embed text
+
+
+class DiscordNotifier:
+    """Non-blocking, batched Discord webhook sender.
+
+    `notify(embed)` never touches the network: it deduplicates, then puts
+    the embed on a bounded queue (counting it in `dropped` if the queue is
+    full) and returns. The worker thread takes the first waiting embed,
+    gathers whatever else arrives within `batch_window_seconds` (up to
+    Discord's 10 embeds / 6000 characters per message) and posts them as
+    one message.
+
+    Rate limits: a 429 is retried after its `retry_after`, and when the
+    response headers say the bucket is empty (`X-RateLimit-Remaining: 0`)
+    the next post waits for `X-RateLimit-Reset-After`.
+
+    An embed is a duplicate when an identical one (ignoring `timestamp`, or
+    with the same explicit `dedupe_key`) was queued within
+    `dedupe_window_seconds`.
+    """
+
+    def __init__(
+        self,
+        webhook_url: str,
+        max_queue: int = 100,
+        batch_window_seconds: float = 1.0,
+        dedupe_window_seconds: float = 60.0,
+        max_attempts: int = 3,
+        timeout: float = 10.0,
+        on_error: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.webhook_url = webhook_url
+        self.batch_window_seconds = batch_window_seconds
+        self.dedupe_window_seconds = dedupe_window_seconds
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.on_error = on_error
+        self._queue: "queue.Queue[Embed]" = queue.Queue(maxsize=max_queue)
+        self._recent: Dict[str, float] = {}  # dedupe key -> last queued (monotonic)
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._blocked_until = 0.0  # monotonic time the rate limit bucket refills
+
+        self.queued = 0
+        self.dropped = 0
+        self.deduplicated = 0
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    # --- Producer side (any thread) ---
+    def notify(self, embed: Embed, dedupe_key: Optional[str] = None) -> bool:
+        """Queue an embed; returns False if it was a duplicate or dropped."""
+        key = dedupe_key or _dedupe_key(embed)
+        now = time.monotonic()
+        with self._lock:
+            last = self._recent.get(key)
+            if last is not None and now - last < self.dedupe_window_seconds:
+                self.deduplicated += 1
+                return False
+            try:
+                self._queue.put_nowait(embed)
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._recent[key] = now
+            self.queued += 1
+            if len(self._recent) > 4 * self._queue.maxsize:
+                self._recent = {k: t for k, t in self._recent.items() if now - t < self.dedupe_window_seconds}
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "pending": self._queue.qsize(),
+            "dropped": self.dropped,
+            "deduplicated": self.deduplicated,
+            "sent_messages": self.sent_messages,
+            "sent_embeds": self.sent_embeds,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+        }
+
+    # --- Worker ---
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="discord-notifier", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush_timeout: float = 5.0) -> None:
+        """Stop the worker, giving queued embeds up to `flush_timeout` seconds to go out."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(flush_timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._post(batch)
+            elif self._stop.is_set():
+                return
+
+    def _next_batch(self) -> List[Embed]:
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        batch = [first]
+        chars = len(json.dumps(first))
+        deadline = time.monotonic() + (0 if self._stop.is_set() else self.batch_window_seconds)
+        while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            try:
+                embed = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            size = len(json.dumps(embed))
+            if chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                self._requeue(embed)
+                break
+            batch.append(embed)
+            chars += size
+        return batch
+
+    def _requeue(self, embed: Embed) -> None:
+        try:
+            self._queue.put_nowait(embed)
+        except queue.Full:
+            self.dropped += 1
+
+    def _post(self, batch: List[Embed]) -> None:
+        for _ in range(self.max_attempts):
+            self._wait(self._blocked_until - time.monotonic())
+            try:
+                response = self._session.post(self.webhook_url, json={"embeds": batch}, timeout=self.timeout)
+            except Exception as e:  # noqa: BLE001 - retry network errors
+                self._error(f"Discord notification error: {e}")
+                self._wait(1.0)
+                continue
+
+            headers = response.headers
+            if headers.get("X-RateLimit-Remaining") == "0":
+                reset_after = float(headers.get("X-RateLimit-Reset-After") or 0)
+                self._blocked_until = time.monotonic() + reset_after
+
+            if response.status_code == 429:
+                self.rate_limited += 1
+                self._blocked_until = time.monotonic() + _retry_after(response)
+                continue
+            if response.status_code < 300:
+                self.sent_messages += 1
+                self.sent_embeds += len(batch)
+                return
+            self._error(f"Discord notification failed: {response.status_code}")
+            if response.status_code < 500:
+                break  # Bad request / webhook gone: retrying won't help
+        self.failed += len(batch)
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            # Sleep through rate limits, but cap waits once shutting down
+            time.sleep(min(seconds, 1.0) if self._stop.is_set() else seconds)
+
+    def _error(self, message: str) -> None:
+        if self.on_error:
+            self.on_error(message)
+
+
+def _retry_after(response) -> float:
+    """Seconds to wait after a 429 (JSON `retry_after`, else the Retry-After header)."""
+    try:
+        return float(response.json().get("retry_after"))
+    except Exception:  # noqa: BLE001
+        pass
+    try:
+        return float(response.headers.get("Retry-After") or 1.0)
+    except ValueError:
+        return 1.0
+
+
+def _dedupe_key(embed: Embed) -> str:
+    return json.dumps({k: v for k, v in embed.items() if k != "timestamp"}, sort_keys=True)
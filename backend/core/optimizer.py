@@ -0,0 +1,366 @@
+"""
+Parameter search for the dip/rise/stop strategy on recorded ticks
+
+Grid, random and Bayesian (Gaussian-process + expected improvement) search,
+plus walk-forward validation. Backtests run on a process pool; the tick
+arrays are placed in shared memory once and every worker maps them directly
+instead of receiving a pickled copy per task.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .backtest import Backtester, BacktestConfig
+
+# name -> (low, high) or (low, high, step); step snaps samples to a grid,
+# which keeps the number of distinct lookbacks (the expensive part) small
+Bounds = Dict[str, Union[Tuple[float, float], Tuple[float, float, float]]]
+
+
+@dataclass
+class SearchResult:
+    params: Dict[str, Any]
+    score: float
+    summary: Dict[str, float]
+
+
+@dataclass
+class WalkForwardFold:
+    train_range: Tuple[float, float]  # (start_ts, end_ts)
+    test_range: Tuple[float, float]
+    best_params: Dict[str, Any]
+    train_score: float
+    test_score: float
+    test_summary: Dict[str, float]
+
+
+@dataclass
+class WalkForwardResult:
+    folds: List[WalkForwardFold] = field(default_factory=list)
+
+    @property
+    def mean_test_score(self) -> float:
+        return float(np.mean([f.test_score for f in self.folds])) if self.folds else float("nan")
+
+    @property
+    def mean_train_score(self) -> float:
+        return float(np.mean([f.train_score for f in self.folds])) if self.folds else float("nan")
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+_worker: Dict[str, Any] = {}
+_WORKER_BACKTESTERS = 4  # Backtesters (windows) cached per worker
+
+
+def _init_worker(ts_name: str, px_name: str, n: int, base_config: Dict[str, Any], objective: str) -> None:
+    ts_shm = shared_memory.SharedMemory(name=ts_name)
+    px_shm = shared_memory.SharedMemory(name=px_name)
+    _worker.update(
+        shm=(ts_shm, px_shm),  # keep the mappings alive for the worker's lifetime
+        ts=np.ndarray((n,), dtype=np.float64, buffer=ts_shm.buf),
+        px=np.ndarray((n,), dtype=np.float64, buffer=px_shm.buf),
+        base=BacktestConfig(**base_config),
+        objective=objective,
+        backtesters=OrderedDict(),
+    )
+
+
+def _worker_backtester(start: int, end: int) -> Backtester:
+    key = (start, end)
+    cache = _worker["backtesters"]
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    # Slices of the shared arrays are views: no copy per fold either. Only the
+    # most recent windows are kept (a fold's train and test range), so
+    # walk-forward runs don't hold every fold's precomputed arrays.
+    while len(cache) >= _WORKER_BACKTESTERS:
+        cache.popitem(last=False)
+    cache[key] = Backtester(_worker["ts"][start:end], _worker["px"][start:end])
+    return cache[key]
+
+
+def _evaluate(task: Tuple[Dict[str, Any], int, int]) -> Tuple[Dict[str, Any], float, Dict[str, float]]:
+    params, start, end = task
+    config = replace(_worker["base"], **params)
+    summary = _worker_backtester(start, end).run(config).summary()
+    return params, _score(summary, _worker["objective"]), summary
+
+
+def _score(summary: Dict[str, float], objective: str) -> float:
+    if objective == "return_over_drawdown":
+        return summary["total_return_pct"] / max(summary["max_drawdown_pct"], 1.0)
+    return float(summary[objective])
+
+
+# ---------------------------------------------------------------------------
+# Gaussian process helper for Bayesian search
+# ---------------------------------------------------------------------------
+
+_erf = np.vectorize(math.erf, otypes=[np.float64])
+
+
+def _rbf(a: np.ndarray, b: np.ndarray, lengthscale: float) -> np.ndarray:
+    d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)
+    return np.exp(-0.5 * d2 / (lengthscale ** 2))
+
+
+def _gp_fit_predict(x: np.ndarray, y: np.ndarray, cand: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Posterior mean/std at `cand` for a unit-variance RBF GP on [0, 1]^d.
+
+    The lengthscale is picked from a small grid by marginal likelihood.
+    """
+    mu_y, sd_y = y.mean(), y.std() or 1.0
+    yn = (y - mu_y) / sd_y
+    best = None
+    for ls in (0.05, 0.1, 0.2, 0.4, 0.8):
+        k = _rbf(x, x, ls) + 1e-4 * np.eye(len(x))
+        try:
+            chol = np.linalg.cholesky(k)
+        except np.linalg.LinAlgError:
+            continue
+        alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, yn))
+        loglik = -0.5 * yn @ alpha - np.log(np.diag(chol)).sum()
+        if best is None or loglik > best[0]:
+            best = (loglik, ls, chol, alpha)
+    _, ls, chol, alpha = best
+    ks = _rbf(cand, x, ls)
+    mean = ks @ alpha
+    v = np.linalg.solve(chol, ks.T)
+    var = np.maximum(1.0 - (v * v).sum(axis=0), 1e-12)
+    return mean * sd_y + mu_y, np.sqrt(var) * sd_y
+
+
+def _expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.01) -> np.ndarray:
+    z = (mean - best - xi) / std
+    cdf = 0.5 * (1.0 + _erf(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+    return (mean - best - xi) * cdf + std * pdf
+
+
+# ---------------------------------------------------------------------------
+# Optimizer
+# ---------------------------------------------------------------------------
+
+class ParameterOptimizer:
+    """Search `BacktestConfig` parameters over recorded ticks on a process pool.
+
+    Use as a context manager so the pool and shared memory are released:
+
+        with ParameterOptimizer(ts, prices, objective="total_return_pct") as opt:
+            top = opt.grid_search({"buy_dip_threshold": [2, 3, 4], "stop_loss_pct": [1, 2]})
+
+    `base_config` fixes everything not being searched (fees, sizing, and
+    `take_profit_from="entry"` to tune `SimpleTradingBot`-style exits).
+    Objectives: any key of `BacktestResult.summary()` or "return_over_drawdown".
+    Higher scores are better.
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        base_config: Optional[BacktestConfig] = None,
+        objective: str = "total_return_pct",
+        max_workers: Optional[int] = None,
+    ) -> None:
+        ts = np.ascontiguousarray(timestamps, dtype=np.float64)
+        px = np.ascontiguousarray(prices, dtype=np.float64)
+        if ts.shape != px.shape or ts.ndim != 1:
+            raise ValueError("timestamps and prices must be 1-D arrays of the same length")
+        self.n = ts.size
+        self.base_config = base_config or BacktestConfig()
+        self.objective = objective
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self._shm: List[shared_memory.SharedMemory] = []
+        arrays = []
+        for src in (ts, px):
+            shm = shared_memory.SharedMemory(create=True, size=max(src.nbytes, 1))
+            self._shm.append(shm)
+            dst = np.ndarray(src.shape, dtype=np.float64, buffer=shm.buf)
+            dst[:] = src
+            arrays.append(dst)
+        self.timestamps, self.prices = arrays
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self._shm[0].name, self._shm[1].name, self.n, asdict(self.base_config), objective),
+        )
+
+    def __enter__(self) -> "ParameterOptimizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        # Drop our views before closing the mappings
+        self.timestamps = self.prices = None
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    # --- Core evaluation ---
+    def evaluate(self, param_sets: Sequence[Dict[str, Any]], start: int = 0, end: Optional[int] = None) -> List[SearchResult]:
+        """Backtest each parameter set on ticks[start:end], in parallel."""
+        end = self.n if end is None else end
+        # Neighbouring tasks with the same lookback land in the same chunk, so
+        # workers reuse their cached rolling extremes
+        ordered = sorted(param_sets, key=lambda p: p.get("lookback_minutes", self.base_config.lookback_minutes))
+        chunksize = max(1, len(ordered) // (self.max_workers * 4))
+        tasks = [(dict(p), start, end) for p in ordered]
+        return [
+            SearchResult(params, score, summary)
+            for params, score, summary in self._pool.map(_evaluate, tasks, chunksize=chunksize)
+        ]
+
+    @staticmethod
+    def _ranked(results: List[SearchResult]) -> List[SearchResult]:
+        return sorted(results, key=lambda r: r.score if np.isfinite(r.score) else -np.inf, reverse=True)
+
+    # --- Search strategies ---
+    def grid_search(self, space: Dict[str, Sequence[Any]], start: int = 0, end: Optional[int] = None) -> List[SearchResult]:
+        """Every combination of the listed values; results best first."""
+        names = list(space)
+        combos = [dict(zip(names, values)) for values in itertools.product(*(space[k] for k in names))]
+        return self._ranked(self.evaluate(combos, start, end))
+
+    def random_search(
+        self,
+        bounds: Bounds,
+        n_samples: int = 100,
+        seed: Optional[int] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[SearchResult]:
+        rng = np.random.default_rng(seed)
+        samples = self._from_unit(bounds, rng.random((n_samples, len(bounds))))
+        return self._ranked(self.evaluate(samples, start, end))
+
+    def bayesian_search(
+        self,
+        bounds: Bounds,
+        n_iter: int = 60,
+        n_initial: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """GP-based search maximizing expected improvement.
+
+        Each round proposes `batch_size` points (default: one per worker) with
+        the constant-liar heuristic so the whole pool stays busy.
+        """
+        rng = np.random.default_rng(seed)
+        dims = len(bounds)
+        batch_size = batch_size or self.max_workers
+        n_initial = min(n_iter, n_initial or max(2 * dims + 1, batch_size))
+
+        results = self.evaluate(self._from_unit(bounds, rng.random((n_initial, dims))), start, end)
+        while len(results) < n_iter:
+            x = self._to_unit(bounds, [r.params for r in results])
+            y = np.array([r.score if np.isfinite(r.score) else np.nan for r in results])
+            y = np.where(np.isnan(y), np.nanmin(y) if np.isfinite(np.nanmin(y)) else 0.0, y)
+
+            proposals = []
+            for _ in range(min(batch_size, n_iter - len(results))):
+                cand = rng.random((2048, dims))
+                mean, std = _gp_fit_predict(x, y, cand)
+                pick = cand[int(np.argmax(_expected_improvement(mean, std, y.max())))]
+                proposals.append(pick)
+                # Constant liar: pretend the pick scored the current mean
+                x = np.vstack([x, pick])
+                y = np.append(y, y.mean())
+            results += self.evaluate(self._from_unit(bounds, np.array(proposals)), start, end)
+        return self._ranked(results)
+
+    @staticmethod
+    def _from_unit(bounds: Bounds, unit: np.ndarray) -> List[Dict[str, float]]:
+        out = []
+        for row in unit:
+            params = {}
+            for (name, spec), u in zip(bounds.items(), row):
+                low, high = spec[0], spec[1]
+                value = low + float(u) * (high - low)
+                if len(spec) > 2 and spec[2]:
+                    value = low + round((value - low) / spec[2]) * spec[2]
+                params[name] = float(value)
+            out.append(params)
+        return out
+
+    @staticmethod
+    def _to_unit(bounds: Bounds, params: List[Dict[str, float]]) -> np.ndarray:
+        return np.array([
+            [(p[name] - spec[0]) / ((spec[1] - spec[0]) or 1.0) for name, spec in bounds.items()]
+            for p in params
+        ])
+
+    # --- Walk-forward validation ---
+    def walk_forward(
+        self,
+        train_seconds: float,
+        test_seconds: float,
+        method: str = "grid",
+        step_seconds: Optional[float] = None,
+        **search_kwargs,
+    ) -> WalkForwardResult:
+        """Optimize on each train window, then score the winner on the test
+        window that follows it. Windows advance by `step_seconds` (default:
+        one test window), so test windows never overlap.
+
+        `search_kwargs` go to the chosen search (`space=` for grid, `bounds=`
+        for random/bayesian, plus their options).
+        """
+        search = {
+            "grid": self.grid_search,
+            "random": self.random_search,
+            "bayesian": self.bayesian_search,
+        }.get(method)
+        if search is None:
+            raise ValueError("method must be 'grid', 'random' or 'bayesian'")
+        step = step_seconds or test_seconds
+        for name, value in (("train_seconds", train_seconds), ("test_seconds", test_seconds),
+                            ("step_seconds", step)):
+            if not value > 0:  # Windows must advance, or the loop never ends
+                raise ValueError(f"{name} must be positive, got {value!r}")
+        ts = self.timestamps
+
+        result = WalkForwardResult()
+        t0 = float(ts[0]) if self.n else 0.0
+        while self.n:
+            train_end_t = t0 + train_seconds
+            test_end_t = train_end_t + test_seconds
+            if test_end_t > float(ts[-1]) + 1e-9:
+                break
+            a, b, c = np.searchsorted(ts, [t0, train_end_t, test_end_t], side="left")
+            if b - a < 2 or c - b < 2:
+                t0 += step
+                continue
+            best = search(start=int(a), end=int(b), **search_kwargs)[0]
+            test = self.evaluate([best.params], int(b), int(c))[0]
+            result.folds.append(WalkForwardFold(
+                (t0, train_end_t), (train_end_t, test_end_t),
+                best.params, best.score, test.score, test.summary,
+            ))
+            t0 += step
+        return result
@@ -0,0 +1,371 @@
+"""
+Local conditional-order book
+Stop, take-profit and trailing-stop orders for many positions, kept in
+sorted price indexes so each tick only touches the orders it triggers
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .events import OrderIntent, TickEvent
+
+STOP = "STOP"  # Fires when price <= trigger_price
+TAKE_PROFIT = "TAKE_PROFIT"  # Fires when price >= trigger_price
+TRAILING_STOP = "TRAILING_STOP"  # Fires when price <= peak * (1 - trail_pct / 100)
+
+
+@dataclass
+class ConditionalOrder:
+    """A resting order that becomes an `OrderIntent` when its price is hit"""
+    order_id: int
+    pair: str
+    kind: str  # STOP, TAKE_PROFIT or TRAILING_STOP
+    side: str  # "SELL" to close a long (or "BUY" for a short / entry stop)
+    amount: float  # Base token units
+    strategy_id: str = ""
+    position_id: Optional[Any] = None  # Orders sharing a position are one-cancels-other
+    trigger_price: Optional[float] = None  # STOP / TAKE_PROFIT
+    trail_pct: Optional[float] = None  # TRAILING_STOP
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    peak: Optional[float] = None  # TRAILING_STOP: reference price at placement, peak once fired
+
+    def current_trigger(self) -> Optional[float]:
+        if self.kind == TRAILING_STOP:
+            return self.peak * (1 - self.trail_pct / 100)
+        return self.trigger_price
+
+
+class _TailIndex:
+    """Ascending (key, seq) list whose triggered entries are always a tail.
+
+    `pop_at_or_above(x)` removes every key >= x by popping from the end, so
+    a tick costs one bisect plus the k entries it fires. Removals of single
+    entries are lazy: callers drop the seq from `live`, and stale entries
+    are skipped when they surface or swept out by `compact()`.
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[Tuple[float, int]] = []
+        self.refs: Dict[int, Any] = {}  # seq -> payload while live
+
+    def add(self, key: float, seq: int, ref: Any) -> None:
+        bisect.insort(self.keys, (key, seq))
+        self.refs[seq] = ref
+
+    def discard(self, seq: int) -> None:
+        self.refs.pop(seq, None)
+        if len(self.keys) > 64 and len(self.keys) > 2 * len(self.refs):
+            self.compact()
+
+    def compact(self) -> None:
+        self.keys = [k for k in self.keys if k[1] in self.refs]
+
+    def pop_at_or_above(self, key: float) -> List[Any]:
+        keys = self.keys
+        cut = bisect.bisect_left(keys, (key, -1))
+        fired = []
+        for _, seq in keys[cut:]:
+            ref = self.refs.pop(seq, None)
+            if ref is not None:
+                fired.append(ref)
+        del keys[cut:]
+        return fired
+
+    def top(self) -> Optional[float]:
+        """Largest live key (the next to fire)."""
+        keys = self.keys
+        while keys and keys[-1][1] not in self.refs:
+            keys.pop()
+        return keys[-1][0] if keys else None
+
+
+class _TrailGroup:
+    """Trailing stops of one pair that currently share the same peak.
+
+    Members are sorted by `factor = 1 - trail_pct / 100`: at price p the
+    ones with `peak * factor >= p` have fired, always the largest factors,
+    i.e. the tail of the ascending list.
+    """
+
+    def __init__(self, peak: float) -> None:
+        self.peak = peak
+        self.members: List[Tuple[float, int]] = []  # (factor, order_id), ascending
+        self.seq: Optional[int] = None  # Current entry in the stop index
+
+    def add(self, order: ConditionalOrder) -> None:
+        bisect.insort(self.members, (1 - order.trail_pct / 100, order.order_id))
+
+    def level(self, live: Dict[int, ConditionalOrder]) -> Optional[float]:
+        """Highest stop price among live members (None if empty)."""
+        members = self.members
+        while members and members[-1][1] not in live:
+            members.pop()
+        return self.peak * members[-1][0] if members else None
+
+
+class _PairBook:
+    def __init__(self) -> None:
+        self.stops = _TailIndex()  # key = stop level: fire when level >= price
+        self.take_profits = _TailIndex()  # key = -level: fire when -level >= -price
+        self.groups: List[Tuple[float, int]] = []  # (-peak, group seq), ascending
+        self.group_refs: Dict[int, _TrailGroup] = {}
+
+
+class ConditionalOrderBook:
+    """Resting stop / take-profit / trailing-stop orders across positions.
+
+    Per pair, stops and take-profits live in sorted price indexes; trailing
+    stops are grouped by shared peak (every new high merges all lower-peak
+    groups into one, smaller groups inserted into the largest), and each
+    group sits in the stop index at its highest member's stop price. A tick
+    is a bisect per index plus the work for the k orders that fire.
+
+    Fired orders become `OrderIntent`s submitted to the engine's execution
+    queue (`order_id` / `position_id` in metadata); orders sharing a
+    `position_id` are cancelled with them. Register the book on the engine
+    like a strategy so it sees every tick.
+    """
+
+    def __init__(self, on_trigger: Optional[Callable[[ConditionalOrder, TickEvent], None]] = None) -> None:
+        self.engine = None
+        self.on_trigger = on_trigger
+        self.orders: Dict[int, ConditionalOrder] = {}
+        self._books: Dict[str, _PairBook] = {}
+        self._by_position: Dict[Any, List[int]] = {}
+        self._seq = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._index_seq: Dict[int, int] = {}  # order_id -> seq in its index (non-trailing)
+
+    def attach(self, engine) -> None:
+        self.engine = engine
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def _book(self, pair: str) -> _PairBook:
+        book = self._books.get(pair)
+        if book is None:
+            book = self._books[pair] = _PairBook()
+        return book
+
+    # --- Placing / cancelling ---
+    def place(self, order: ConditionalOrder) -> ConditionalOrder:
+        book = self._book(order.pair)
+        self.orders[order.order_id] = order
+        if order.position_id is not None:
+            self._by_position.setdefault(order.position_id, []).append(order.order_id)
+
+        if order.kind == STOP:
+            seq = next(self._seq)
+            self._index_seq[order.order_id] = seq
+            book.stops.add(order.trigger_price, seq, order)
+        elif order.kind == TAKE_PROFIT:
+            seq = next(self._seq)
+            self._index_seq[order.order_id] = seq
+            book.take_profits.add(-order.trigger_price, seq, order)
+        elif order.kind == TRAILING_STOP:
+            group = self._group_for_peak(book, order.peak)
+            group.add(order)
+            self._reindex_group(book, group)
+        else:
+            raise ValueError(f"Unknown conditional order kind: {order.kind}")
+        return order
+
+    def _new(self, pair, kind, amount, side, strategy_id, position_id, metadata, **kwargs) -> ConditionalOrder:
+        return self.place(ConditionalOrder(
+            order_id=next(self._ids), pair=pair, kind=kind, side=side, amount=amount,
+            strategy_id=strategy_id, position_id=position_id, metadata=dict(metadata or {}), **kwargs,
+        ))
+
+    def place_stop(self, pair, amount, stop_price, side="SELL", strategy_id="", position_id=None, metadata=None):
+        return self._new(pair, STOP, amount, side, strategy_id, position_id, metadata, trigger_price=stop_price)
+
+    def place_take_profit(self, pair, amount, target_price, side="SELL", strategy_id="", position_id=None, metadata=None):
+        return self._new(pair, TAKE_PROFIT, amount, side, strategy_id, position_id, metadata, trigger_price=target_price)
+
+    def place_trailing_stop(self, pair, amount, trail_pct, reference_price, side="SELL",
+                            strategy_id="", position_id=None, metadata=None):
+        if not 0 < trail_pct < 100:
+            raise ValueError("trail_pct must be between 0 and 100")
+        return self._new(pair, TRAILING_STOP, amount, side, strategy_id, position_id, metadata,
+                         trail_pct=trail_pct, peak=reference_price)
+
+    def place_bracket(
+        self,
+        pair: str,
+        amount: float,
+        entry_price: float,
+        position_id: Any,
+        stop_loss_pct: Optional[float] = None,
+        take_profit_pct: Optional[float] = None,
+        trailing_stop_pct: Optional[float] = None,
+        strategy_id: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[ConditionalOrder]:
+        """Protective exits for a long position; the first to fire cancels the rest."""
+        placed = []
+        if stop_loss_pct:
+            placed.append(self.place_stop(pair, amount, entry_price * (1 - stop_loss_pct / 100),
+                                          strategy_id=strategy_id, position_id=position_id, metadata=metadata))
+        if take_profit_pct:
+            placed.append(self.place_take_profit(pair, amount, entry_price * (1 + take_profit_pct / 100),
+                                                 strategy_id=strategy_id, position_id=position_id, metadata=metadata))
+        if trailing_stop_pct:
+            placed.append(self.place_trailing_stop(pair, amount, trailing_stop_pct, entry_price,
+                                                   strategy_id=strategy_id, position_id=position_id, metadata=metadata))
+        return placed
+
+    def cancel(self, order_id: int) -> Optional[ConditionalOrder]:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return None
+        book = self._books[order.pair]
+        seq = self._index_seq.pop(order_id, None)
+        if order.kind == STOP:
+            book.stops.discard(seq)
+        elif order.kind == TAKE_PROFIT:
+            book.take_profits.discard(seq)
+        # Trailing members are dropped lazily by _TrailGroup.level()
+        if order.position_id is not None:
+            siblings = self._by_position.get(order.position_id)
+            if siblings:
+                siblings[:] = [oid for oid in siblings if oid != order_id]
+                if not siblings:
+                    del self._by_position[order.position_id]
+        return order
+
+    def cancel_position(self, position_id: Any) -> List[ConditionalOrder]:
+        return [o for o in (self.cancel(oid) for oid in list(self._by_position.get(position_id, ()))) if o]
+
+    def orders_for(self, position_id: Any) -> List[ConditionalOrder]:
+        return [self.orders[oid] for oid in self._by_position.get(position_id, ()) if oid in self.orders]
+
+    # --- Trailing-stop groups ---
+    def _group_for_peak(self, book: _PairBook, peak: float) -> _TrailGroup:
+        i = bisect.bisect_left(book.groups, (-peak, -1))
+        if i < len(book.groups) and book.groups[i][0] == -peak:
+            return book.group_refs[book.groups[i][1]]
+        group = _TrailGroup(peak)
+        seq = next(self._seq)
+        book.group_refs[seq] = group
+        bisect.insort(book.groups, (-peak, seq))
+        return group
+
+    def _reindex_group(self, book: _PairBook, group: _TrailGroup) -> None:
+        if group.seq is not None:
+            book.stops.discard(group.seq)
+            group.seq = None
+        level = group.level(self.orders)
+        if level is None:
+            return
+        group.seq = next(self._seq)
+        book.stops.add(level, group.seq, group)
+
+    def _raise_peaks(self, book: _PairBook, price: float) -> None:
+        """New high: merge every group whose peak is below `price` into one at `price`."""
+        groups = book.groups
+        cut = bisect.bisect_right(groups, (-price, float("inf")))
+        if cut == len(groups):
+            return
+        lifted = [book.group_refs.pop(seq) for _, seq in groups[cut:]]
+        del groups[cut:]
+        lifted.sort(key=lambda g: len(g.members), reverse=True)
+        merged = lifted[0]
+        for group in lifted[1:]:
+            if group.seq is not None:
+                book.stops.discard(group.seq)
+            for member in group.members:
+                if member[1] in self.orders:
+                    bisect.insort(merged.members, member)
+        merged.peak = price
+        self._reindex_group(book, merged)
+        if merged.seq is not None:
+            seq = next(self._seq)
+            book.group_refs[seq] = merged
+            groups.append((-price, seq))  # Lowest peak of all: stays sorted at the tail
+
+    # --- Ticks ---
+    def check(self, pair: str, price: float) -> List[ConditionalOrder]:
+        """Remove and return every order on `pair` triggered at `price`."""
+        book = self._books.get(pair)
+        if book is None:
+            return []
+        if book.groups:
+            self._raise_peaks(book, price)
+
+        fired: List[ConditionalOrder] = []
+        for ref in book.stops.pop_at_or_above(price):
+            if isinstance(ref, _TrailGroup):
+                fired.extend(self._fire_group(book, ref, price))
+            else:
+                fired.append(ref)
+        fired.extend(book.take_profits.pop_at_or_above(-price))
+
+        triggered = []
+        for order in fired:
+            if order.order_id not in self.orders:
+                continue  # Cancelled by an earlier sibling this tick
+            self.cancel(order.order_id)
+            if order.position_id is not None:
+                self.cancel_position(order.position_id)
+            triggered.append(order)
+        return triggered
+
+    def _fire_group(self, book: _PairBook, group: _TrailGroup, price: float) -> List[ConditionalOrder]:
+        group.seq = None
+        fired = []
+        members = group.members
+        while members and group.peak * members[-1][0] >= price:
+            _, order_id = members.pop()
+            order = self.orders.get(order_id)
+            if order is not None:
+                order.peak = group.peak
+                fired.append(order)
+        self._reindex_group(book, group)
+        if not members:
+            i = bisect.bisect_left(book.groups, (-group.peak, -1))
+            if i < len(book.groups) and book.group_refs.get(book.groups[i][1]) is group:
+                del book.group_refs[book.groups[i][1]]
+                del book.groups[i]
+        return fired
+
+    def on_tick(self, tick: TickEvent) -> None:
+        for order in self.check(tick.pair, tick.price):
+            if self.on_trigger:
+                self.on_trigger(order, tick)
+            if self.engine is not None:
+                self.engine.submit(self.to_intent(order, tick))
+
+    @staticmethod
+    def to_intent(order: ConditionalOrder, tick: TickEvent) -> OrderIntent:
+        reason = f"{order.kind.replace('_', ' ')} at ${order.current_trigger():.2f}"
+        return OrderIntent(
+            strategy_id=order.strategy_id,
+            pair=order.pair,
+            side=order.side,
+            amount=order.amount,
+            price=tick.price,
+            timestamp=tick.timestamp,
+            reason=reason,
+            metadata={**order.metadata, "order_id": order.order_id, "position_id": order.position_id,
+                      "order_kind": order.kind},
+        )
+
+    # --- Introspection ---
+    def nearest_levels(self, pair: str) -> List[float]:
+        """Closest stop-side and take-profit-side trigger prices (for feed scheduling)."""
+        book = self._books.get(pair)
+        if book is None:
+            return []
+        levels = []
+        stop = book.stops.top()
+        if stop is not None:
+            levels.append(stop)
+        take_profit = book.take_profits.top()
+        if take_profit is not None:
+            levels.append(-take_profit)
+        return levels
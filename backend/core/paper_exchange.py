@@ -0,0 +1,364 @@
+"""
+Paper-trading venue
+A simulated exchange with the Jupiter quote/swap interface and a wallet to
+match, filling against constant-product pools with fees, slippage, latency
+and injected failures
+"""
+
+from __future__ import annotations
+
+import base64
+import itertools
+import math
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .clock import Clock, RealClock, SimulatedClock
+from .events import FillEvent, OrderIntent, TickEvent
+from .universe import SOL_MINT, Token, TradingPair, Universe
+
+LAMPORTS_PER_SIGNATURE = 5_000
+
+
+@dataclass
+class Pool:
+    """x*y=k reserves of one pair (base and quote, UI units)."""
+    base: float
+    quote: float
+
+    @property
+    def price(self) -> float:
+        return self.quote / self.base
+
+    def recenter(self, price: float) -> None:
+        """Move the pool to `price` keeping its depth (k)."""
+        k = self.base * self.quote
+        self.base = math.sqrt(k / price)
+        self.quote = k / self.base
+
+    def out_amount(self, amount_in: float, base_in: bool) -> float:
+        if base_in:
+            return self.quote * amount_in / (self.base + amount_in)
+        return self.base * amount_in / (self.quote + amount_in)
+
+    def swap(self, amount_in: float, base_in: bool) -> float:
+        out = self.out_amount(amount_in, base_in)
+        if base_in:
+            self.base += amount_in
+            self.quote -= out
+        else:
+            self.quote += amount_in
+            self.base -= out
+        return out
+
+
+@dataclass
+class _Pending:
+    quote: Dict[str, Any]
+    fee_lamports: int
+    signature: Optional[str] = None
+    landed: Optional[bool] = None
+    error: Optional[str] = None
+
+
+class PaperExchange:
+    """Simulated venue for dry runs and fast strategy tests.
+
+    Every pair of the universe trades against its own constant-product
+    pool holding `liquidity_usd` (half per side). `set_price()` or
+    `on_tick()` (register it on the engine) re-centres a pool on the market
+    price while keeping its depth, so larger orders pay more price impact.
+    A `fee_bps` pool fee comes out of the input amount, and every swap pays
+    the network fee (5000 lamports plus any prioritization fee) in SOL.
+
+    Two ways to trade:
+
+    - **As Jupiter plus a wallet.** `get_quote()` and
+      `build_swap_transaction()` match `JupiterClient`, and `wallet` (a
+      `PaperWallet`) matches `WalletManager`. `SwapExecutor(exchange,
+      exchange.wallet)` then runs its full quote, check, sign, send and
+      confirm pipeline against paper balances. The swap executes at send
+      time against the pool as it is then, after `latency_seconds` of
+      random price drift (`volatility` per sqrt second). If the output
+      falls below the quote's slippage threshold, the transaction lands
+      as failed. Confirmation waits out the latency on a real clock; on a
+      `SimulatedClock` only the drift applies.
+    - **Directly.** `execute(intent)` is an `ExecutionWorker` executor that
+      skips the quote and transaction plumbing (and the network fee). It
+      costs a few microseconds, which suits optimizer and backtest loops.
+
+    Failure injection, seeded by `seed` for reproducible runs:
+    - `failure_rate`: a send raises, as an RPC error would;
+    - `unconfirmed_rate`: the swap lands, but confirmation times out, so
+      the caller sees UNCONFIRMED.
+    """
+
+    def __init__(
+        self,
+        universe: Optional[Universe] = None,
+        clock: Optional[Clock] = None,
+        liquidity_usd: float = 2_000_000.0,
+        fee_bps: float = 30.0,
+        latency_seconds: float = 0.4,
+        volatility: float = 0.0002,
+        failure_rate: float = 0.0,
+        unconfirmed_rate: float = 0.0,
+        balances: Optional[Mapping[str, float]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.universe = universe or Universe.default()
+        self.clock = clock or RealClock()
+        self.liquidity_usd = liquidity_usd
+        self.fee_rate = fee_bps / 10_000
+        self.latency_seconds = latency_seconds
+        self.volatility = volatility
+        self.failure_rate = failure_rate
+        self.unconfirmed_rate = unconfirmed_rate
+        self.balances: Dict[str, float] = {"SOL": 1.0, "USDC": 1_000.0, **(balances or {})}
+        self.pools: Dict[str, Pool] = {}
+        self._usd: Dict[str, float] = {}  # Last USD price per base symbol, for pool depth
+        self.wallet = PaperWallet(self)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()  # Ticks arrive on the engine thread, swaps on the worker
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, _Pending] = {}
+        self.counts = {"quotes": 0, "fills": 0, "failed": 0, "send_errors": 0, "unconfirmed": 0}
+        self.fees_paid: Dict[str, float] = {}
+        self.volume_usd = 0.0
+
+    # --- Market ---
+    def set_price(self, pair: str, price: float) -> None:
+        """Move `pair`'s pool to `price`, creating it on the first call."""
+        book = self.universe.pair(pair)
+        with self._lock:
+            if book.quote.usd_peg:
+                self._usd[book.base.symbol] = price
+            pool = self.pools.get(pair)
+            if pool is None:
+                # Depth in quote units; a quote without a known USD price counts as $1
+                half = self.liquidity_usd / 2 / (1.0 if book.quote.usd_peg else self._usd.get(book.quote.symbol, 1.0))
+                self.pools[pair] = Pool(half / price, half)
+            else:
+                pool.recenter(price)
+
+    def on_tick(self, tick: TickEvent) -> None:
+        if tick.pair in self.universe.pairs:
+            self.set_price(tick.pair, tick.price)
+
+    def _route(self, input_mint: str, output_mint: str) -> Tuple[TradingPair, Pool, bool]:
+        """(pair, pool, base_in) for a swap between two mints."""
+        for pair in self.universe:
+            if pair.base.mint == input_mint and pair.quote.mint == output_mint:
+                base_in = True
+            elif pair.quote.mint == input_mint and pair.base.mint == output_mint:
+                base_in = False
+            else:
+                continue
+            pool = self.pools.get(pair.name)
+            if pool is None:
+                raise RuntimeError(f"No price for {pair.name} yet (set_price or on_tick first)")
+            return pair, pool, base_in
+        raise RuntimeError(f"No pool for {input_mint} -> {output_mint}")
+
+    # --- Jupiter interface ---
+    def get_quote(
+        self,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        slippage_bps: int = 50,
+        only_direct_routes: bool = False,
+    ) -> Dict[str, Any]:
+        pair, pool, base_in = self._route(input_mint, output_mint)
+        token_in, token_out = (pair.base, pair.quote) if base_in else (pair.quote, pair.base)
+        amount_in = token_in.from_raw(amount)
+        out = pool.out_amount(amount_in * (1 - self.fee_rate), base_in)
+        ideal = amount_in * pool.price if base_in else amount_in / pool.price
+        self.counts["quotes"] += 1
+        out_raw = token_out.to_raw(out)
+        return {
+            "inputMint": input_mint,
+            "outputMint": output_mint,
+            "inAmount": str(amount),
+            "outAmount": str(out_raw),
+            "otherAmountThreshold": str(int(out_raw * (10_000 - slippage_bps) / 10_000)),
+            "slippageBps": slippage_bps,
+            "priceImpactPct": str(max(0.0, 1 - out / (ideal * (1 - self.fee_rate))) if ideal else 0.0),
+            "routePlan": [{"swapInfo": {"label": "Paper", "feeAmount": str(token_in.to_raw(amount_in * self.fee_rate))}}],
+            "dex": "Paper",
+        }
+
+    def build_swap_transaction(
+        self,
+        quote: Dict[str, Any],
+        user_pubkey: str,
+        wrap_unwrap_sol: bool = True,
+        prioritization_fee_lamports: Optional[int] = None,
+    ) -> str:
+        txn_id = f"paper-{next(self._ids)}"
+        self._pending[txn_id] = _Pending(dict(quote), LAMPORTS_PER_SIGNATURE + (prioritization_fee_lamports or 0))
+        return base64.b64encode(txn_id.encode()).decode()
+
+    def swap_with_wallet(self, wallet, quote: Dict[str, Any], **kwargs) -> str:
+        serialized_b64 = self.build_swap_transaction(quote, user_pubkey=wallet.pubkey(), **kwargs)
+        return wallet.sign_and_send_v0_txn(serialized_b64)
+
+    # --- Settlement (called by PaperWallet) ---
+    def _send(self, txn_id: str) -> str:
+        pending = self._pending.get(txn_id)
+        if pending is None or pending.signature is not None:
+            raise RuntimeError("Unknown or already sent transaction")
+        if self._random.random() < self.failure_rate:
+            self.counts["send_errors"] += 1
+            del self._pending[txn_id]
+            raise RuntimeError("Simulated RPC error: transaction not sent")
+        pending.signature = f"paper{txn_id[6:]:0>10}{self._random.getrandbits(64):016x}"
+        with self._lock:
+            self._settle(pending)
+        self._pending[pending.signature] = self._pending.pop(txn_id)
+        return pending.signature
+
+    def _settle(self, pending: _Pending) -> None:
+        quote = pending.quote
+        pair, pool, base_in = self._route(quote["inputMint"], quote["outputMint"])
+        token_in, token_out = (pair.base, pair.quote) if base_in else (pair.quote, pair.base)
+        self._pay("SOL", pending.fee_lamports / 1e9)
+        if self.volatility and self.latency_seconds:
+            pool.recenter(pool.price * math.exp(self.volatility * math.sqrt(self.latency_seconds) * self._random.gauss(0, 1)))
+
+        amount_in = token_in.from_raw(quote["inAmount"])
+        out = pool.out_amount(amount_in * (1 - self.fee_rate), base_in)
+        if token_out.to_raw(out) < int(quote.get("otherAmountThreshold", 0)):
+            pending.landed, pending.error = False, "Slippage tolerance exceeded"
+            self.counts["failed"] += 1
+            return
+        if self.balances.get(token_in.symbol, 0.0) < amount_in:
+            pending.landed, pending.error = False, f"Insufficient {token_in.symbol}"
+            self.counts["failed"] += 1
+            return
+        self._transfer(pair, pool, token_in, token_out, amount_in, base_in)
+        pending.landed = True
+
+    def _transfer(self, pair: TradingPair, pool: Pool, token_in: Token, token_out: Token,
+                  amount_in: float, base_in: bool) -> float:
+        fee = amount_in * self.fee_rate
+        out = pool.swap(amount_in - fee, base_in)
+        self.balances[token_in.symbol] = self.balances.get(token_in.symbol, 0.0) - amount_in
+        self.balances[token_out.symbol] = self.balances.get(token_out.symbol, 0.0) + out
+        self.fees_paid[token_in.symbol] = self.fees_paid.get(token_in.symbol, 0.0) + fee
+        self.volume_usd += (out if base_in else amount_in) if pair.quote.usd_peg else 0.0
+        self.counts["fills"] += 1
+        return out
+
+    def _pay(self, symbol: str, amount: float) -> None:
+        self.balances[symbol] = self.balances.get(symbol, 0.0) - amount
+        self.fees_paid[symbol] = self.fees_paid.get(symbol, 0.0) + amount
+
+    def _confirm(self, signature: str) -> bool:
+        pending = self._pending.get(signature)
+        if pending is None:
+            return False
+        if not isinstance(self.clock, SimulatedClock):
+            self.clock.sleep(self.latency_seconds)
+        if pending.landed and self._random.random() < self.unconfirmed_rate:
+            self.counts["unconfirmed"] += 1
+            return False
+        del self._pending[signature]
+        if not pending.landed:
+            raise RuntimeError(f"Transaction {signature} failed: {pending.error}")
+        return True
+
+    # --- Direct execution (fast path) ---
+    def execute(self, intent: OrderIntent) -> FillEvent:
+        """Fill an intent against its pool right away (`ExecutionWorker` executor)."""
+        now = self.clock.time()
+        pair = self.universe.pairs.get(intent.pair)
+        pool = self.pools.get(intent.pair)
+        if pair is None or pool is None:
+            return FillEvent(intent, "REJECTED", now, detail=f"No market for {intent.pair}")
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.counts["send_errors"] += 1
+            return FillEvent(intent, "REJECTED", now, detail="Simulated RPC error")
+        if intent.side == "BUY":
+            spend = intent.metadata.get("usdc_amount", intent.amount * intent.price)
+            if self.balances.get(pair.quote.symbol, 0.0) < spend:
+                return FillEvent(intent, "REJECTED", now, detail=f"Insufficient {pair.quote.symbol}")
+            with self._lock:
+                received = self._transfer(pair, pool, pair.quote, pair.base, spend, False)
+            return FillEvent(intent, "FILLED", now, received, spend / received, f"paper-{next(self._ids)}")
+        if self.balances.get(pair.base.symbol, 0.0) < intent.amount:
+            return FillEvent(intent, "REJECTED", now, detail=f"Insufficient {pair.base.symbol}")
+        with self._lock:
+            proceeds = self._transfer(pair, pool, pair.base, pair.quote, intent.amount, True)
+        return FillEvent(intent, "FILLED", now, intent.amount, proceeds / intent.amount, f"paper-{next(self._ids)}")
+
+    def fill_many(self, pair: str, sides: Sequence[str], amounts: Sequence[float]) -> List[float]:
+        """Run a sequence of market orders (base amounts) through `pair`'s pool; returns fill prices.
+
+        The bulk path for strategy tests: balances are not checked and no
+        events are created, but every order still moves the pool. Not
+        thread-safe; use it on an exchange no engine is feeding.
+        """
+        pool = self.pools[pair]
+        keep = 1 - self.fee_rate
+        prices = []
+        append = prices.append
+        base, quote = pool.base, pool.quote
+        for side, amount in zip(sides, amounts):
+            if side == "BUY":
+                # Quote needed for `amount` base out, fee on the input
+                quote_in = quote * amount / (base - amount) / keep
+                quote += quote_in * keep
+                base -= amount
+                append(quote_in / amount)
+            else:
+                out = quote * amount * keep / (base + amount * keep)
+                base += amount * keep
+                quote -= out
+                append(out / amount)
+        pool.base, pool.quote = base, quote
+        self.counts["fills"] += len(prices)
+        return prices
+
+    # --- Reporting ---
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "volume_usd": self.volume_usd,
+            "fees_paid": dict(self.fees_paid),
+            "balances": dict(self.balances),
+        }
+
+
+class PaperWallet:
+    """The `WalletManager` interface over a `PaperExchange`'s balances."""
+
+    def __init__(self, exchange: PaperExchange, address: str = "PaperWa11et111111111111111111111111111111111") -> None:
+        self.exchange = exchange
+        self.address = address
+
+    def pubkey(self) -> str:
+        return self.address
+
+    def get_sol_balance(self) -> float:
+        return self.exchange.balances.get("SOL", 0.0)
+
+    def get_spl_balance(self, mint: str) -> float:
+        token = self.exchange.universe.token_by_mint(mint)
+        if token is None or mint == SOL_MINT:
+            return 0.0
+        return self.exchange.balances.get(token.symbol, 0.0)
+
+    def sign_v0_txn(self, serialized_txn_b64: str) -> bytes:
+        return base64.b64decode(serialized_txn_b64)
+
+    def send_signed_txn(self, signed_txn: bytes, skip_preflight: bool = False, max_retries: Optional[int] = None) -> str:
+        return self.exchange._send(signed_txn.decode())
+
+    def sign_and_send_v0_txn(self, serialized_txn_b64: str) -> str:
+        return self.send_signed_txn(self.sign_v0_txn(serialized_txn_b64))
+
+    def confirm_signature(self, signature: str, timeout_seconds: float = 60.0, poll_seconds: float = 1.0) -> bool:
+        return self.exchange._confirm(signature)
@@ -0,0 +1,187 @@
+"""
+Venue-wide pool scanner for Orca whirlpools
+Keeps price / volume / liquidity per pool in columnar arrays and runs spike
+and momentum detection over every pool in one vectorized pass per refresh
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .clock import Clock, RealClock
+from .price_monitor import PriceMonitorBank
+
+
+@dataclass
+class PoolCandidate:
+    """One ranked pool from a scan"""
+    address: str
+    pair: str  # "TOKEN_A/TOKEN_B"; price is B per 1 A
+    price: float
+    change_pct: float
+    volume_ratio: float
+    volume_day: float
+    tvl: float
+    volume_spike: bool
+    momentum: bool
+    score: float
+
+
+class PoolScanner:
+    """Tracks every pool of a whirlpool list and ranks the ones that move.
+
+    Each `refresh()` parses the list once into column arrays (price, 24h
+    volume, TVL, liquidity), appends one point per pool to a
+    `PriceMonitorBank` and answers every detector with array ops, so the
+    per-refresh cost grows with the number of pools only through NumPy.
+
+    Interval volume is the growth of the pool's 24h volume since the last
+    refresh (clipped at zero), which is what `volume_spike` compares against
+    its recent average.
+    """
+
+    def __init__(
+        self,
+        orca_client=None,
+        max_points: int = 120,
+        min_tvl: float = 10_000.0,
+        min_volume_day: float = 1_000.0,
+        spike_multiplier: float = 4.0,
+        spike_window: int = 20,
+        min_change_pct: float = 3.0,
+        momentum_lookback: int = 10,
+        clock: Optional[Clock] = None,
+        initial_capacity: int = 1024,
+    ) -> None:
+        self.orca = orca_client
+        self.clock = clock or RealClock()
+        self.min_tvl = min_tvl
+        self.min_volume_day = min_volume_day
+        self.spike_multiplier = spike_multiplier
+        self.spike_window = spike_window
+        self.min_change_pct = min_change_pct
+        self.momentum_lookback = momentum_lookback
+
+        self.bank = PriceMonitorBank(initial_capacity, max_points=max_points)
+        self.addresses: List[str] = []
+        self.pairs: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.price = np.zeros(initial_capacity)
+        self.volume_day = np.zeros(initial_capacity)
+        self.tvl = np.zeros(initial_capacity)
+        self.liquidity = np.zeros(initial_capacity)
+        self.seen = np.zeros(initial_capacity, dtype=bool)  # Present in the latest list
+        self.refresh_count = 0
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.bank.n_series
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self.bank.resize(capacity)
+        for name in ("price", "volume_day", "tvl", "liquidity", "seen"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:old.size] = old
+            setattr(self, name, grown)
+
+    def refresh(self, pools_data: Optional[Mapping[str, Any]] = None) -> None:
+        """Ingest one whirlpool list (fetched from `orca_client` if not given)."""
+        if pools_data is None:
+            pools_data = self.orca.get_pools()
+        pools = pools_data.get("whirlpools", [])
+
+        rows = np.empty(len(pools), dtype=np.int64)
+        price = np.empty(len(pools))
+        volume_day = np.empty(len(pools))
+        tvl = np.empty(len(pools))
+        liquidity = np.empty(len(pools))
+        for i, pool in enumerate(pools):
+            address = pool.get("address", "")
+            row = self._rows.get(address)
+            if row is None:
+                row = len(self.addresses)
+                self._rows[address] = row
+                self.addresses.append(address)
+                token_a, token_b = pool.get("tokenA", {}), pool.get("tokenB", {})
+                self.pairs.append(f"{token_a.get('symbol') or token_a.get('mint', '?')[:4]}/"
+                                  f"{token_b.get('symbol') or token_b.get('mint', '?')[:4]}")
+            rows[i] = row
+            price[i] = float(pool.get("price") or 0.0)
+            volume = pool.get("volume") or {}
+            volume_day[i] = float((volume.get("day") if isinstance(volume, dict) else volume) or 0.0)
+            tvl[i] = float(pool.get("tvl") or 0.0)
+            liquidity[i] = float(pool.get("liquidity") or 0.0)
+
+        self._grow(len(self.addresses))
+        n = self.bank.n_series
+        known = self.bank.lengths()[rows] > 0
+        interval_volume = np.where(known, np.maximum(volume_day - self.volume_day[rows], 0.0), 0.0)
+
+        self.price[rows] = price
+        self.volume_day[rows] = volume_day
+        self.tvl[rows] = tvl
+        self.liquidity[rows] = liquidity
+        self.seen[:] = False
+        self.seen[rows] = True
+
+        full_prices = np.zeros(n)
+        full_volumes = np.zeros(n)
+        full_prices[rows] = price
+        full_volumes[rows] = interval_volume
+        self.bank.add_points(self.clock.time(), full_prices, full_volumes, mask=self.seen)
+        self.refresh_count += 1
+
+    def scan(self, top_n: int = 20) -> List[PoolCandidate]:
+        """Rank pools with a volume spike or momentum, best first."""
+        n = len(self.addresses)
+        if n == 0:
+            return []
+        change = self.bank.change_pct(self.momentum_lookback)[:n]
+        ratio = self.bank.volume_ratio(self.spike_window)[:n]
+        spike = ratio >= self.spike_multiplier
+        momentum = change >= self.min_change_pct
+
+        eligible = (
+            self.seen[:n]
+            & (self.tvl[:n] >= self.min_tvl)
+            & (self.volume_day[:n] >= self.min_volume_day)
+            & (spike | momentum)
+        )
+        idx = np.flatnonzero(eligible)
+        if idx.size == 0:
+            return []
+
+        # Each signal scored relative to its own threshold, so a pool with both counts double
+        score = (
+            np.nan_to_num(change[idx] / self.min_change_pct, nan=0.0).clip(min=0.0)
+            + np.nan_to_num(ratio[idx] / self.spike_multiplier, nan=0.0)
+        )
+        if idx.size > top_n:
+            keep = np.argpartition(-score, top_n - 1)[:top_n]
+            idx, score = idx[keep], score[keep]
+        order = np.argsort(-score, kind="stable")
+        idx, score = idx[order], score[order]
+
+        return [
+            PoolCandidate(
+                address=self.addresses[i],
+                pair=self.pairs[i],
+                price=float(self.price[i]),
+                change_pct=float(change[i]),
+                volume_ratio=float(ratio[i]),
+                volume_day=float(self.volume_day[i]),
+                tvl=float(self.tvl[i]),
+                volume_spike=bool(spike[i]),
+                momentum=bool(momentum[i]),
+                score=float(s),
+            )
+            for i, s in zip(idx.tolist(), score.tolist())
+        ]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from collections import deque
+from array import array
 from dataclasses import dataclass
-from typing import Deque, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 
 @dataclass
@@ -10,35 +12,76 @@ class PriceMonitor:
     """Lightweight signal scaffolding for volume spikes and price momentum.
 
     Provide your own data feed and call `add_point(ts, price, volume)`.
+
+    Points live in preallocated fixed-size arrays used as a ring, and volume
+    is stored as running prefix sums, so every window sum is one subtraction:
+    `add_point`, `volume_spike`, `momentum` and `signal` are O(1) and never
+    copy the history.
     """
 
     max_points: int = 500
 
     def __post_init__(self) -> None:
-        self.points: Deque[Tuple[float, float, float]] = deque(maxlen=self.max_points)
+        # One spare slot so a full-length window can still read the prefix
+        # sum just before its first point.
+        self._size = self.max_points + 1
+        zeros = bytes(8 * self._size)
+        self._ts = array("d", zeros)
+        self._px = array("d", zeros)
+        self._vol = array("d", zeros)
+        self._cumvol = array("d", zeros)
+        self._count = 0  # points ever added
+        self._total_vol = 0.0
+
+    def __len__(self) -> int:
+        return min(self._count, self.max_points)
+
+    @property
+    def points(self) -> List[Tuple[float, float, float]]:
+        """Stored (ts, price, volume) tuples, oldest first. Copies; debug use only."""
+        size = self._size
+        start = self._count - len(self)
+        return [
+            (self._ts[g % size], self._px[g % size], self._vol[g % size])
+            for g in range(start, self._count)
+        ]
 
     def add_point(self, ts: float, price: float, volume: float) -> None:
-        self.points.append((ts, price, volume))
+        i = self._count % self._size
+        self._ts[i] = ts
+        self._px[i] = price
+        self._vol[i] = volume
+        self._total_vol += volume
+        self._cumvol[i] = self._total_vol
+        self._count += 1
+        if self._count % self._size == 0:
+            self._rebase()
 
-    def _window(self, n: int):
-        if n <= 0:
-            return []
-        return list(self.points)[-n:]
+    def _rebase(self) -> None:
+        # Slot 0 now holds the oldest point; shift every prefix sum so it is
+        # zero. Differences are unchanged and totals stay small (O(1) amortized).
+        base = self._cumvol[0]
+        cum = self._cumvol
+        for k in range(self._size):
+            cum[k] -= base
+        self._total_vol -= base
+
+    def _prefix(self, g: int) -> float:
+        """Cumulative volume through global point index `g` (0.0 before the first)."""
+        return self._cumvol[g % self._size] if g >= 0 else 0.0
 
     def volume_spike(self, multiplier: float = 4.0, window: int = 20) -> bool:
-        win = self._window(window)
-        if len(win) < window:
+        if window <= 0 or len(self) < window:
             return False
-        vols = [v for _, _, v in win]
-        avg = sum(vols[:-1]) / max(1, len(vols) - 1)
-        return vols[-1] >= multiplier * avg if avg > 0 else False
+        last = self._count - 1
+        avg = (self._prefix(last - 1) - self._prefix(last - window)) / max(1, window - 1)
+        return self._vol[last % self._size] >= multiplier * avg if avg > 0 else False
 
     def momentum(self, min_change_pct: float = 3.0, lookback: int = 10) -> bool:
-        win = self._window(lookback)
-        if len(win) < lookback:
+        if lookback <= 0 or len(self) < lookback:
             return False
-        p0 = win[0][1]
-        p1 = win[-1][1]
+        p0 = self._px[(self._count - lookback) % self._size]
+        p1 = self._px[(self._count - 1) % self._size]
         if p0 <= 0:
             return False
         change_pct = (p1 - p0) / p0 * 100
@@ -49,3 +92,119 @@ class PriceMonitor:
             "volume_spike": self.volume_spike(),
             "momentum": self.momentum(),
         }
+
+
+class PriceMonitorBank:
+    """`PriceMonitor` for many series at once, one row per token.
+
+    Same ring + prefix-sum layout as `PriceMonitor`, held in 2-D NumPy arrays
+    so each check is a handful of vectorized ops across every token. Series
+    may tick independently by passing `mask` to `add_points`.
+    """
+
+    def __init__(self, n_series: int, max_points: int = 500) -> None:
+        if n_series <= 0 or max_points <= 0:
+            raise ValueError("n_series and max_points must be positive")
+        self.n_series = n_series
+        self.max_points = max_points
+        self._size = max_points + 1
+        shape = (n_series, self._size)
+        self._ts = np.zeros(shape)
+        self._px = np.zeros(shape)
+        self._vol = np.zeros(shape)
+        self._cumvol = np.zeros(shape)
+        self._count = np.zeros(n_series, dtype=np.int64)
+        self._total_vol = np.zeros(n_series)
+        self._all_rows = np.arange(n_series)
+
+    def lengths(self) -> np.ndarray:
+        return np.minimum(self._count, self.max_points)
+
+    def add_points(
+        self,
+        ts,
+        prices: np.ndarray,
+        volumes: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+    ) -> None:
+        """Append one point per series (only rows where `mask` is True).
+
+        `ts` may be a scalar or an array; arrays are full-length (n_series)
+        and rows outside `mask` are ignored.
+        """
+        rows = self._all_rows if mask is None else np.flatnonzero(mask)
+        if rows.size == 0:
+            return
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        ts = np.broadcast_to(np.asarray(ts, dtype=np.float64), (self.n_series,))
+        if mask is not None:
+            prices, volumes, ts = prices[rows], volumes[rows], ts[rows]
+
+        slot = self._count[rows] % self._size
+        self._ts[rows, slot] = ts
+        self._px[rows, slot] = prices
+        self._vol[rows, slot] = volumes
+        self._total_vol[rows] += volumes
+        self._cumvol[rows, slot] = self._total_vol[rows]
+        self._count[rows] += 1
+
+        wrapped = rows[self._count[rows] % self._size == 0]
+        if wrapped.size:
+            base = self._cumvol[wrapped, 0].copy()
+            self._cumvol[wrapped] -= base[:, None]
+            self._total_vol[wrapped] -= base
+
+    def resize(self, n_series: int) -> None:
+        """Grow to `n_series` rows; new rows start empty."""
+        extra = n_series - self.n_series
+        if extra < 0:
+            raise ValueError("PriceMonitorBank can only grow")
+        if extra == 0:
+            return
+        pad = np.zeros((extra, self._size))
+        self._ts = np.vstack([self._ts, pad])
+        self._px = np.vstack([self._px, pad])
+        self._vol = np.vstack([self._vol, pad])
+        self._cumvol = np.vstack([self._cumvol, pad])
+        self._count = np.concatenate([self._count, np.zeros(extra, dtype=np.int64)])
+        self._total_vol = np.concatenate([self._total_vol, np.zeros(extra)])
+        self.n_series = n_series
+        self._all_rows = np.arange(n_series)
+
+    def _at(self, arr: np.ndarray, g: np.ndarray) -> np.ndarray:
+        return arr[self._all_rows, g % self._size]
+
+    def volume_ratio(self, window: int = 20) -> np.ndarray:
+        """Last volume over the mean of the previous `window - 1` (NaN while warming up)."""
+        if window <= 0:
+            return np.full(self.n_series, np.nan)
+        last = self._count - 1
+        hi = np.where(last - 1 >= 0, self._at(self._cumvol, last - 1), 0.0)
+        lo = np.where(last - window >= 0, self._at(self._cumvol, last - window), 0.0)
+        avg = (hi - lo) / max(1, window - 1)
+        ok = (self.lengths() >= window) & (avg > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ok, self._at(self._vol, last) / avg, np.nan)
+
+    def change_pct(self, lookback: int = 10) -> np.ndarray:
+        """% change over the last `lookback` points (NaN while warming up)."""
+        if lookback <= 0:
+            return np.full(self.n_series, np.nan)
+        p0 = self._at(self._px, self._count - lookback)
+        p1 = self._at(self._px, self._count - 1)
+        ok = (self.lengths() >= lookback) & (p0 > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ok, (p1 - p0) / p0 * 100, np.nan)
+
+    def volume_spike(self, multiplier: float = 4.0, window: int = 20) -> np.ndarray:
+        return self.volume_ratio(window) >= multiplier
+
+    def momentum(self, min_change_pct: float = 3.0, lookback: int = 10) -> np.ndarray:
+        return self.change_pct(lookback) >= min_change_pct
+
+    def signal(self) -> Dict[str, np.ndarray]:
+        return {
+            "volume_spike": self.volume_spike(),
+            "momentum": self.momentum(),
+        }
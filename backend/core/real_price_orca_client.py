@@ -8,22 +8,23 @@ import json
 import requests
 from typing import Any, Dict, Optional
 
+from .clock import Clock, RealClock
+
 
 class RealPriceOrcaClient:
     """Orca DEX client with REAL market prices instead of mock data"""
 
-    def __init__(self, base_url: str = "https://api.orca.so", timeout: int = 20) -> None:
+    def __init__(self, base_url: str = "https://api.orca.so", timeout: int = 20, clock: Optional[Clock] = None) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.clock = clock or RealClock()
         self._cached_sol_price = None
         self._price_cache_time = 0
 
     def get_real_sol_price(self) -> float:
         """Get current SOL/USD price from CoinGecko"""
-        import time
-        
         # Cache price for 30 seconds to avoid rate limits
-        now = time.time()
+        now = self.clock.time()
         if self._cached_sol_price and (now - self._price_cache_time) < 30:
             return self._cached_sol_price
         
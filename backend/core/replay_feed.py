@@ -0,0 +1,92 @@
+"""
+Replay feed for recorded price ticks
+Serves recorded SOL prices according to a Clock, so the bot can re-run a
+session in simulated time
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+from .clock import Clock
+from .dynamic_price_feed import LivePrice
+from .price_buffer import PriceWindow
+
+
+class ReplayFinished(Exception):
+    """Raised when the clock moves past the last recorded tick."""
+
+
+class ReplayPriceFeed:
+    """Drop-in for `LivePriceOrcaClient` / `DynamicPriceFeed` backed by recorded ticks.
+
+    The price at clock time t is the last tick recorded at or before t.
+    Pair it with a `SimulatedClock` starting at `start_time` to replay a
+    session deterministically at CPU speed.
+    """
+
+    SOL_MINT = "So11111111111111111111111111111111111111112"
+    USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+    def __init__(self, ticks: PriceWindow, clock: Clock, source: str = "Replay", pair: str = "SOL/USDC") -> None:
+        if len(ticks) == 0:
+            raise ValueError("Replay needs at least one tick")
+        self.timestamps = np.asarray(ticks.timestamps, dtype=np.float64)
+        self.prices = np.asarray(ticks.prices, dtype=np.float64)
+        self.clock = clock
+        self.source = source
+        self.pair = pair
+        self.update_count = 0
+
+    @property
+    def start_time(self) -> float:
+        return float(self.timestamps[0])
+
+    @property
+    def end_time(self) -> float:
+        return float(self.timestamps[-1])
+
+    def get_live_sol_price(self, force_fresh: bool = True) -> LivePrice:
+        now = self.clock.time()
+        if now > self.end_time:
+            raise ReplayFinished(f"Replay ended at {self.end_time:.0f}")
+        i = max(0, int(np.searchsorted(self.timestamps, now, side="right")) - 1)
+        self.update_count += 1
+        return LivePrice(price_usd=float(self.prices[i]), timestamp=now, source=self.source)
+
+    def get_current_sol_price(self) -> float:
+        return self.get_live_sol_price().price_usd
+
+    def get_prices(self) -> Dict[str, float]:
+        """Same shape as `LivePriceOrcaClient.get_prices` for the replayed pair."""
+        return {self.pair: self.get_live_sol_price().price_usd}
+
+    def get_quote(
+        self,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        slippage_bps: int = 50,
+    ) -> Dict:
+        """Quote SOL <-> USDC at the replayed price (same shape as LivePriceOrcaClient)."""
+        live = self.get_live_sol_price()
+        slippage_factor = (10000 - slippage_bps) / 10000
+        if input_mint == self.SOL_MINT and output_mint == self.USDC_MINT:
+            out = int(amount / 1_000_000_000 * live.price_usd * 1_000_000 * slippage_factor)
+        elif input_mint == self.USDC_MINT and output_mint == self.SOL_MINT:
+            out = int(amount / 1_000_000 / live.price_usd * 1_000_000_000 * slippage_factor)
+        else:
+            raise RuntimeError(f"Unsupported pair: {input_mint} -> {output_mint}")
+        return {
+            "inputMint": input_mint,
+            "outputMint": output_mint,
+            "inAmount": str(amount),
+            "outAmount": str(out),
+            "slippageBps": slippage_bps,
+            "dex": "Replay",
+            "liveSolPrice": live.price_usd,
+            "priceSource": live.source,
+            "priceTimestamp": live.timestamp,
+        }
@@ -0,0 +1,248 @@
+"""
+Pre-trade risk engine
+Enforces the config.json `risk` block on every order intent before it
+reaches execution, from incrementally kept exposure and daily P&L
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .clock import Clock, RealClock
+from .events import ConfigChanged, FillEvent, OrderIntent, TickEvent
+from .ledger import trading_day
+from .metrics import MetricsRegistry
+from .universe import SOL_MINT, TradingPair, Universe
+
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """Account-wide limits (SOL-denominated); None means unlimited."""
+    max_positions: Optional[int] = None  # Open positions plus in-flight buys, all strategies
+    stake_sol: Optional[float] = None  # Largest single buy, in SOL
+    daily_loss_cap_sol: Optional[float] = None  # New buys stop once today's realized loss reaches this
+
+    def __post_init__(self) -> None:
+        for name in ("max_positions", "stake_sol", "daily_loss_cap_sol"):
+            value = getattr(self, name)
+            if value is not None and not 0 < value < math.inf:
+                raise ValueError(f"risk.{name} must be positive and finite, got {value!r}")
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "RiskLimits":
+        """From a config.json dict (its `risk` block)."""
+        risk = config.get("risk", {})
+        if not isinstance(risk, Mapping):
+            raise ValueError(f"risk must be an object, got {type(risk).__name__}")
+        return cls(
+            max_positions=int(risk["max_positions"]) if risk.get("max_positions") is not None else None,
+            stake_sol=float(risk["stake_sol"]) if risk.get("stake_sol") is not None else None,
+            daily_loss_cap_sol=float(risk["daily_loss_cap_sol"]) if risk.get("daily_loss_cap_sol") is not None else None,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = "config.json") -> "RiskLimits":
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+
+@dataclass
+class _Book:
+    """Holdings of one (pair, strategy): base amount, cost in quote and in SOL, open positions."""
+    amount: float = 0.0
+    cost: float = 0.0
+    cost_sol: float = 0.0
+    positions: int = 0
+
+
+class RiskEngine:
+    """Checks order intents against `RiskLimits` in constant time.
+
+    Pass it to `EventEngine(risk=...)`: every submitted intent goes through
+    `admit()` first, and a refused one comes back as a REJECTED fill
+    without reaching the execution worker. The engine also registers the
+    risk engine for fills, so its books follow executions.
+
+    State is a handful of running totals — open positions, in-flight buys,
+    SOL exposure, today's realized P&L in SOL — updated per fill, so a
+    check never looks at trade history. Realized P&L uses average cost per
+    (pair, strategy). The day rolls over (UTC) on the first check or fill
+    of a new day by resetting the daily total.
+
+    An UNCONFIRMED buy keeps its reservation until a later FILLED or
+    REJECTED fill for the same intent settles it. Only buys are limited;
+    sells reduce risk and always pass. Amounts are
+    converted to SOL with the fill price for SOL pairs, otherwise with the
+    last SOL/USD-pegged tick seen by `on_tick`.
+    """
+
+    def __init__(
+        self,
+        limits: RiskLimits,
+        universe: Optional[Universe] = None,
+        clock: Optional[Clock] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.limits = limits
+        self.universe = universe or Universe.default()
+        self.clock = clock or RealClock()
+        self.metrics = metrics
+
+        self.open_positions = 0
+        self.exposure_sol = 0.0  # Cost of open positions plus in-flight buys
+        self.daily_pnl_sol = 0.0
+        self.day = trading_day(self.clock.time())
+        self.sol_usd: Optional[float] = None
+        self.rejected = 0
+        self._books: Dict[Tuple[str, str], _Book] = {}
+        self._reserved: Dict[int, float] = {}  # intent_id -> SOL held back for an in-flight buy
+
+        if metrics is not None:
+            self._rejections = metrics.counter("risk_rejections_total", "Order intents refused by the risk engine")
+            metrics.gauge("risk_open_positions", "Open plus in-flight positions").set_function(
+                lambda: self.open_positions + len(self._reserved))
+            metrics.gauge("risk_exposure_sol", "SOL committed to open and in-flight buys").set_function(
+                lambda: self.exposure_sol)
+            metrics.gauge("risk_daily_pnl_sol", "Realized P&L of the current UTC day, in SOL").set_function(
+                lambda: self.daily_pnl_sol)
+
+    # --- Checks (engine thread) ---
+    def can_open(self) -> Optional[str]:
+        """Why a new buy would be refused right now (daily loss cap, position slots), or None."""
+        self._roll_day(self.clock.time())
+        limits = self.limits
+        if limits.daily_loss_cap_sol is not None and self.daily_pnl_sol <= -limits.daily_loss_cap_sol:
+            return f"Daily loss cap reached ({self.daily_pnl_sol:+.4f} SOL, cap {limits.daily_loss_cap_sol:g})"
+        if limits.max_positions is not None and self.open_positions + len(self._reserved) >= limits.max_positions:
+            return f"Max positions reached ({limits.max_positions})"
+        return None
+
+    def check(self, intent: OrderIntent) -> Optional[str]:
+        """Rejection reason for `intent`, or None if it is within limits."""
+        if intent.side != "BUY":
+            return None
+        reason = self.can_open()
+        if reason:
+            return reason
+        stake = self._intent_sol(intent)
+        if self.limits.stake_sol is not None and stake is not None and stake > self.limits.stake_sol + _EPSILON:
+            return f"Stake {stake:.4f} SOL above {self.limits.stake_sol:g} SOL"
+        return None
+
+    def admit(self, intent: OrderIntent) -> Optional[str]:
+        """`check()`, and on success hold a position slot and exposure until the fill arrives."""
+        reason = self.check(intent)
+        if reason:
+            self.rejected += 1
+            if self.metrics is not None:
+                self._rejections.inc()
+            return reason
+        if intent.side == "BUY":
+            stake = self._intent_sol(intent) or 0.0
+            self._reserved[intent.intent_id] = stake
+            self.exposure_sol += stake
+        return None
+
+    def on_config(self, event: ConfigChanged) -> None:
+        """Switch to reloaded limits (`BotSettings.risk`); running totals are kept."""
+        limits = getattr(event.settings, "risk", None)
+        if isinstance(limits, RiskLimits):
+            self.limits = limits
+
+    # --- Accounting (engine thread) ---
+    def on_tick(self, tick: TickEvent) -> None:
+        pair = self.universe.pairs.get(tick.pair)
+        if pair is not None and pair.base.mint == SOL_MINT and pair.quote.usd_peg:
+            self.sol_usd = tick.price
+
+    def on_fill(self, fill: FillEvent) -> None:
+        intent = fill.intent
+        if fill.status == "UNCONFIRMED":
+            return  # May still land: its slot and exposure stay held until the final fill
+        self.exposure_sol -= self._reserved.pop(intent.intent_id, 0.0)
+        if not fill.filled:
+            return
+        self._roll_day(fill.timestamp)
+        if intent.side == "BUY":
+            self.open_position(intent.pair, intent.strategy_id, fill.filled_amount, fill.fill_price)
+            return
+
+        book = self._books.get((intent.pair, intent.strategy_id))
+        if book is None or book.amount <= _EPSILON:
+            return  # Nothing we opened (e.g. a pre-existing balance)
+        share = min(fill.filled_amount, book.amount) / book.amount
+        cost, cost_sol = book.cost * share, book.cost_sol * share
+        proceeds = fill.fill_price * book.amount * share
+        pnl_sol = self._quote_to_sol(self.universe.pairs.get(intent.pair), proceeds - cost, fill.fill_price)
+        if pnl_sol is not None:
+            self.daily_pnl_sol += pnl_sol
+        self.exposure_sol = max(0.0, self.exposure_sol - cost_sol)
+
+        # A sell closes one position, or all of them once the book is flat
+        closed = book.positions if share >= 1 - _EPSILON else min(1, book.positions)
+        if share >= 1 - _EPSILON:
+            book.amount = book.cost = book.cost_sol = 0.0
+        else:
+            book.amount -= book.amount * share
+            book.cost -= cost
+            book.cost_sol -= cost_sol
+        book.positions -= closed
+        self.open_positions -= closed
+
+    def open_position(self, pair_name: str, strategy_id: str, amount: float, price: float) -> None:
+        """Count an open position (on a buy fill, or when restoring state after a restart)."""
+        pair = self.universe.pairs.get(pair_name)
+        book = self._books.setdefault((pair_name, strategy_id), _Book())
+        cost_sol = self._quote_to_sol(pair, amount * price, price) or 0.0
+        book.amount += amount
+        book.cost += amount * price
+        book.cost_sol += cost_sol
+        book.positions += 1
+        self.open_positions += 1
+        self.exposure_sol += cost_sol
+
+    def add_realized(self, pnl_sol: float) -> None:
+        """Seed today's realized P&L (e.g. from the trade ledger at startup)."""
+        self._roll_day(self.clock.time())
+        self.daily_pnl_sol += pnl_sol
+
+    def _roll_day(self, timestamp: float) -> None:
+        day = trading_day(timestamp)
+        if day > self.day:
+            self.day = day
+            self.daily_pnl_sol = 0.0
+
+    # --- Conversions ---
+    def _intent_sol(self, intent: OrderIntent) -> Optional[float]:
+        pair = self.universe.pairs.get(intent.pair)
+        if pair is not None and pair.base.mint == SOL_MINT:
+            return intent.amount
+        notional = intent.metadata.get("usdc_amount", intent.amount * intent.price)
+        return self._quote_to_sol(pair, notional, intent.price)
+
+    def _quote_to_sol(self, pair: Optional[TradingPair], quote_amount: float, price: float) -> Optional[float]:
+        """Quote-token amount in SOL; None when no conversion is known."""
+        if pair is None:
+            return None
+        if pair.quote.mint == SOL_MINT:
+            return quote_amount
+        if pair.base.mint == SOL_MINT:
+            return quote_amount / price if price else None
+        if pair.quote.usd_peg and self.sol_usd:
+            return quote_amount / self.sol_usd
+        return None
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "open_positions": self.open_positions,
+            "in_flight_buys": len(self._reserved),  # Includes unconfirmed buys
+            "exposure_sol": self.exposure_sol,
+            "daily_pnl_sol": self.daily_pnl_sol,
+            "rejected": self.rejected,
+        }
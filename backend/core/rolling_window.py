@@ -0,0 +1,81 @@
+"""
+Rolling time-window aggregates for live price streams
+Tracks max, min and mean over the last N seconds in amortized O(1) per tick
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class RollingWindow:
+    """Incremental min / max / mean over a sliding time window.
+
+    Max and min are kept in monotonic deques, the mean in a running sum.
+    Samples older than `window_seconds` are expired lazily by timestamp, so
+    each `push` and each query is amortized O(1) no matter how long the
+    stream gets.
+
+    Timestamps must be pushed in non-decreasing order.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        self.window_seconds = float(window_seconds)
+        self._samples: Deque[Tuple[float, float]] = deque()
+        self._max: Deque[Tuple[float, float]] = deque()  # values decreasing
+        self._min: Deque[Tuple[float, float]] = deque()  # values increasing
+        self._sum = 0.0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def push(self, timestamp: float, value: float) -> None:
+        """Add a sample and expire anything that fell out of the window."""
+        self._samples.append((timestamp, value))
+        self._sum += value
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Drop samples with timestamp < now - window_seconds."""
+        cutoff = now - self.window_seconds
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            self._sum -= samples.popleft()[1]
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        if not samples:
+            self._sum = 0.0  # no float drift carried across empty windows
+
+    def max(self, now: Optional[float] = None) -> Optional[float]:
+        """Highest value in the window ending at `now` (None if empty)."""
+        if now is not None:
+            self.expire(now)
+        return self._max[0][1] if self._max else None
+
+    def min(self, now: Optional[float] = None) -> Optional[float]:
+        """Lowest value in the window ending at `now` (None if empty)."""
+        if now is not None:
+            self.expire(now)
+        return self._min[0][1] if self._min else None
+
+    def mean(self, now: Optional[float] = None) -> Optional[float]:
+        """Average value in the window ending at `now` (None if empty)."""
+        if now is not None:
+            self.expire(now)
+        if not self._samples:
+            return None
+        return self._sum / len(self._samples)
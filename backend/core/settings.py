@@ -0,0 +1,169 @@
+"""
+Hot-reloadable bot settings
+Trading thresholds, intervals and risk limits read from config.json, and a
+watcher that re-reads the file when it changes and hands validated
+settings to the running engine
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from .events import ConfigChanged
+from .risk import RiskLimits
+
+
+@dataclass(frozen=True)
+class BotSettings:
+    """Everything that can change while the bot runs.
+
+    Read from the `bot` block of config.json (field names below), plus the
+    top-level `slippage_bps` and the `risk` block. Invalid values raise
+    `ValueError`, so a bad edit never reaches a running strategy.
+    """
+    buy_dip_pct: float = 2.0  # Buy when price drops this far below the recent high
+    sell_rise_pct: float = 2.0  # Take profit this far above entry
+    stop_loss_pct: float = 5.0  # Stop out this far below entry
+    trailing_stop_pct: Optional[float] = None  # e.g. 3.0 adds a 3% trailing stop to every position
+    position_size_usd: float = 5.0  # Quote spent per buy
+    max_daily_trades: int = 10
+    check_interval_seconds: float = 20.0  # Fixed poll interval (ignored with an adaptive scheduler)
+    slippage_bps: int = 50  # Live swaps
+    risk: RiskLimits = field(default_factory=RiskLimits)
+
+    def __post_init__(self) -> None:
+        for name in ("buy_dip_pct", "sell_rise_pct", "stop_loss_pct", "trailing_stop_pct",
+                     "position_size_usd", "check_interval_seconds"):
+            value = getattr(self, name)
+            if value is not None and not math.isfinite(value):
+                raise ValueError(f"bot.{name} must be a finite number, got {value!r}")
+        for name in ("buy_dip_pct", "sell_rise_pct", "stop_loss_pct", "position_size_usd"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"bot.{name} must be positive, got {getattr(self, name)!r}")
+        if self.stop_loss_pct >= 100:
+            raise ValueError(f"bot.stop_loss_pct must be below 100, got {self.stop_loss_pct!r}")
+        if self.trailing_stop_pct is not None and not 0 < self.trailing_stop_pct < 100:
+            raise ValueError(f"bot.trailing_stop_pct must be between 0 and 100, got {self.trailing_stop_pct!r}")
+        if self.max_daily_trades < 0:
+            raise ValueError(f"bot.max_daily_trades must not be negative, got {self.max_daily_trades!r}")
+        if self.check_interval_seconds < 1:
+            raise ValueError(f"bot.check_interval_seconds must be at least 1, got {self.check_interval_seconds!r}")
+        if not 0 <= self.slippage_bps <= 10_000:
+            raise ValueError(f"slippage_bps must be between 0 and 10000, got {self.slippage_bps!r}")
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], base: Optional["BotSettings"] = None) -> "BotSettings":
+        """Settings from a config.json dict; anything it leaves out comes from `base`."""
+        base = base or cls()
+        if not isinstance(config, Mapping):
+            raise ValueError(f"config must be an object, got {type(config).__name__}")
+        bot = config.get("bot", {})
+        if not isinstance(bot, Mapping):
+            raise ValueError(f"bot must be an object, got {type(bot).__name__}")
+        known = {f.name for f in fields(cls)} - {"risk", "slippage_bps"}
+        unknown = set(bot) - known
+        if unknown:
+            raise ValueError(f"Unknown bot setting(s): {', '.join(sorted(unknown))}")
+        types = {"max_daily_trades": int}
+        values: Dict[str, Any] = {
+            name: None if value is None else types.get(name, float)(value) for name, value in bot.items()
+        }
+        if "slippage_bps" in config:
+            values["slippage_bps"] = int(config["slippage_bps"])
+        if "risk" in config:
+            values["risk"] = RiskLimits.from_config(config)
+        return replace(base, **values)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], base: Optional["BotSettings"] = None) -> "BotSettings":
+        with open(path) as f:
+            return cls.from_config(json.load(f), base)
+
+    def changes(self, other: "BotSettings") -> Dict[str, Tuple[Any, Any]]:
+        """Fields that differ, as name -> (this value, other value)."""
+        return {
+            f.name: (getattr(self, f.name), getattr(other, f.name))
+            for f in fields(self) if getattr(self, f.name) != getattr(other, f.name)
+        }
+
+
+class ConfigWatcher:
+    """Polls config.json and publishes a `ConfigChanged` event when it changes.
+
+    Register it on the engine (`engine.register(watcher)`), then `start()`.
+    The file's modification time and size are checked every
+    `poll_seconds`; a change is parsed with `parse(config_dict)` (default
+    `BotSettings.from_config`) and only published if it is valid JSON and
+    passes validation — otherwise `on_error(message)` is called and the
+    running settings stay as they are. Handlers (`on_config`) run on the
+    engine's dispatch thread between ticks, so every component switches to
+    the new settings at the same point.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        parse: Optional[Callable[[Mapping[str, Any]], Any]] = None,
+        poll_seconds: float = 2.0,
+        on_error: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.parse = parse or BotSettings.from_config
+        self.poll_seconds = poll_seconds
+        self.on_error = on_error
+        self.engine = None
+        self.reloads = 0
+        self._stamp = self._stat()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, engine) -> None:
+        self.engine = engine
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> Optional[Any]:
+        """Reload if the file changed; returns the new settings when they were published."""
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        try:
+            text = self.path.read_text()
+        except OSError as e:  # Replaced or removed between the stat and the read
+            self._stamp = None  # Retry on the next poll
+            if self.on_error:
+                self.on_error(f"Could not read {self.path.name}: {e}")
+            return None
+        try:
+            settings = self.parse(json.loads(text))
+        except Exception as e:  # Any bad edit must leave the watcher running
+            if self.on_error:
+                self.on_error(f"Ignoring invalid {self.path.name}: {e}")
+            return None
+        self.reloads += 1
+        if self.engine is not None:
+            self.engine.publish(ConfigChanged(settings, str(self.path)))
+        return settings
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.check()
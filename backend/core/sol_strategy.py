@@ -1,14 +1,19 @@
 """
 SOL Price Strategy: Buy Low, Sell High
-Monitors SOL/USDC price and triggers buy/sell signals based on price movements
+Monitors SOL/USDC (or any universe pair) price and triggers buy/sell signals
+based on price movements
 """
 
-import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional
-from collections import deque
 
+from .clock import Clock, RealClock
+from .indicators import IndicatorSet
 from .orca_client import OrcaClient
+from .price_buffer import PriceRingBuffer
+from .rolling_window import RollingWindow
+from .triggers import TriggerLevels, TriggerModel
+from .universe import TradingPair, Universe
 
 
 @dataclass
@@ -54,8 +59,13 @@ class SOLTradingStrategy:
         lookback_minutes: int = 30,  # Look at last 30min for context
         min_trade_usdc: float = 5.0,  # Minimum $5 trades
         max_trade_usdc: float = 100.0,  # Maximum $100 per trade
+        history_size: int = 86_400,  # Ticks kept in the price ring buffer
+        clock: Optional[Clock] = None,  # SimulatedClock for replay/backtests
+        pair: Optional[TradingPair] = None,  # Market to trade (default SOL/USDC)
     ):
         self.orca = orca_client
+        self.clock = clock or RealClock()
+        self.pair = pair or Universe.default().pair("SOL/USDC")
         self.buy_dip_threshold = buy_dip_threshold
         self.sell_rise_threshold = sell_rise_threshold
         self.stop_loss_pct = stop_loss_pct
@@ -63,72 +73,95 @@ class SOLTradingStrategy:
         self.min_trade_usdc = min_trade_usdc
         self.max_trade_usdc = max_trade_usdc
         
-        # Price history
-        self.price_history: deque[PricePoint] = deque(maxlen=1000)
+        # Price history (preallocated arrays, zero-copy window views)
+        self.price_history = PriceRingBuffer(capacity=history_size)
         
-        # Trading state
+        # Incremental high/low/mean per lookback window (keyed by minutes)
+        self._windows: Dict[int, RollingWindow] = {}
+        self._window(self.lookback_minutes)
+        self._window(15)
+        
+        # Streaming indicators (EMA, RSI, Bollinger, ATR, VWAP, volatility)
+        self.indicators = IndicatorSet()
+        
+        # Absolute buy / take-profit / stop prices, refreshed when high, low or entry move
+        self.triggers = TriggerModel(
+            buy_dip_threshold, sell_rise_threshold, stop_loss_pct, take_profit_from="recent_low"
+        )
+        
+        # Trading state (sol_position / usdc_balance hold the pair's base / quote token)
         self.last_buy_price: Optional[float] = None
-        self.sol_position: float = 0.0  # How much SOL we own
-        self.usdc_balance: float = 0.0  # Available USDC
+        self.sol_position: float = 0.0  # How much SOL (base token) we own
+        self.usdc_balance: float = 0.0  # Available USDC (quote token)
         
     def update_price(self) -> float:
-        """Get current SOL/USDC price from Orca and add to history"""
+        """Get current pair price (e.g. SOL/USDC) from Orca and add to history"""
         try:
-            # Get quote for 1 SOL → USDC to determine current rate
-            SOL = "So11111111111111111111111111111111111111112"
-            USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+            # Get quote for 1 base token → quote token to determine current rate
+            base, quote_token = self.pair.base, self.pair.quote
             
             quote = self.orca.get_quote(
-                input_mint=SOL,
-                output_mint=USDC,
-                amount=1_000_000_000,  # 1 SOL in lamports
+                input_mint=base.mint,
+                output_mint=quote_token.mint,
+                amount=base.to_raw(1.0),  # 1 SOL in lamports
                 slippage_bps=50
             )
             
             # Calculate rate: USDC per SOL
-            out_amount = int(quote["outAmount"])
-            usdc_per_sol = out_amount / 1_000_000  # USDC has 6 decimals
+            usdc_per_sol = quote_token.from_raw(quote["outAmount"])
             
             # Add to history
             point = PricePoint(
-                timestamp=time.time(),
+                timestamp=self.clock.time(),
                 sol_usdc_rate=usdc_per_sol,
                 volume_indicator=1.0  # Mock - real implementation would get volume
             )
-            self.price_history.append(point)
+            self.record_price(point)
             
             return usdc_per_sol
             
         except Exception as e:
-            raise RuntimeError(f"Failed to update SOL price: {e}")
+            raise RuntimeError(f"Failed to update {self.pair.name} price: {e}")
+    
+    def record_price(self, point: PricePoint) -> None:
+        """Append a price point to history and all rolling windows"""
+        self.price_history.append(point.timestamp, point.sol_usdc_rate, point.volume_indicator)
+        for window in self._windows.values():
+            window.push(point.timestamp, point.sol_usdc_rate)
+        self.indicators.update(point.sol_usdc_rate, point.volume_indicator)
+    
+    def trigger_levels(self) -> TriggerLevels:
+        """Prices this strategy is currently armed at (as of the last analyze_market)"""
+        return self.triggers.levels
+    
+    def get_indicators(self) -> Dict[str, Optional[float]]:
+        """Latest value of every streaming indicator (None while warming up)"""
+        return self.indicators.snapshot()
+    
+    def _window(self, minutes: int) -> RollingWindow:
+        """Rolling window for the given lookback, backfilled from history on first use"""
+        window = self._windows.get(minutes)
+        if window is None:
+            window = RollingWindow(minutes * 60)
+            history = self.price_history
+            for ts, price in zip(history.timestamps.tolist(), history.prices.tolist()):
+                window.push(ts, price)
+            self._windows[minutes] = window
+        return window
     
     def get_recent_high(self, minutes: int = None) -> Optional[float]:
         """Get highest price in the last N minutes"""
         minutes = minutes or self.lookback_minutes
-        cutoff = time.time() - (minutes * 60)
-        
-        recent_prices = [p.sol_usdc_rate for p in self.price_history 
-                        if p.timestamp >= cutoff]
-        return max(recent_prices) if recent_prices else None
+        return self._window(minutes).max(self.clock.time())
     
     def get_recent_low(self, minutes: int = None) -> Optional[float]:
         """Get lowest price in the last N minutes"""
         minutes = minutes or self.lookback_minutes
-        cutoff = time.time() - (minutes * 60)
-        
-        recent_prices = [p.sol_usdc_rate for p in self.price_history 
-                        if p.timestamp >= cutoff]
-        return min(recent_prices) if recent_prices else None
+        return self._window(minutes).min(self.clock.time())
     
     def get_moving_average(self, minutes: int = 15) -> Optional[float]:
         """Calculate moving average price"""
-        cutoff = time.time() - (minutes * 60)
-        recent_prices = [p.sol_usdc_rate for p in self.price_history 
-                        if p.timestamp >= cutoff]
-        
-        if not recent_prices:
-            return None
-        return sum(recent_prices) / len(recent_prices)
+        return self._window(minutes).mean(self.clock.time())
     
     def analyze_market(self) -> TradingSignal:
         """Analyze current market conditions and generate trading signal"""
@@ -142,53 +175,51 @@ class SOLTradingStrategy:
                 reason="Not enough price history"
             )
         
-        current_price = self.price_history[-1].sol_usdc_rate
+        current_price = self.price_history.latest_price
         recent_high = self.get_recent_high()
-        recent_low = self.get_recent_low()
-        moving_avg = self.get_moving_average()
+        holding = self.sol_position > 0 and self.last_buy_price
+        recent_low = self.get_recent_low() if holding else None
+        self.triggers.update(recent_high, recent_low, self.last_buy_price if holding else None)
         
         # BUY SIGNAL: Price dropped significantly from recent high
-        if recent_high and current_price < recent_high:
+        if self.triggers.should_buy(current_price) and current_price < recent_high:
             drop_pct = ((recent_high - current_price) / recent_high) * 100
             
-            if drop_pct >= self.buy_dip_threshold:
-                # Calculate position size (risk management)
-                trade_amount = min(
-                    self.max_trade_usdc,
-                    self.usdc_balance * 0.2  # Use max 20% of available USDC
+            # Calculate position size (risk management)
+            trade_amount = min(
+                self.max_trade_usdc,
+                self.usdc_balance * 0.2  # Use max 20% of available USDC
+            )
+            
+            if trade_amount >= self.min_trade_usdc:
+                return TradingSignal(
+                    action="BUY_SOL",
+                    confidence=min(drop_pct / 10.0, 1.0),  # Higher confidence for bigger drops
+                    current_price=current_price,
+                    target_price=current_price * 1.05,  # Target 5% profit
+                    reason=f"SOL dropped {drop_pct:.1f}% from recent high ${recent_high:.2f}",
+                    suggested_amount_usdc=trade_amount
                 )
-                
-                if trade_amount >= self.min_trade_usdc:
-                    return TradingSignal(
-                        action="BUY_SOL",
-                        confidence=min(drop_pct / 10.0, 1.0),  # Higher confidence for bigger drops
-                        current_price=current_price,
-                        target_price=current_price * 1.05,  # Target 5% profit
-                        reason=f"SOL dropped {drop_pct:.1f}% from recent high ${recent_high:.2f}",
-                        suggested_amount_usdc=trade_amount
-                    )
         
         # SELL SIGNAL: Price rose significantly OR hit stop loss
-        if self.sol_position > 0 and self.last_buy_price:
+        if holding:
             
             # Check for profit target
-            if recent_low and current_price > recent_low:
+            if self.triggers.should_take_profit(current_price) and current_price > recent_low:
                 rise_pct = ((current_price - recent_low) / recent_low) * 100
+                profit_pct = ((current_price - self.last_buy_price) / self.last_buy_price) * 100
                 
-                if rise_pct >= self.sell_rise_threshold:
-                    profit_pct = ((current_price - self.last_buy_price) / self.last_buy_price) * 100
-                    
-                    return TradingSignal(
-                        action="SELL_SOL",
-                        confidence=0.8,
-                        current_price=current_price,
-                        target_price=None,
-                        reason=f"SOL rose {rise_pct:.1f}% from recent low. Profit: {profit_pct:.1f}%"
-                    )
+                return TradingSignal(
+                    action="SELL_SOL",
+                    confidence=0.8,
+                    current_price=current_price,
+                    target_price=None,
+                    reason=f"SOL rose {rise_pct:.1f}% from recent low. Profit: {profit_pct:.1f}%"
+                )
             
             # Check for stop loss
-            loss_pct = ((self.last_buy_price - current_price) / self.last_buy_price) * 100
-            if loss_pct >= self.stop_loss_pct:
+            if self.triggers.should_stop(current_price):
+                loss_pct = ((self.last_buy_price - current_price) / self.last_buy_price) * 100
                 return TradingSignal(
                     action="SELL_SOL",
                     confidence=0.9,  # High confidence on stop loss
@@ -198,12 +229,16 @@ class SOLTradingStrategy:
                 )
         
         # DEFAULT: HOLD
+        moving_avg = self.get_moving_average()
         reason_parts = []
         if moving_avg:
             if current_price > moving_avg:
                 reason_parts.append(f"Above MA(${moving_avg:.2f})")
             else:
                 reason_parts.append(f"Below MA(${moving_avg:.2f})")
+        rsi = self.indicators.rsi.value
+        if rsi is not None:
+            reason_parts.append(f"RSI {rsi:.0f}")
         
         reason = "Market conditions neutral. " + ", ".join(reason_parts)
         
@@ -231,14 +266,11 @@ class SOLTradingStrategy:
             expected_sol = usdc_amount / signal.current_price
             
             # Get actual quote from Orca
-            USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
-            SOL = "So11111111111111111111111111111111111111112"
-            
-            usdc_lamports = int(usdc_amount * 1_000_000)  # USDC has 6 decimals
+            usdc_lamports = self.pair.quote.to_raw(usdc_amount)  # USDC has 6 decimals
             
             quote = self.orca.get_quote(
-                input_mint=USDC,
-                output_mint=SOL,
+                input_mint=self.pair.quote.mint,
+                output_mint=self.pair.base.mint,
                 amount=usdc_lamports,
                 slippage_bps=100  # 1% slippage for market orders
             )
@@ -265,14 +297,11 @@ class SOLTradingStrategy:
             expected_usdc = sol_amount * signal.current_price
             
             # Get actual quote from Orca
-            SOL = "So11111111111111111111111111111111111111112"
-            USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
-            
-            sol_lamports = int(sol_amount * 1_000_000_000)  # SOL has 9 decimals
+            sol_lamports = self.pair.base.to_raw(sol_amount)  # SOL has 9 decimals
             
             quote = self.orca.get_quote(
-                input_mint=SOL,
-                output_mint=USDC,
+                input_mint=self.pair.base.mint,
+                output_mint=self.pair.quote.mint,
                 amount=sol_lamports,
                 slippage_bps=100  # 1% slippage for market orders
             )
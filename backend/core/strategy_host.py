@@ -0,0 +1,295 @@
+"""
+Strategy host: many strategy variants in one process
+Variants share one price feed, one quote cache and one execution pipeline,
+so adding a variant costs CPU, not outbound requests
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .clock import Clock, RealClock
+from .engine import EventEngine
+from .events import FillEvent, OrderIntent, TickEvent
+from .sol_strategy import PricePoint, SOLTradingStrategy
+from .universe import Universe
+
+
+class QuoteCache:
+    """Caching front for a quote client (`get_quote` / `get_prices` / `get_current_sol_price`).
+
+    Identical requests within `ttl_seconds` are answered from memory, and
+    concurrent callers asking for the same key wait for one upstream call
+    instead of each making their own. It exposes the same methods as the
+    client, so strategies can use it as their `orca_client`.
+
+    Quote keys include the raw amount, which changes with the price, so
+    expired entries (and their locks) are swept once per TTL, and the cache
+    is trimmed to the newest `max_entries` when it grows past twice that.
+    """
+
+    def __init__(self, client, ttl_seconds: float = 5.0, clock: Optional[Clock] = None,
+                 max_entries: int = 1024) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock or RealClock()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple, Tuple[float, object]] = {}
+        self._locks: Dict[Tuple, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._swept_at = self.clock.time()
+
+    def _sweep(self, now: float) -> None:
+        """Drop expired entries and idle locks, then the oldest entries over the cap (guard held)."""
+        self._swept_at = now
+        expired = [key for key, (at, _) in self._entries.items() if now - at >= self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) > self.max_entries:
+            oldest = sorted(self._entries, key=lambda key: self._entries[key][0])
+            for key in oldest[:len(self._entries) - self.max_entries]:
+                del self._entries[key]
+        for key in [key for key, lock in self._locks.items() if key not in self._entries and not lock.locked()]:
+            del self._locks[key]
+
+    def _cached(self, key: Tuple, fetch: Callable[[], object]):
+        with self._guard:
+            now = self.clock.time()
+            if now - self._swept_at >= self.ttl_seconds or len(self._locks) >= 2 * self.max_entries:
+                self._sweep(now)
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            # Counters and entries are shared across keys, so they change under the guard
+            with self._guard:
+                entry = self._entries.get(key)
+                if entry is not None and self.clock.time() - entry[0] < self.ttl_seconds:
+                    self.hits += 1
+                    return entry[1]
+            value = fetch()
+            with self._guard:
+                self.misses += 1
+                self._entries[key] = (self.clock.time(), value)
+            return value
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_current_sol_price(self) -> float:
+        return self._cached(("price",), self.client.get_current_sol_price)
+
+    def get_prices(self) -> Dict[str, float]:
+        return self._cached(("prices",), self.client.get_prices)
+
+    def get_quote(self, input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50) -> Dict:
+        return self._cached(
+            ("quote", input_mint, output_mint, int(amount), slippage_bps),
+            lambda: self.client.get_quote(input_mint, output_mint, amount, slippage_bps),
+        )
+
+    def invalidate(self) -> None:
+        with self._guard:
+            self._entries.clear()
+            for key in [key for key, lock in self._locks.items() if not lock.locked()]:
+                del self._locks[key]
+
+
+@dataclass
+class VariantStats:
+    """Per-variant bookkeeping kept by the host"""
+    trades: int = 0
+    realized_pnl_usdc: float = 0.0
+    cost_basis_usdc: float = 0.0
+    pending: Optional[OrderIntent] = None
+
+
+class StrategyHost:
+    """Runs several `SOLTradingStrategy` instances on one `EventEngine`.
+
+    The host registers once with the engine: every tick is recorded into
+    each variant's own history and `analyze_market()` decides per variant.
+    BUY/SELL signals become `OrderIntent`s tagged with the variant id, the
+    shared execution pipeline fills them, and fills are applied back to the
+    owning variant's balances. A variant holds at most one position and one
+    in-flight order at a time.
+
+    Variants may trade different pairs of the `Universe`: a tick only
+    reaches the variants of its pair, and buys are sized within the pair's
+    `PairRisk` (per-order cap and open exposure across all its variants).
+    """
+
+    def __init__(
+        self,
+        engine: EventEngine,
+        quotes: QuoteCache,
+        executor: Optional[Callable[[OrderIntent], FillEvent]] = None,
+        execution_slippage_bps: int = 100,
+        universe: Optional[Universe] = None,
+        scheduler=None,
+    ) -> None:
+        self.engine = engine
+        self.scheduler = scheduler  # e.g. AdaptiveScheduler: told every variant's trigger prices
+        self.universe = universe or Universe.default()
+        self.quotes = quotes
+        self.executor = executor or self.paper_execute
+        self.execution_slippage_bps = execution_slippage_bps
+        self.strategies: Dict[str, SOLTradingStrategy] = {}
+        self.stats: Dict[str, VariantStats] = {}
+        self._by_pair: Dict[str, List[str]] = {}
+        engine.register(self)
+
+    @classmethod
+    def from_variants(
+        cls,
+        engine: EventEngine,
+        client,
+        variants: Mapping[str, Mapping],
+        initial_usdc: float = 1000.0,
+        quote_ttl_seconds: float = 5.0,
+        **kwargs,
+    ) -> "StrategyHost":
+        """Build a host with one `SOLTradingStrategy(**params)` per variant.
+
+        A variant's params may name its market with `"pair": "BASE/QUOTE"`
+        (default SOL/USDC).
+        """
+        quotes = QuoteCache(client, ttl_seconds=quote_ttl_seconds, clock=engine.clock)
+        host = cls(engine, quotes, **kwargs)
+        for strategy_id, params in variants.items():
+            params = dict(params)
+            pair = host.universe.pair(params.pop("pair", "SOL/USDC"))
+            strategy = SOLTradingStrategy(quotes, clock=engine.clock, pair=pair, **params)
+            strategy.update_balances(0.0, initial_usdc)
+            host.add(strategy_id, strategy)
+        return host
+
+    def add(self, strategy_id: str, strategy: SOLTradingStrategy) -> None:
+        if strategy_id in self.strategies:
+            raise ValueError(f"Duplicate strategy id: {strategy_id}")
+        self.strategies[strategy_id] = strategy
+        self.stats[strategy_id] = VariantStats()
+        self._by_pair.setdefault(strategy.pair.name, []).append(strategy_id)
+
+    def exposure(self, pair: str) -> float:
+        """Open plus in-flight buy notional on `pair` across its variants."""
+        total = 0.0
+        for strategy_id in self._by_pair.get(pair, ()):
+            stats = self.stats[strategy_id]
+            total += stats.cost_basis_usdc
+            if stats.pending is not None and stats.pending.side == "BUY":
+                total += stats.pending.metadata.get("usdc_amount", 0.0)
+        return total
+
+    # --- Engine handlers ---
+    def on_tick(self, tick: TickEvent) -> None:
+        point = PricePoint(timestamp=tick.timestamp, sol_usdc_rate=tick.price, volume_indicator=tick.volume or 1.0)
+        for strategy_id in self._by_pair.get(tick.pair, ()):
+            strategy = self.strategies[strategy_id]
+            strategy.record_price(point)
+            stats = self.stats[strategy_id]
+            if stats.pending is not None:
+                continue
+
+            signal = strategy.analyze_market()
+            if signal.action == "BUY_SOL" and strategy.sol_position <= 0:
+                usdc = self._size_buy(strategy, signal.suggested_amount_usdc)
+                if usdc is None:
+                    continue
+                intent = OrderIntent(strategy_id, tick.pair, "BUY", usdc / signal.current_price,
+                                     signal.current_price, tick.timestamp, signal.reason,
+                                     metadata={"usdc_amount": usdc})
+            elif signal.action == "SELL_SOL":
+                intent = OrderIntent(strategy_id, tick.pair, "SELL", strategy.sol_position,
+                                     signal.current_price, tick.timestamp, signal.reason)
+            else:
+                continue
+            stats.pending = intent
+            self.engine.submit(intent)
+
+        if self.scheduler is not None:
+            self.scheduler.set_triggers(self.trigger_prices(tick.pair), tick.pair)
+
+    def trigger_prices(self, pair: str) -> List[float]:
+        """Every price level some variant of `pair` is armed at."""
+        levels: List[float] = []
+        for strategy_id in self._by_pair.get(pair, ()):
+            levels.extend(self.strategies[strategy_id].trigger_levels().prices())
+        return levels
+
+    def _size_buy(self, strategy: SOLTradingStrategy, suggested: float) -> Optional[float]:
+        """Clip a buy to the pair's risk limits; None if nothing is left to trade."""
+        risk = strategy.pair.risk
+        if not risk.enabled:
+            return None
+        room = risk.max_position_usd - self.exposure(strategy.pair.name)
+        amount = min(suggested, risk.max_trade_usd, room)
+        return amount if amount >= strategy.min_trade_usdc else None
+
+    def on_fill(self, fill: FillEvent) -> None:
+        strategy_id = fill.intent.strategy_id
+        strategy = self.strategies.get(strategy_id)
+        if strategy is None:
+            return
+        stats = self.stats[strategy_id]
+        if stats.pending is not None and stats.pending.intent_id == fill.intent.intent_id:
+            stats.pending = None
+        if not fill.filled:
+            return
+
+        notional = fill.filled_amount * fill.fill_price
+        if fill.intent.side == "BUY":
+            strategy.update_balances(strategy.sol_position + fill.filled_amount, strategy.usdc_balance - notional)
+            strategy.last_buy_price = fill.fill_price
+            stats.cost_basis_usdc += notional
+        else:
+            strategy.update_balances(strategy.sol_position - fill.filled_amount, strategy.usdc_balance + notional)
+            strategy.last_buy_price = None
+            stats.realized_pnl_usdc += notional - stats.cost_basis_usdc
+            stats.cost_basis_usdc = 0.0
+        stats.trades += 1
+
+    # --- Execution (worker thread) ---
+    def execute(self, intent: OrderIntent) -> FillEvent:
+        """Entry point for the shared `ExecutionWorker`."""
+        return self.executor(intent)
+
+    def paper_execute(self, intent: OrderIntent) -> FillEvent:
+        """Fill at the (cached) quote without sending a transaction."""
+        now = self.engine.clock.time()
+        pair = self.universe.pair(intent.pair)
+        base, quote_token = pair.base, pair.quote
+        if intent.side == "BUY":
+            spend = intent.metadata.get("usdc_amount", intent.amount * intent.price)
+            quote = self.quotes.get_quote(quote_token.mint, base.mint, quote_token.to_raw(spend), self.execution_slippage_bps)
+            received = base.from_raw(quote["outAmount"])
+            if received <= 0:
+                return FillEvent(intent, "REJECTED", now, detail="Empty quote")
+            return FillEvent(intent, "FILLED", now, received, spend / received)
+
+        quote = self.quotes.get_quote(base.mint, quote_token.mint, base.to_raw(intent.amount), self.execution_slippage_bps)
+        proceeds = quote_token.from_raw(quote["outAmount"])
+        return FillEvent(intent, "FILLED", now, intent.amount, proceeds / intent.amount if intent.amount else 0.0)
+
+    # --- Reporting ---
+    def summary(self, marks: Optional[Mapping[str, float]] = None) -> Dict[str, Dict[str, float]]:
+        """Per-variant balances and P&L (open positions marked at `marks[pair]`)."""
+        report = {}
+        for strategy_id, strategy in self.strategies.items():
+            stats = self.stats[strategy_id]
+            unrealized = 0.0
+            mark_price = (marks or {}).get(strategy.pair.name)
+            if mark_price is not None and strategy.sol_position > 0:
+                unrealized = strategy.sol_position * mark_price - stats.cost_basis_usdc
+            report[strategy_id] = {
+                "pair": strategy.pair.name,
+                "trades": stats.trades,
+                "sol_position": strategy.sol_position,
+                "usdc_balance": strategy.usdc_balance,
+                "realized_pnl_usdc": stats.realized_pnl_usdc,
+                "unrealized_pnl_usdc": unrealized,
+            }
+        return report
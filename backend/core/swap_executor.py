@@ -0,0 +1,205 @@
+"""
+Automated swap execution
+quote -> pre-trade checks -> build -> sign -> send -> confirm, run by the
+execution worker so the trading loop keeps ticking while a swap is in flight
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+from .clock import Clock, RealClock
+from .events import FillEvent, OrderIntent
+from .metrics import MetricsRegistry
+from .tracing import Tracer, maybe_span
+from .universe import SOL_MINT, Token, TradingPair, Universe
+
+
+class SwapExecutor:
+    """Executes `OrderIntent`s as Jupiter swaps signed by a `WalletManager`.
+
+    Use it as the `ExecutionWorker` executor (`executor(intent) -> FillEvent`).
+    Every intent goes through, in order:
+
+    1. intent checks: pair known and enabled, amount positive, notional
+       within the pair's `max_trade_usd`;
+    2. balance checks: enough of the input token, and `min_sol_reserve`
+       SOL left over for fees. Sells (exits) only need `sell_fee_sol`, the
+       fee and temporary wrapped-SOL rent of one swap, and a SOL sell is
+       trimmed to the balance less that fee, so a stop-loss can always run;
+    3. a Jupiter quote, rejected if its price impact exceeds
+       `max_price_impact_pct` or its price is more than
+       `max_price_deviation_pct` worse than the price the strategy decided at;
+    4. build, sign and send the transaction, then wait for confirmation.
+
+    A failed check returns a REJECTED fill and nothing is sent. A sent
+    transaction that is not confirmed within `confirm_timeout_seconds` is
+    reported as UNCONFIRMED with its signature (and the quoted amount and
+    price), since it may still land; `resolve()` settles it later. Fill
+    amounts come from the executed quote.
+
+    With a `tracer`, the quote, build, sign, send and confirm stages are
+    timed as spans with the intent id as trace id.
+    """
+
+    def __init__(
+        self,
+        jupiter,
+        wallet,
+        universe: Optional[Universe] = None,
+        clock: Optional[Clock] = None,
+        slippage_bps: int = 50,
+        max_price_impact_pct: float = 1.0,
+        max_price_deviation_pct: float = 1.0,
+        min_sol_reserve: float = 0.02,
+        sell_fee_sol: float = 0.003,
+        prioritization_fee_lamports: Optional[int] = None,
+        confirm_timeout_seconds: float = 60.0,
+        confirm_poll_seconds: float = 1.0,
+        unconfirmed_expiry_seconds: float = 300.0,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        self.jupiter = jupiter
+        self.wallet = wallet
+        self.universe = universe or Universe.default()
+        self.clock = clock or RealClock()
+        self.slippage_bps = slippage_bps
+        self.max_price_impact_pct = max_price_impact_pct
+        self.max_price_deviation_pct = max_price_deviation_pct
+        self.min_sol_reserve = min_sol_reserve
+        self.sell_fee_sol = sell_fee_sol
+        self.prioritization_fee_lamports = prioritization_fee_lamports
+        self.confirm_timeout_seconds = confirm_timeout_seconds
+        self.confirm_poll_seconds = confirm_poll_seconds
+        self.unconfirmed_expiry_seconds = unconfirmed_expiry_seconds
+        self.metrics = metrics
+        self.tracer = tracer
+
+    def __call__(self, intent: OrderIntent) -> FillEvent:
+        return self.execute(intent)
+
+    def execute(self, intent: OrderIntent) -> FillEvent:
+        reason = self.check_intent(intent)
+        if reason:
+            return self._reject(intent, reason)
+
+        pair = self.universe.pair(intent.pair)
+        spend_token, spend = self._input(intent, pair)
+        if intent.side == "SELL" and spend_token.mint == SOL_MINT:
+            spend = min(spend, self.wallet.get_sol_balance() - self.sell_fee_sol)
+        reason = self.check_balances(spend_token, spend, intent.side)
+        if reason:
+            return self._reject(intent, reason)
+
+        receive_token = pair.base if intent.side == "BUY" else pair.quote
+        with maybe_span(self.tracer, "quote", intent.intent_id, venue="jupiter"):
+            quote = self._quote(spend_token, receive_token, spend)
+        received = receive_token.from_raw(quote.get("outAmount", 0))
+        if received <= 0:
+            return self._reject(intent, "Empty quote")
+        base_amount, fill_price = (received, spend / received) if intent.side == "BUY" else (spend, received / spend)
+        reason = self.check_quote(intent, quote, fill_price)
+        if reason:
+            return self._reject(intent, reason)
+
+        trace_id = intent.intent_id
+        with maybe_span(self.tracer, "build", trace_id):
+            serialized = self.jupiter.build_swap_transaction(
+                quote, self.wallet.pubkey(), prioritization_fee_lamports=self.prioritization_fee_lamports
+            )
+        with maybe_span(self.tracer, "sign", trace_id):
+            signed = self.wallet.sign_v0_txn(serialized)
+        with maybe_span(self.tracer, "send", trace_id):
+            signature = self.wallet.send_signed_txn(signed)
+        with maybe_span(self.tracer, "confirm", trace_id) as attrs:
+            confirmed = self.wallet.confirm_signature(
+                signature, self.confirm_timeout_seconds, self.confirm_poll_seconds
+            )
+            attrs["confirmed"] = confirmed
+        if not confirmed:
+            return FillEvent(
+                intent, "UNCONFIRMED", self.clock.time(), base_amount, fill_price, signature,
+                detail=f"Not confirmed within {self.confirm_timeout_seconds:g}s",
+            )
+        return FillEvent(intent, "FILLED", self.clock.time(), base_amount, fill_price, signature)
+
+    def resolve(self, fill: FillEvent) -> Optional[FillEvent]:
+        """Check an UNCONFIRMED fill's transaction once, without waiting.
+
+        Returns the final fill for the same intent — FILLED at the quoted
+        amount once confirmed, REJECTED if it landed with an error or is
+        still unseen `unconfirmed_expiry_seconds` after sending (its
+        blockhash has long expired by then) — or None while it is pending.
+        """
+        try:
+            confirmed = self.wallet.confirm_signature(fill.signature, 0, self.confirm_poll_seconds)
+        except RuntimeError as e:
+            return FillEvent(fill.intent, "REJECTED", self.clock.time(), signature=fill.signature, detail=str(e))
+        if confirmed:
+            return FillEvent(fill.intent, "FILLED", self.clock.time(), fill.filled_amount, fill.fill_price,
+                             fill.signature)
+        if self.clock.time() - fill.timestamp >= self.unconfirmed_expiry_seconds:
+            return FillEvent(fill.intent, "REJECTED", self.clock.time(), signature=fill.signature,
+                             detail=f"Not confirmed after {self.unconfirmed_expiry_seconds:g}s, treated as dropped")
+        return None
+
+    # --- Pre-trade checks (each returns a rejection reason or None) ---
+    def check_intent(self, intent: OrderIntent) -> Optional[str]:
+        if intent.side not in ("BUY", "SELL"):
+            return f"Unknown side {intent.side!r}"
+        try:
+            pair = self.universe.pair(intent.pair)
+        except KeyError:
+            return f"Unknown pair {intent.pair}"
+        if not pair.risk.enabled:
+            return f"{pair.name} is disabled"
+        if intent.amount <= 0 or intent.price <= 0:
+            return "Amount and price must be positive"
+        notional = intent.metadata.get("usdc_amount", intent.amount * intent.price)
+        if notional > pair.risk.max_trade_usd:
+            return f"Trade ${notional:.2f} exceeds max ${pair.risk.max_trade_usd:.2f} for {pair.name}"
+        return None
+
+    def check_balances(self, spend_token: Token, spend: float, side: str = "BUY") -> Optional[str]:
+        reserve = self.min_sol_reserve if side == "BUY" else self.sell_fee_sol
+        sol = self.wallet.get_sol_balance()
+        if spend_token.mint == SOL_MINT:
+            if spend <= 0 or sol - spend < reserve - 1e-12:
+                return f"SOL balance {sol:.6f} leaves less than {reserve:g} SOL for fees"
+            return None
+        if sol < reserve:
+            return f"SOL balance {sol:.6f} below fee reserve {reserve:g}"
+        balance = self.wallet.get_spl_balance(spend_token.mint)
+        if balance < spend:
+            return f"{spend_token.symbol} balance {balance:.6f} below {spend:.6f}"
+        return None
+
+    def check_quote(self, intent: OrderIntent, quote: Dict, fill_price: float) -> Optional[str]:
+        impact_pct = float(quote.get("priceImpactPct") or 0) * 100
+        if impact_pct > self.max_price_impact_pct:
+            return f"Price impact {impact_pct:.2f}% above {self.max_price_impact_pct:g}%"
+        worse_pct = (fill_price / intent.price - 1) * 100
+        if intent.side == "SELL":
+            worse_pct = -worse_pct
+        if worse_pct > self.max_price_deviation_pct:
+            return f"Quote ${fill_price:.4f} is {worse_pct:.2f}% worse than ${intent.price:.4f}"
+        return None
+
+    # --- Helpers ---
+    @staticmethod
+    def _input(intent: OrderIntent, pair: TradingPair) -> Tuple[Token, float]:
+        """Token and amount the swap spends."""
+        if intent.side == "BUY":
+            return pair.quote, intent.metadata.get("usdc_amount", intent.amount * intent.price)
+        return pair.base, intent.amount
+
+    def _quote(self, spend_token: Token, receive_token: Token, spend: float) -> Dict:
+        args = (spend_token.mint, receive_token.mint, spend_token.to_raw(spend), self.slippage_bps)
+        if self.metrics is None:
+            return self.jupiter.get_quote(*args)
+        with self.metrics.histogram("quote_seconds", "Quote latency").time(venue="jupiter"):
+            return self.jupiter.get_quote(*args)
+
+    def _reject(self, intent: OrderIntent, reason: str) -> FillEvent:
+        return FillEvent(intent, "REJECTED", self.clock.time(), detail=reason)
@@ -0,0 +1,153 @@
+"""
+Tick-to-trade latency tracing
+Spans around each stage of the critical path (feed fetch, quote, signal,
+build, sign, send, confirm) kept in a ring buffer, optionally exported as
+JSON lines
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .clock import Clock, RealClock
+
+STAGES = ("feed_fetch", "quote", "signal", "build", "sign", "send", "confirm")
+
+
+@dataclass
+class Span:
+    """One timed stage. `trace_id` ties the stages of one order together."""
+    stage: str
+    start: float  # Clock time the stage started
+    duration: float  # Seconds (perf_counter)
+    trace_id: Optional[str] = None
+    error: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects spans in a fixed-size ring buffer.
+
+    A span costs two `perf_counter()` calls and a deque append; the oldest
+    spans fall off once `capacity` is reached. With `export_path`, each span
+    is also appended to that file as one JSON line (buffered, flushed on
+    `flush()` / `close()`), for offline analysis with
+    `scripts/trace_summary.py`.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        export_path: Optional[Union[str, Path]] = None,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.clock = clock or RealClock()
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._export = None
+        if export_path:
+            path = Path(export_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._export = open(path, "a", buffering=1 << 16)
+
+    @contextmanager
+    def span(self, stage: str, trace_id: Optional[Any] = None, **attrs) -> Iterator[Dict[str, Any]]:
+        """Time a `with` block; yields `attrs` so the block can add to them."""
+        start = self.clock.time()
+        started = time.perf_counter()
+        error = None
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(
+                Span(stage, start, time.perf_counter() - started,
+                     None if trace_id is None else str(trace_id), error, attrs)
+            )
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            if self._export is not None:
+                self._export.write(json.dumps(asdict(span), default=str) + "\n")
+
+    def spans(self, stage: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        return spans if stage is None else [s for s in spans if s.stage == stage]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return summarize(self.spans())
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._export is not None:
+                self._export.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._export is not None:
+                self._export.close()
+                self._export = None
+
+
+def maybe_span(tracer: Optional[Tracer], stage: str, trace_id: Optional[Any] = None, **attrs) -> ContextManager:
+    """`tracer.span(...)`, or a no-op when tracing is off."""
+    if tracer is None:
+        return nullcontext(attrs)
+    return tracer.span(stage, trace_id, **attrs)
+
+
+def summarize(spans: Iterable[Span]) -> Dict[str, Dict[str, float]]:
+    """Per-stage count, p50/p95/p99/max (seconds) and error count, pipeline order first."""
+    durations: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for span in spans:
+        durations.setdefault(span.stage, []).append(span.duration)
+        if span.error:
+            errors[span.stage] = errors.get(span.stage, 0) + 1
+    order = [s for s in STAGES if s in durations] + sorted(set(durations) - set(STAGES))
+    report = {}
+    for stage in order:
+        values = np.asarray(durations[stage])
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        report[stage] = {
+            "count": len(values),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(values.max()),
+            "errors": errors.get(stage, 0),
+        }
+    return report
+
+
+def load_spans(path: Union[str, Path]) -> List[Span]:
+    """Read spans exported by `Tracer(export_path=...)`."""
+    spans = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                spans.append(Span(**json.loads(line)))
+    return spans
+
+
+def format_summary(report: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"   {'Stage':<12} {'Count':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10} {'Errors':>7}"]
+    for stage, row in report.items():
+        lines.append(
+            f"   {stage:<12} {row['count']:>8,} {row['p50'] * 1000:>10.3f} {row['p95'] * 1000:>10.3f} "
+            f"{row['p99'] * 1000:>10.3f} {row['max'] * 1000:>10.3f} {row['errors']:>7}"
+        )
+    return "\n".join(lines)
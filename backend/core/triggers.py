@@ -0,0 +1,91 @@
+"""
+Trigger-level model for dip / rise / stop-loss strategies
+Turns percentage rules into absolute prices once per reference change, so a
+tick is checked with a few float comparisons
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class TriggerLevels:
+    """Absolute prices at which a strategy acts (None = not armed)"""
+    buy: Optional[float] = None  # Buy at or below
+    take_profit: Optional[float] = None  # Sell at or above
+    stop: Optional[float] = None  # Sell at or below
+
+    def prices(self) -> List[float]:
+        return [p for p in (self.buy, self.take_profit, self.stop) if p is not None]
+
+
+class TriggerModel:
+    """Keeps buy / take-profit / stop prices in sync with their references.
+
+    - buy         = recent_high * (1 - buy_dip_pct / 100)
+    - take_profit = (recent_low or entry) * (1 + sell_rise_pct / 100)
+    - stop        = entry * (1 - stop_loss_pct / 100)
+
+    `update(recent_high, recent_low, entry)` recomputes levels only when one
+    of the references it uses actually changed; most ticks leave the rolling
+    high/low alone and cost a tuple comparison. The levels are also what
+    a feed scheduler needs to know which prices matter.
+    """
+
+    def __init__(
+        self,
+        buy_dip_pct: float,
+        sell_rise_pct: float,
+        stop_loss_pct: float,
+        take_profit_from: str = "entry",  # "entry" or "recent_low"
+    ) -> None:
+        if take_profit_from not in ("entry", "recent_low"):
+            raise ValueError("take_profit_from must be 'entry' or 'recent_low'")
+        self.buy_dip_pct = buy_dip_pct
+        self.sell_rise_pct = sell_rise_pct
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_from = take_profit_from
+        self.levels = TriggerLevels()
+        self.recomputes = 0
+        self._refs = (None, None, None)
+
+    def update(
+        self,
+        recent_high: Optional[float],
+        recent_low: Optional[float],
+        entry: Optional[float],
+    ) -> TriggerLevels:
+        """Refresh levels if a reference they depend on moved.
+
+        Pass None for references that should disarm a level: `entry=None`
+        when flat (no take-profit / stop), `recent_high=None` when no more
+        buys are allowed.
+        """
+        if entry is None or self.take_profit_from == "entry":
+            recent_low = None  # Unused, so its moves must not force a recompute
+        refs = (recent_high, recent_low, entry)
+        if refs != self._refs:
+            self._refs = refs
+            self.recomputes += 1
+            high, low, entry = refs
+            base = low if self.take_profit_from == "recent_low" else entry
+            self.levels = TriggerLevels(
+                buy=high * (1 - self.buy_dip_pct / 100) if high else None,
+                take_profit=base * (1 + self.sell_rise_pct / 100) if base else None,
+                stop=entry * (1 - self.stop_loss_pct / 100) if entry else None,
+            )
+        return self.levels
+
+    def should_buy(self, price: float) -> bool:
+        buy = self.levels.buy
+        return buy is not None and price <= buy
+
+    def should_take_profit(self, price: float) -> bool:
+        take_profit = self.levels.take_profit
+        return take_profit is not None and price >= take_profit
+
+    def should_stop(self, price: float) -> bool:
+        stop = self.levels.stop
+        return stop is not None and price <= stop
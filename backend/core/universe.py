@@ -0,0 +1,151 @@
+"""
+Trading universe: tokens, mint pairs and per-pair risk limits
+Loaded from config.json so new pairs need no code changes
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+# Decimals / price-source symbols for tokens that need no extra config
+KNOWN_TOKENS: Dict[str, Dict[str, Any]] = {
+    "SOL": {"mint": SOL_MINT, "decimals": 9, "coingecko_id": "solana"},
+    "USDC": {"mint": USDC_MINT, "decimals": 6, "coingecko_id": "usd-coin", "usd_peg": True},
+    "USDT": {"mint": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB", "decimals": 6,
+             "coingecko_id": "tether", "usd_peg": True},
+}
+
+
+@dataclass(frozen=True)
+class Token:
+    """An SPL token the bot can price and trade"""
+    symbol: str
+    mint: str
+    decimals: int
+    coingecko_id: Optional[str] = None
+    usd_peg: bool = False  # Priced at $1 without a feed lookup
+
+    def to_raw(self, amount: float) -> int:
+        """UI amount -> smallest units (lamports for SOL)"""
+        return int(amount * 10 ** self.decimals)
+
+    def from_raw(self, raw: Union[int, str]) -> float:
+        return int(raw) / 10 ** self.decimals
+
+
+@dataclass(frozen=True)
+class PairRisk:
+    """Risk limits for one pair (USD notionals)"""
+    max_trade_usd: float = 100.0  # Cap per order
+    max_position_usd: float = 500.0  # Cap on open exposure across strategies
+    enabled: bool = True
+
+
+@dataclass(frozen=True)
+class TradingPair:
+    """BASE/QUOTE market, e.g. SOL/USDC; prices are QUOTE per 1 BASE"""
+    base: Token
+    quote: Token
+    risk: PairRisk = field(default_factory=PairRisk)
+
+    @property
+    def name(self) -> str:
+        return f"{self.base.symbol}/{self.quote.symbol}"
+
+
+class Universe:
+    """Tokens and pairs the bot trades, keyed by symbol and pair name"""
+
+    def __init__(self, tokens: Mapping[str, Token], pairs: List[TradingPair]) -> None:
+        self.tokens: Dict[str, Token] = dict(tokens)
+        self.pairs: Dict[str, TradingPair] = {p.name: p for p in pairs}
+        self._by_mint: Dict[str, Token] = {t.mint: t for t in self.tokens.values()}
+
+    def __iter__(self) -> Iterator[TradingPair]:
+        return iter(self.pairs.values())
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def pair(self, name: str) -> TradingPair:
+        try:
+            return self.pairs[name]
+        except KeyError:
+            raise KeyError(f"Pair {name} is not in the trading universe") from None
+
+    def token(self, symbol: str) -> Token:
+        return self.tokens[symbol]
+
+    def token_by_mint(self, mint: str) -> Optional[Token]:
+        return self._by_mint.get(mint)
+
+    @property
+    def pair_tokens(self) -> List[Token]:
+        """Every token used by at least one pair, once"""
+        seen = {}
+        for pair in self:
+            seen.setdefault(pair.base.symbol, pair.base)
+            seen.setdefault(pair.quote.symbol, pair.quote)
+        return list(seen.values())
+
+    @classmethod
+    def default(cls) -> "Universe":
+        """The original SOL/USDC-only setup"""
+        return cls.from_config({})
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "Universe":
+        """Build from a config.json dict.
+
+        `tokens` maps a symbol to a mint string or to
+        `{"mint", "decimals", "coingecko_id", "usd_peg"}`; known symbols fill
+        in missing fields. `pairs` is a list of `"BASE/QUOTE"` strings or
+        `{"pair": "BASE/QUOTE", "risk": {...}}` objects; per-pair risk
+        overrides the top-level `risk` block. Without `pairs`, SOL/USDC.
+        """
+        tokens: Dict[str, Token] = {}
+        raw_tokens = {"SOL": SOL_MINT, "USDC": USDC_MINT, **config.get("tokens", {})}
+        for symbol, spec in raw_tokens.items():
+            spec = {"mint": spec} if isinstance(spec, str) else dict(spec)
+            known = KNOWN_TOKENS.get(symbol, {})
+            merged = {**known, **spec}
+            if "decimals" not in merged:
+                raise ValueError(f"Token {symbol} needs 'decimals' in config")
+            tokens[symbol] = Token(
+                symbol=symbol,
+                mint=merged["mint"],
+                decimals=int(merged["decimals"]),
+                coingecko_id=merged.get("coingecko_id"),
+                usd_peg=bool(merged.get("usd_peg", False)),
+            )
+
+        base_risk = _risk_from_config(PairRisk(), config.get("risk", {}))
+        pairs = []
+        for entry in config.get("pairs", ["SOL/USDC"]):
+            entry = {"pair": entry} if isinstance(entry, str) else dict(entry)
+            base_symbol, _, quote_symbol = entry["pair"].partition("/")
+            for symbol in (base_symbol, quote_symbol):
+                if symbol not in tokens:
+                    raise ValueError(f"Pair {entry['pair']} uses unknown token {symbol}")
+            pairs.append(TradingPair(
+                base=tokens[base_symbol],
+                quote=tokens[quote_symbol],
+                risk=_risk_from_config(base_risk, entry.get("risk", {})),
+            ))
+        return cls(tokens, pairs)
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = "config.json") -> "Universe":
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+
+def _risk_from_config(base: PairRisk, risk: Mapping[str, Any]) -> PairRisk:
+    known = {k: risk[k] for k in ("max_trade_usd", "max_position_usd", "enabled") if k in risk}
+    return replace(base, **known)
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import base64
 import json
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 from solders.keypair import Keypair
+from solders.signature import Signature
 from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 from solders.transaction import VersionedTransaction
@@ -83,10 +85,10 @@ class WalletManager:
         return total
 
     # --- Signing & submission ---
-    def sign_and_send_v0_txn(self, serialized_txn_b64: str, skip_preflight: bool = False, max_retries: int | None = None) -> str:
-        """Deserialize a base64 versioned transaction, sign with wallet, and submit.
+    def sign_v0_txn(self, serialized_txn_b64: str) -> bytes:
+        """Deserialize a base64 versioned transaction and sign it with the wallet.
 
-        Returns the transaction signature (base58 string).
+        Returns the signed transaction bytes, ready for `send_signed_txn`.
         """
         if not self._keypair:
             raise RuntimeError("Keypair not loaded")
@@ -94,13 +96,48 @@ class WalletManager:
             raw = base64.b64decode(serialized_txn_b64)
             vtx_in = VersionedTransaction.from_bytes(raw)
             # Recreate a signed transaction using the original message and our signer
-            vtx_signed = VersionedTransaction(vtx_in.message, [self._keypair])
+            return bytes(VersionedTransaction(vtx_in.message, [self._keypair]))
+        except Exception as e:  # noqa: BLE001
+            raise RuntimeError(f"sign transaction failed: {e}") from e
+
+    def send_signed_txn(self, signed_txn: bytes, skip_preflight: bool = False, max_retries: int | None = None) -> str:
+        """Submit a signed transaction. Returns the signature (base58 string)."""
+        try:
             opts = TxOpts(skip_preflight=skip_preflight, max_retries=max_retries)
-            sig = self._client.send_raw_transaction(bytes(vtx_signed), opts=opts)
-            return sig.value
+            sig = self._client.send_raw_transaction(signed_txn, opts=opts)
+            return str(sig.value)
         except Exception as e:  # noqa: BLE001
             raise RuntimeError(f"send transaction failed: {e}") from e
 
+    def sign_and_send_v0_txn(self, serialized_txn_b64: str, skip_preflight: bool = False, max_retries: int | None = None) -> str:
+        """Deserialize a base64 versioned transaction, sign with wallet, and submit.
+
+        Returns the transaction signature (base58 string).
+        """
+        return self.send_signed_txn(self.sign_v0_txn(serialized_txn_b64), skip_preflight, max_retries)
+
+    def confirm_signature(self, signature: str, timeout_seconds: float = 60.0, poll_seconds: float = 1.0) -> bool:
+        """Wait until a submitted transaction reaches the wallet's commitment level.
+
+        Returns True once confirmed, False if still unconfirmed after
+        `timeout_seconds`. Raises RuntimeError if it landed with an error.
+        """
+        levels = ["processed", "confirmed", "finalized"]
+        wanted = levels.index(self.commitment) if self.commitment in levels else 1
+        sig = Signature.from_string(str(signature))
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            status = self._client.get_signature_statuses([sig]).value[0]
+            if status is not None:
+                if status.err is not None:
+                    raise RuntimeError(f"transaction failed: {status.err}")
+                level = str(status.confirmation_status or "").rsplit(".", 1)[-1].lower()
+                if level in levels and levels.index(level) >= wanted:
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_seconds)
+
     def close(self) -> None:
         try:
             self._client.close()
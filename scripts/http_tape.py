@@ -0,0 +1,55 @@
+"""
+📼 HTTP TAPE - what a recorded session sent and received, per service
+Reads tapes written with HTTP_RECORD (run_live_bot.py); replay one with HTTP_REPLAY
+
+Usage:
+    python scripts/http_tape.py data/session.tape.gz
+    python scripts/http_tape.py data/session.tape.gz --list 20
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.http_tape import read_tape, summarize  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a recorded HTTP tape")
+    parser.add_argument("path", help="Tape file (.tape.gz)")
+    parser.add_argument("--service", help="Only this service (binance, coingecko, coinbase, orca, jupiter, rpc, discord)")
+    parser.add_argument("--list", type=int, default=0, help="Show the first N exchanges")
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"No tape at {args.path}")
+        return
+    header, exchanges = read_tape(args.path)
+    if args.service:
+        exchanges = [e for e in exchanges if e.service == args.service]
+    started = datetime.fromtimestamp(header.get("started_at", 0)).strftime("%Y-%m-%d %H:%M:%S")
+    duration = exchanges[-1].offset + exchanges[-1].elapsed if exchanges else 0.0
+    print(f"📼 {args.path} ({Path(args.path).stat().st_size / 1024:,.1f} KiB)")
+    print(f"   Recorded {started}, {len(exchanges):,} exchanges over {duration / 60:.1f} min")
+
+    print(f"\n   {'Service':<16} {'Requests':>9} {'Errors':>7} {'Mean ms':>9} {'Max ms':>9} {'KiB':>9}")
+    for service, row in sorted(summarize(exchanges).items(), key=lambda item: -item[1]["requests"]):
+        print(f"   {service:<16} {row['requests']:>9,} {row['errors']:>7,} {row['latency_mean'] * 1000:>9.1f} "
+              f"{row['latency_max'] * 1000:>9.1f} {row['bytes'] / 1024:>9.1f}")
+
+    if args.list:
+        print()
+    for exchange in exchanges[:args.list]:
+        outcome = exchange.error or exchange.status
+        print(f"   {exchange.offset:>9.3f}s {exchange.method:<5} {exchange.url} -> {outcome} "
+              f"({exchange.elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+📒 LEDGER REPORT - realized P&L per day and strategy, open lots, recent fills
+Reads the SQLite ledger written with LEDGER_PATH (run_live_bot.py) or --ledger (replay_session.py)
+
+Usage:
+    python scripts/ledger_report.py data/trades.db
+    python scripts/ledger_report.py data/trades.db --since 2024-05-01 --fills 20
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.ledger import TradeLedger  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily P&L and open lots from a trade ledger")
+    parser.add_argument("path", help="SQLite ledger file")
+    parser.add_argument("--since", help="First day (YYYY-MM-DD)")
+    parser.add_argument("--pair", help="Only fills (and daily P&L) of this pair")
+    parser.add_argument("--strategy", help="Only fills of this strategy")
+    parser.add_argument("--fills", type=int, default=10, help="Show the last N fills")
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"No ledger at {args.path}")
+        return
+    ledger = TradeLedger(args.path)
+    try:
+        print(f"📒 {args.path}")
+        print(f"\n   {'Day':<12} {'Strategy':<16} {'Fills':>6} {'Volume $':>12} {'Realized $':>12}")
+        for row in ledger.daily_pnl(args.since, args.pair, args.strategy):
+            print(f"   {row['day']:<12} {row['strategy_id']:<16} {row['fills']:>6} "
+                  f"{row['volume']:>12,.2f} {row['realized_pnl']:>+12.2f}")
+
+        lots = ledger.open_lots(args.pair, args.strategy)
+        print(f"\n   Open lots: {len(lots)}")
+        for lot in lots:
+            print(f"   #{lot.lot_id} {lot.strategy_id} {lot.remaining:.6f} {lot.pair} @ ${lot.price:.2f}")
+
+        fills = ledger.fills(pair=args.pair, strategy_id=args.strategy, limit=args.fills, latest=True) \
+            if args.fills else []
+        if fills:
+            print(f"\n   Last {len(fills)} fills:")
+        for fill in fills:
+            print(f"   {fill['day']} {fill['side']:<4} {fill['amount']:.6f} {fill['pair']} @ ${fill['price']:.2f} "
+                  f"P&L ${fill['realized_pnl']:+.2f} ({fill['strategy_id']})")
+    finally:
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+🔧 STRATEGY OPTIMIZER - tune dip / rise / stop-loss thresholds on recorded ticks
+Runs grid, random or Bayesian search across all CPU cores, optionally walk-forward
+
+Usage:
+    python scripts/optimize_strategy.py data/sol_ticks.npz --method grid
+    python scripts/optimize_strategy.py --synthetic-days 30 --method bayesian --iterations 80
+    python scripts/optimize_strategy.py data/sol_ticks.npz --walk-forward --train-days 14 --test-days 7
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.backtest import BacktestConfig, load_ticks, synthetic_ticks  # noqa: E402
+from backend.core.optimizer import ParameterOptimizer  # noqa: E402
+
+GRID = {
+    "buy_dip_threshold": [1.0, 1.5, 2.0, 2.5, 3.0, 4.0],
+    "sell_rise_threshold": [1.0, 2.0, 3.0, 5.0],
+    "stop_loss_pct": [1.0, 1.5, 2.0, 3.0, 5.0],
+    "lookback_minutes": [15, 30, 60],
+}
+
+BOUNDS = {
+    "buy_dip_threshold": (0.5, 5.0),
+    "sell_rise_threshold": (0.5, 8.0),
+    "stop_loss_pct": (0.5, 6.0),
+    "lookback_minutes": (10, 120, 10),  # step keeps distinct lookbacks few
+}
+
+
+def fmt_params(params):
+    return ", ".join(f"{k}={v:g}" if isinstance(v, float) else f"{k}={v}" for k, v in params.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize SOL strategy parameters")
+    parser.add_argument("ticks", nargs="?", help="Tick file (.npz or .csv)")
+    parser.add_argument("--synthetic-days", type=float, default=None)
+    parser.add_argument("--method", choices=["grid", "random", "bayesian"], default="grid")
+    parser.add_argument("--iterations", type=int, default=60, help="Samples for random/bayesian")
+    parser.add_argument("--objective", default="total_return_pct",
+                        help="Summary key to maximize, or return_over_drawdown")
+    parser.add_argument("--take-profit-from", choices=["recent_low", "entry"], default="recent_low",
+                        help="'entry' tunes SimpleTradingBot-style exits")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--walk-forward", action="store_true")
+    parser.add_argument("--train-days", type=float, default=14.0)
+    parser.add_argument("--test-days", type=float, default=7.0)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.ticks:
+        ticks = load_ticks(args.ticks)
+        source = args.ticks
+    elif args.synthetic_days:
+        ticks = synthetic_ticks(args.synthetic_days)
+        source = f"synthetic ({args.synthetic_days:g} days of 1s ticks)"
+    else:
+        parser.error("Provide a tick file or --synthetic-days")
+
+    if args.method == "grid":
+        search_kwargs = {"space": GRID}
+    elif args.method == "random":
+        search_kwargs = {"bounds": BOUNDS, "n_samples": args.iterations, "seed": 1}
+    else:
+        search_kwargs = {"bounds": BOUNDS, "n_iter": args.iterations, "seed": 1}
+
+    base = BacktestConfig(take_profit_from=args.take_profit_from)
+
+    print("🔧 STRATEGY OPTIMIZER")
+    print("=" * 60)
+    print(f"   Data: {source} ({len(ticks.prices):,} ticks)")
+    print(f"   Method: {args.method} | Objective: {args.objective}")
+
+    started = time.perf_counter()
+    with ParameterOptimizer(ticks.timestamps, ticks.prices, base, args.objective, args.workers) as opt:
+        print(f"   Workers: {opt.max_workers}")
+        if args.walk_forward:
+            wf = opt.walk_forward(args.train_days * 86_400, args.test_days * 86_400,
+                                  method=args.method, **search_kwargs)
+            print(f"\n📊 Walk-forward: {len(wf.folds)} folds")
+            for i, fold in enumerate(wf.folds, 1):
+                print(f"   #{i}: train {fold.train_score:+.2f} → test {fold.test_score:+.2f} | "
+                      f"{fmt_params(fold.best_params)}")
+            print(f"\n   Mean train score: {wf.mean_train_score:+.2f}")
+            print(f"   Mean test score:  {wf.mean_test_score:+.2f}")
+        else:
+            results = opt.grid_search(**search_kwargs) if args.method == "grid" else (
+                opt.random_search(**search_kwargs) if args.method == "random"
+                else opt.bayesian_search(**search_kwargs)
+            )
+            print(f"\n🏆 Top {args.top} of {len(results)}:")
+            for r in results[:args.top]:
+                print(f"   {r.score:+8.2f} | {r.summary['trades']:4d} trades | "
+                      f"DD {r.summary['max_drawdown_pct']:5.2f}% | {fmt_params(r.params)}")
+
+    print(f"\n⏱️ Finished in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
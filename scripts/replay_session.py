@@ -0,0 +1,115 @@
+"""
+⏩ REPLAY SESSION - run the live bot over recorded ticks in simulated time
+Same SimpleTradingBot logic as run_live_bot.py, driven by a SimulatedClock:
+no wall-clock waits, no network, identical results on every run
+
+Usage:
+    python scripts/replay_session.py data/sol_ticks.npz --interval 20
+    python scripts/replay_session.py --synthetic-days 1
+    python scripts/replay_session.py --synthetic-days 1 --adaptive --budget 180
+    python scripts/replay_session.py --synthetic-days 2 --max-positions 2 --trailing-stop 3
+    python scripts/replay_session.py --synthetic-days 2 --paper --failure-rate 0.05 --seed 1
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from run_live_bot import SimpleTradingBot  # noqa: E402 (also puts backend/ on the path for `core`)
+from core.adaptive_interval import AdaptiveScheduler  # noqa: E402
+from core.backtest import load_ticks, synthetic_ticks  # noqa: E402
+from core.clock import SimulatedClock  # noqa: E402
+from core.event_log import configure as configure_logging  # noqa: E402
+from core.ledger import TradeLedger  # noqa: E402
+from core.replay_feed import ReplayPriceFeed  # noqa: E402
+from core.paper_exchange import PaperExchange  # noqa: E402
+from core.risk import RiskEngine, RiskLimits  # noqa: E402
+from core.swap_executor import SwapExecutor  # noqa: E402
+from core.tracing import Tracer, format_summary  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded ticks through SimpleTradingBot")
+    parser.add_argument("ticks", nargs="?", help="Tick file (.npz or .csv)")
+    parser.add_argument("--synthetic-days", type=float, default=None)
+    parser.add_argument("--interval", type=float, default=20.0, help="Bot check interval (simulated seconds)")
+    parser.add_argument("--adaptive", action="store_true", help="Adaptive interval instead of a fixed one")
+    parser.add_argument("--min-interval", type=float, default=5.0, help="Adaptive: shortest interval")
+    parser.add_argument("--max-interval", type=float, default=60.0, help="Adaptive: longest interval")
+    parser.add_argument("--budget", type=float, default=None, help="Adaptive: max polls per hour (default 3600/interval)")
+    parser.add_argument("--max-positions", type=int, default=1, help="Open positions allowed at once")
+    parser.add_argument("--trailing-stop", type=float, default=None, help="Trailing stop %% on every position")
+    parser.add_argument("--trace-file", help="Append latency spans to this JSONL file")
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's per-check output")
+    parser.add_argument("--log-file", help="Write the bot's events as JSON lines")
+    parser.add_argument("--ledger", help="Record fills in this SQLite trade ledger")
+    parser.add_argument("--risk", action="store_true", help="Enforce the config.json risk limits")
+    parser.add_argument("--paper", action="store_true",
+                        help="Fill through the paper exchange (fees, slippage, latency) instead of at the tick price")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Paper: share of swaps that fail to send")
+    parser.add_argument("--seed", type=int, default=None, help="Paper: random seed for latency drift and failures")
+    args = parser.parse_args()
+
+    if args.ticks:
+        ticks = load_ticks(args.ticks)
+    elif args.synthetic_days:
+        ticks = synthetic_ticks(args.synthetic_days)
+    else:
+        parser.error("Provide a tick file or --synthetic-days")
+
+    clock = SimulatedClock(start=float(ticks.timestamps[0]))
+    log = configure_logging(console=args.verbose, json_path=args.log_file, clock=clock, block_when_full=True)
+    feed = ReplayPriceFeed(ticks, clock)
+    tracer = Tracer(export_path=args.trace_file, clock=clock)
+    risk = RiskEngine(RiskLimits.load(ROOT / "config.json"), clock=clock) if args.risk else None
+    venue = swap_executor = None
+    if args.paper:
+        venue = PaperExchange(clock=clock, failure_rate=args.failure_rate, seed=args.seed)
+        swap_executor = SwapExecutor(venue, venue.wallet, clock=clock)
+    bot = SimpleTradingBot(venue.wallet if venue else None, feed, clock=clock, confirm_trades=False,
+                           max_positions=args.max_positions, swap_executor=swap_executor, tracer=tracer,
+                           ledger=TradeLedger(args.ledger, clock=clock) if args.ledger else None,
+                           risk=risk, venue=venue)
+    bot.trailing_stop_pct = args.trailing_stop
+    scheduler = None
+    if args.adaptive:
+        scheduler = AdaptiveScheduler(
+            min_interval=args.min_interval,
+            max_interval=args.max_interval,
+            max_requests_per_hour=args.budget or 3600 / args.interval,
+        )
+
+    print("⏩ REPLAY SESSION")
+    print("=" * 60)
+    print(f"   Ticks: {len(ticks.prices):,} over {(feed.end_time - feed.start_time) / 3600:.1f} h")
+
+    started = time.perf_counter()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        bot.run(check_interval_seconds=args.interval, scheduler=scheduler)
+        log.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n🏁 Replayed {feed.update_count:,} checks in {elapsed:.2f}s")
+    print(f"   Trades: {bot.session_trades}")
+    print(f"   P&L: ${bot.session_pnl:+.2f}")
+    if venue:
+        stats = venue.stats()
+        print(f"   Paper venue: {stats['fills']} fills, {stats['failed']} failed, {stats['send_errors']} send errors, "
+              f"fees {', '.join(f'{v:.4f} {k}' for k, v in stats['fees_paid'].items())}")
+    for position_id, pos in bot.positions.items():
+        print(f"   Open position #{position_id}: {pos['sol_amount']:.6f} SOL @ ${pos['entry_price']:.2f}")
+    print("\n⏱️ Stage latency (wall clock):")
+    print(format_summary(tracer.summary()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+📈 BACKTEST - Buy Low / Sell High on recorded ticks
+Runs the dip/rise/stop-loss strategy over a whole tick file with NumPy
+
+Usage:
+    python scripts/run_backtest.py data/sol_ticks.npz --dip 3 --rise 5 --stop 2
+    python scripts/run_backtest.py --synthetic-days 30      # no data file needed
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.backtest import Backtester, BacktestConfig, load_ticks, synthetic_ticks  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the SOL dip/rise strategy")
+    parser.add_argument("ticks", nargs="?", help="Tick file (.npz or .csv)")
+    parser.add_argument("--synthetic-days", type=float, default=None, help="Generate N days of 1s ticks instead")
+    parser.add_argument("--dip", type=float, default=3.0, help="Buy on X%% drop from recent high")
+    parser.add_argument("--rise", type=float, default=5.0, help="Take profit at X%% rise")
+    parser.add_argument("--stop", type=float, default=2.0, help="Stop loss at X%% below entry")
+    parser.add_argument("--lookback", type=float, default=30.0, help="Recent high/low window (minutes)")
+    parser.add_argument("--take-profit-from", choices=["recent_low", "entry"], default="recent_low")
+    parser.add_argument("--initial-usdc", type=float, default=1000.0)
+    parser.add_argument("--fee-bps", type=float, default=30.0)
+    parser.add_argument("--slippage-bps", type=float, default=50.0)
+    parser.add_argument("--equity-out", help="Save equity curve to this .npz file")
+    args = parser.parse_args()
+
+    if args.ticks:
+        ticks = load_ticks(args.ticks)
+        timestamps, prices = ticks.timestamps, ticks.prices
+        source = args.ticks
+    elif args.synthetic_days:
+        ticks = synthetic_ticks(args.synthetic_days, start_time=time.time() - args.synthetic_days * 86_400)
+        timestamps, prices = ticks.timestamps, ticks.prices
+        source = f"synthetic ({args.synthetic_days:g} days of 1s ticks)"
+    else:
+        parser.error("Provide a tick file or --synthetic-days")
+
+    config = BacktestConfig(
+        buy_dip_threshold=args.dip,
+        sell_rise_threshold=args.rise,
+        stop_loss_pct=args.stop,
+        lookback_minutes=args.lookback,
+        take_profit_from=args.take_profit_from,
+        initial_usdc=args.initial_usdc,
+        fee_bps=args.fee_bps,
+        slippage_bps=args.slippage_bps,
+    )
+
+    print("📈 SOL STRATEGY BACKTEST")
+    print("=" * 60)
+    print(f"   Data: {source}")
+    print(f"   Ticks: {len(prices):,}")
+    print(f"   Dip {config.buy_dip_threshold}% | Rise {config.sell_rise_threshold}% | "
+          f"Stop {config.stop_loss_pct}% | Lookback {config.lookback_minutes:g} min")
+    print(f"   Fees {config.fee_bps:g} bps | Slippage {config.slippage_bps:g} bps")
+
+    started = time.perf_counter()
+    result = Backtester(timestamps, prices).run(config)
+    elapsed = time.perf_counter() - started
+
+    stats = result.summary()
+    print(f"\n🏁 Done in {elapsed:.2f}s")
+    print(f"   Trades: {stats['trades']} closed, {stats['open_trades']} open")
+    print(f"   Win rate: {stats['win_rate_pct']:.1f}%")
+    print(f"   Fees paid: ${stats['fees_usdc']:.2f}")
+    print(f"   Final equity: ${stats['final_equity']:.2f}")
+    print(f"   Return: {stats['total_return_pct']:+.2f}%")
+    print(f"   Max drawdown: {stats['max_drawdown_pct']:.2f}%")
+
+    if args.equity_out:
+        np.savez_compressed(args.equity_out, timestamps=result.timestamps, equity=result.equity)
+        print(f"\n💾 Equity curve saved to {args.equity_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@
 Monitors SOL price and executes trades based on price movements
 """
 
+import json
 import os
 import sys
+import tempfile
 import time
 import requests
 from pathlib import Path
@@ -14,31 +16,49 @@ from dotenv import load_dotenv
 backend_path = Path(__file__).parent.parent / "backend"
 sys.path.insert(0, str(backend_path))
 
+from core.adaptive_interval import AdaptiveScheduler
+from core.clock import RealClock, ScaledClock
+from core.engine import EventEngine, ExecutionWorker, PollingFeed
+from core.event_log import INFO, configure as configure_logging, get_logger, parse_sample
+from core.events import FillEvent, OrderIntent
+from core.http_tape import HttpRecorder, HttpReplayer
+from core.order_book import ConditionalOrderBook
+from core.paper_exchange import PaperExchange
+from core.journal import StateJournal
+from core.jupiter_client import JupiterClient
+from core.ledger import TradeLedger, trading_day
+from core.metrics import MetricsRegistry, MetricsServer
+from core.notifier import DiscordNotifier
+from core.replay_feed import ReplayFinished
+from core.risk import RiskEngine
+from core.settings import BotSettings, ConfigWatcher
+from core.swap_executor import SwapExecutor
+from core.tracing import Tracer, format_summary
+from core.universe import Universe
 from core.wallet_manager import WalletManager
 from core.dynamic_price_feed import LivePriceOrcaClient
+from core.price_buffer import PriceRingBuffer
+from core.rolling_window import RollingWindow
+from core.triggers import TriggerModel
 
 
-def send_discord_notification(webhook_url, trade_type, sol_amount, price, details):
+def trade_embed(trade_type, sol_amount, price, details):
     """
-    Send trading notification to Discord webhook
+    Build the Discord embed for a trade
     
     Args:
-        webhook_url: Discord webhook URL
         trade_type: "BUY" or "SELL"
         sol_amount: Amount of SOL traded
         price: Price per SOL
         details: Additional details (profit, reason, etc.)
     """
-    if not webhook_url:
-        return  # Skip if webhook not configured
-    
     # Choose color based on trade type
     color = 0x00FF00 if trade_type == "BUY" else 0xFF0000  # Green for buy, Red for sell
     emoji = "🟢" if trade_type == "BUY" else "🔴"
     
     total_value = sol_amount * price
     
-    embed = {
+    return {
         "title": f"{emoji} {trade_type} SIGNAL EXECUTED",
         "color": color,
         "fields": [
@@ -68,9 +88,18 @@ def send_discord_notification(webhook_url, trade_type, sol_amount, price, detail
             "text": "SOL Trading Bot"
         }
     }
+
+
+def send_discord_notification(webhook_url, trade_type, sol_amount, price, details):
+    """
+    Send trading notification to Discord webhook (blocking; the bot queues
+    through DiscordNotifier instead)
+    """
+    if not webhook_url:
+        return  # Skip if webhook not configured
     
     payload = {
-        "embeds": [embed]
+        "embeds": [trade_embed(trade_type, sol_amount, price, details)]
     }
     
     try:
@@ -86,206 +115,588 @@ def send_discord_notification(webhook_url, trade_type, sol_amount, price, detail
 class SimpleTradingBot:
     """Simple SOL trading bot with dynamic pricing"""
     
-    def __init__(self, wallet_manager, dex_client, discord_webhook=None):
+    def __init__(self, wallet_manager, dex_client, discord_webhook=None, clock=None, confirm_trades=True,
+                 max_positions=1, swap_executor=None, metrics=None, tracer=None, log=None, journal=None,
+                 ledger=None, risk=None, settings=None, venue=None):
         self.wallet = wallet_manager
         self.dex = dex_client
         self.discord_webhook = discord_webhook
-        
-        # Trading parameters
-        self.buy_dip_pct = 2.0          # Buy when price drops 2%
-        self.sell_rise_pct = 2.0        # Sell when price rises 2%
-        self.stop_loss_pct = 5.0        # Stop loss at 5%
-        self.position_size_usd = 5.0    # Trade $5 at a time
-        self.max_daily_trades = 10
+        self.log = log or get_logger()  # Structured events; console output is optional
+        self.notifier = DiscordNotifier(
+            discord_webhook, on_error=lambda message: self.log.warning("discord_error", "   ⚠️ {message}", message=message)
+        ) if discord_webhook else None
+        self.clock = clock or RealClock()  # SimulatedClock replays sessions at CPU speed
+        self.confirm_trades = confirm_trades  # False: no input() prompt (replay)
+        self.swap_executor = swap_executor  # SwapExecutor: automated live swaps, no prompt
+        self.venue = venue  # PaperExchange: follows the price ticks, fills the swap executor's paper trades
+        
+        # Trading parameters (BotSettings: config.json "bot" block, reloaded while running)
+        self.max_positions = max_positions  # config.json risk.max_positions
+        self._use_settings(settings or BotSettings())
+        
+        # Stop-loss / take-profit / trailing-stop orders for every open position
+        self.order_book = ConditionalOrderBook()
         
         # State
-        self.price_history = []
-        self.position = None  # {"sol_amount": 0.1, "entry_price": 180.0}
+        self.price_history = PriceRingBuffer(capacity=8_640)  # ~2 days at 20s checks
+        self.recent_window = RollingWindow(30 * 60)  # 30-minute high/low
+        self.positions = {}  # position_id -> {"sol_amount": 0.1, "entry_price": 180.0, "entry_time": ...}
+        self._position_ids = 0
         self.trades_today = 0
         self.total_pnl = 0.0
-        
-    def update_price(self):
-        """Get fresh price and add to history"""
-        current_price = self.dex.get_current_sol_price()
-        
-        self.price_history.append({
-            "timestamp": time.time(),
-            "price": current_price
-        })
-        
-        # Keep only last 100 prices
-        if len(self.price_history) > 100:
-            self.price_history.pop(0)
-        
-        return current_price
+        self.day = trading_day(self.clock.time())  # UTC day of trades_today / total_pnl
+        self.session_trades = 0  # Since this process started (not reset daily)
+        self.session_pnl = 0.0
+        self.pending_intents = {}  # intent_id -> OrderIntent waiting on the execution worker
+        self.unconfirmed = {}  # intent_id -> UNCONFIRMED FillEvent (sent, may still land)
+        self.iteration = 0
+        self.engine = None
+        self.scheduler = None  # AdaptiveScheduler when polling adaptively
+        self.feed = None
+        self.last_price = None
+        self.last_tick_time = None
+        self.started_at = self.clock.time()
+        self.max_tick_age_seconds = 300  # /health fails when no price arrived for this long
+        
+        # Per-stage latency spans (feed fetch, signal, and the swap stages in live mode)
+        self.tracer = tracer or Tracer(clock=self.clock)
+        
+        # Write-ahead journal of ticks and fills (StateJournal): restart without losing state
+        self.journal = journal
+        
+        # Persistent fills and FIFO lots (TradeLedger, SQLite)
+        self.ledger = ledger
+        
+        # Account-wide limits from config.json (RiskEngine), checked on every order intent
+        self.risk = risk
+        
+        # Metrics (served in Prometheus format by run(metrics_port=...))
+        self.metrics = metrics or MetricsRegistry(prefix="solbot_")
+        self._register_metrics()
+        
+    def _register_metrics(self):
+        """Position state gauges, evaluated only when scraped"""
+        m = self.metrics
+        m.gauge("open_positions", "Open positions").set_function(lambda: len(self.positions))
+        m.gauge("position_sol", "SOL held in open positions").set_function(
+            lambda: sum(p["sol_amount"] for p in list(self.positions.values())))
+        m.gauge("unrealized_pnl_usd", "Open positions marked at the last price").set_function(
+            lambda: sum((self.last_price - p["entry_price"]) * p["sol_amount"]
+                        for p in list(self.positions.values())) if self.last_price else 0.0)
+        m.gauge("realized_pnl_usd", "Realized P&L").set_function(lambda: self.total_pnl)
+        m.gauge("trades_today", "Trades today").set_function(lambda: self.trades_today)
+        m.gauge("pending_orders", "Orders waiting on execution").set_function(lambda: len(self.pending_intents))
+        m.gauge("last_price_usd", "Last SOL price").set_function(lambda: self.last_price or 0.0)
+        m.gauge("last_tick_age_seconds", "Seconds since the last price").set_function(
+            lambda: self.clock.time() - (self.last_tick_time or self.started_at))
+        self._ticks = m.counter("ticks_total", "Prices received")
+        self._tick_latency = m.histogram("tick_latency_seconds", "Price observed to handled")
+        self._fills = m.counter("fills_total", "Execution results")
+        if self.ledger:
+            m.gauge("realized_pnl_today_usd", "Realized P&L of the current UTC day (ledger)").set_function(
+                self.ledger.realized_pnl)
+            m.gauge("open_lots", "Open FIFO lots (ledger)").set_function(self.ledger.open_lot_count)
+    
+    def _use_settings(self, settings):
+        self.settings = settings
+        self.buy_dip_pct = settings.buy_dip_pct
+        self.sell_rise_pct = settings.sell_rise_pct
+        self.stop_loss_pct = settings.stop_loss_pct
+        self.trailing_stop_pct = settings.trailing_stop_pct
+        self.position_size_usd = settings.position_size_usd
+        self.max_daily_trades = settings.max_daily_trades
+        
+        # Absolute buy trigger derived from the parameters above
+        self.triggers = TriggerModel(self.buy_dip_pct, self.sell_rise_pct, self.stop_loss_pct)
+    
+    def on_config(self, event):
+        """Switch to reloaded settings between two ticks (engine thread)"""
+        settings = event.settings
+        changes = self.settings.changes(settings)
+        if not changes:
+            return
+        self._use_settings(settings)
+        if settings.risk.max_positions:
+            self.max_positions = settings.risk.max_positions
+        if self.feed and not self.scheduler:
+            self.feed.interval_seconds = settings.check_interval_seconds
+        if self.swap_executor:
+            self.swap_executor.slippage_bps = settings.slippage_bps
+        
+        # Re-arm resting exits at the new distances (fired exits are already on their way)
+        if changes.keys() & {"sell_rise_pct", "stop_loss_pct", "trailing_stop_pct"}:
+            for position_id in list(self.positions):
+                if self.order_book.orders_for(position_id):
+                    self.order_book.cancel_position(position_id)
+                    self._place_exits(position_id)
+        self._update_triggers()
+        
+        self.log.info("config_reloaded", "\n   🔧 Settings reloaded: {changes}",
+                      changes=", ".join(f"{name} {old} → {new}" for name, (old, new) in changes.items()))
+    
+    def healthy(self):
+        """Health check: a price arrived recently (or the bot just started)"""
+        return self.clock.time() - (self.last_tick_time or self.started_at) < self.max_tick_age_seconds
+    
+    @property
+    def position(self):
+        """Most recently opened position (None when flat)"""
+        if not self.positions:
+            return None
+        return self.positions[max(self.positions)]
+    
+    def attach(self, engine):
+        """Called by EventEngine.register: the bot trades through this engine"""
+        self.engine = engine
+    
+    def record_price(self, timestamp, price):
+        """Add a price observation to history"""
+        self.price_history.append(timestamp, price)
+        self.recent_window.push(timestamp, price)
+    
+    # --- Crash recovery ---
+    def _journal(self, kind, sync=False, **data):
+        if self.journal is None:
+            return
+        self.journal.append(kind, sync=sync, **data)
+        if self.journal.snapshot_due:
+            self.journal.snapshot(self.journal_state())
+    
+    def journal_state(self):
+        """Everything needed to resume: positions, counters and the recent-high window"""
+        recent = self.price_history.since(self.clock.time() - self.recent_window.window_seconds)
+        return {
+            "positions": {str(position_id): pos for position_id, pos in self.positions.items()},
+            "last_position_id": self._position_ids,
+            "day": self.day,
+            "trades_today": self.trades_today,
+            "total_pnl": self.total_pnl,
+            "ticks": [[float(ts), float(price)] for ts, price in zip(recent.timestamps, recent.prices)],
+        }
+    
+    def restore(self):
+        """Rebuild state from the journal's snapshot and the records after it
+        
+        Price history comes back too, so the recent high is known and the
+        bot can trade on its first tick instead of warming up again.
+        """
+        state, records = self.journal.recover()
+        if state:
+            self.positions = {int(k): dict(v) for k, v in state["positions"].items()}
+            self._position_ids = state["last_position_id"]
+            self.day = state.get("day", self.day)
+            self.trades_today = state["trades_today"]
+            self.total_pnl = state["total_pnl"]
+            for ts, price in state["ticks"]:
+                self.record_price(ts, price)
+        for record in records:
+            kind = record["kind"]
+            if kind == "tick":
+                self.record_price(record["ts"], record["price"])
+                self._roll_day(record["ts"])
+            elif kind == "open":
+                self._roll_day(record["entry_time"])
+                self.positions[record["position_id"]] = {
+                    "sol_amount": record["sol_amount"],
+                    "entry_price": record["entry_price"],
+                    "entry_time": record["entry_time"],
+                }
+                self._position_ids = max(self._position_ids, record["position_id"])
+                self.trades_today += 1
+            elif kind == "close":
+                if "exit_time" in record:
+                    self._roll_day(record["exit_time"])
+                self.positions.pop(record["position_id"], None)
+                self.total_pnl += record["profit"]
+                self.trades_today += 1
+        self._roll_day(self.clock.time())  # Counters of an earlier day don't carry over
+        for position_id, pos in self.positions.items():
+            self._place_exits(position_id)
+            if self.risk:
+                self.risk.open_position("SOL/USDC", "simple", pos["sol_amount"], pos["entry_price"])
+        self._update_triggers()
+        return len(records)
+    
+    def _roll_day(self, timestamp):
+        """Reset the daily trade count and P&L on the first event of a new UTC day"""
+        day = trading_day(timestamp)
+        if day > self.day:
+            self.day = day
+            self.trades_today = 0
+            self.total_pnl = 0.0
     
     def get_recent_high(self):
         """Get highest price in last 30 minutes"""
-        if not self.price_history:
-            return None
-        
-        cutoff = time.time() - (30 * 60)
-        recent = [p["price"] for p in self.price_history if p["timestamp"] >= cutoff]
-        return max(recent) if recent else None
+        return self.recent_window.max(self.clock.time())
     
     def get_recent_low(self):
         """Get lowest price in last 30 minutes"""
-        if not self.price_history:
-            return None
-        
-        cutoff = time.time() - (30 * 60)
-        recent = [p["price"] for p in self.price_history if p["timestamp"] >= cutoff]
-        return min(recent) if recent else None
+        return self.recent_window.min(self.clock.time())
+    
+    def refresh_triggers(self):
+        """Absolute buy price (recomputed only when the recent high moves)"""
+        return self.triggers.update(self.get_recent_high(), None, None)
     
     def check_buy_signal(self, current_price):
         """Check if we should buy SOL"""
         
-        # Don't buy if we already have a position
-        if self.position:
-            return False, "Already have position"
+        # Don't buy if all position slots are used (a buy that may still land holds one)
+        unconfirmed_buys = sum(1 for f in self.unconfirmed.values() if f.intent.side == "BUY")
+        if len(self.positions) + unconfirmed_buys >= self.max_positions:
+            return False, "Already have position" if self.max_positions == 1 else "Max positions reached"
+        
+        # Don't buy past the config.json risk limits (loss cap, position slots)
+        if self.risk:
+            reason = self.risk.can_open()
+            if reason:
+                return False, reason
         
         # Don't buy if max trades reached
         if self.trades_today >= self.max_daily_trades:
             return False, "Max daily trades reached"
         
         # Check if price dropped enough
-        recent_high = self.get_recent_high()
-        if not recent_high:
+        levels = self.refresh_triggers()
+        if levels.buy is None:
             return False, "Not enough price history"
         
-        drop_pct = ((recent_high - current_price) / recent_high) * 100
+        # Extra positions only on a further dip below the lowest open entry
+        buy_level = levels.buy
+        if self.positions:
+            lowest_entry = min(p["entry_price"] for p in self.positions.values())
+            buy_level = min(buy_level, lowest_entry * (1 - self.buy_dip_pct / 100))
         
-        if drop_pct >= self.buy_dip_pct:
+        if current_price <= buy_level:
+            recent_high = self.get_recent_high()
+            drop_pct = ((recent_high - current_price) / recent_high) * 100
             return True, f"Price dropped {drop_pct:.2f}% from ${recent_high:.2f}"
         
-        return False, f"Waiting for {self.buy_dip_pct}% dip (current: {drop_pct:.2f}%)"
+        return False, f"Waiting for {self.buy_dip_pct}% dip (buy at ${buy_level:.2f})"
+    
+    def _confirm(self):
+        """Ask the operator to approve a trade (auto-approved when confirm_trades is off)"""
+        if not self.confirm_trades:
+            return "yes"
+        self.log.flush()  # Show the signal before prompting
+        return input("\n   Execute this trade? (yes/no): ").strip().lower()
+    
+    # --- Event handlers (engine thread) ---
+    def on_tick(self, tick):
+        """React to a new price as soon as the feed publishes it"""
+        self.iteration += 1
+        current_price = tick.price
+        self.record_price(tick.timestamp, current_price)
+        self._roll_day(self.clock.time())
+        
+        source = tick.source or "feed"
+        self._ticks.inc(source=source)
+        self._tick_latency.observe(max(0.0, self.clock.time() - tick.timestamp), source=source)
+        self.last_price = current_price
+        self.last_tick_time = self.clock.time()
+        self._journal("tick", ts=tick.timestamp, price=current_price)
+        
+        log = self.log
+        log.info("tick", "\n📊 Check #{iteration} - {time}\n   LIVE Price: ${price:.2f}",
+                 iteration=self.iteration, pair=tick.pair, price=current_price, source=tick.source)
+        
+        for intent in self.pending_intents.values():
+            log.info("order_pending", "   ⏳ {side} order #{intent_id} pending execution",
+                     side=intent.side, intent_id=intent.intent_id)
+        if self.unconfirmed:
+            self._resolve_unconfirmed()
+        
+        with self.tracer.span("signal", pair=tick.pair) as span:
+            if not any(i.side == "BUY" for i in self.pending_intents.values()):
+                # Look for buy opportunity (exits are resting orders in the order book)
+                should_buy, reason = self.check_buy_signal(current_price)
+                log.info("buy_check", "   📈 Buy check: {reason}", signal=should_buy, reason=reason)
+                
+                if should_buy:
+                    intent = self.submit_order("BUY", self.position_size_usd / current_price, current_price, reason)
+                    span["intent_id"] = intent.intent_id
+            
+            self._update_triggers()
+        
+        # Show open positions
+        if self.positions and log.is_enabled(INFO):
+            for position_id, pos in self.positions.items():
+                log.info(
+                    "position",
+                    "\n   📍 Active Position #{position_id}:\n"
+                    "      {sol_amount:.6f} SOL @ ${entry_price:.2f}\n"
+                    "      Current: ${price:.2f}\n"
+                    "      Value: ${value:.2f}\n"
+                    "      P&L: ${unrealized_pnl:+.2f} ({unrealized_pct:+.2f}%)\n"
+                    "      Exits: {exits}",
+                    position_id=position_id,
+                    sol_amount=pos["sol_amount"],
+                    entry_price=pos["entry_price"],
+                    price=current_price,
+                    value=pos["sol_amount"] * current_price,
+                    unrealized_pnl=(current_price - pos["entry_price"]) * pos["sol_amount"],
+                    unrealized_pct=((current_price / pos["entry_price"]) - 1) * 100,
+                    exits=lambda position_id=position_id: ", ".join(
+                        f"{o.kind.lower().replace('_', ' ')} ${o.current_trigger():.2f}"
+                        for o in self.order_book.orders_for(position_id)
+                    ),
+                )
+        
+        # Show stats
+        if self.trades_today > 0:
+            log.info("stats", "\n   📈 Today: {trades} trades, P&L: ${pnl:+.2f}",
+                     trades=self.trades_today, pnl=self.total_pnl)
+    
+    def submit_order(self, side, sol_amount, price, reason):
+        """Hand a BUY order intent to the execution worker (sells come from the order book)"""
+        intent = OrderIntent(
+            strategy_id="simple",
+            pair="SOL/USDC",
+            side=side,
+            amount=sol_amount,
+            price=price,
+            timestamp=self.clock.time(),
+            reason=reason,
+            metadata={"recent_high": self.get_recent_high(), "usdc_amount": sol_amount * price},
+        )
+        self.pending_intents[intent.intent_id] = intent
+        self.engine.submit(intent)
+        return intent
+    
+    def on_exit_triggered(self, order, tick):
+        """Order book callback: an exit fired and is on its way to execution"""
+        self.log.info("exit_triggered", "   🎯 {kind} triggered for position #{position_id} at ${price:.2f}",
+                      kind=order.kind.replace("_", " "), position_id=order.position_id, price=tick.price,
+                      order_id=order.order_id)
     
-    def check_sell_signal(self, current_price):
-        """Check if we should sell SOL"""
+    def _resolve_unconfirmed(self):
+        """Poll unconfirmed swaps once; a settled one comes back through on_fill"""
+        for fill in list(self.unconfirmed.values()):
+            resolved = self.swap_executor.resolve(fill) if self.swap_executor else None
+            if resolved:
+                self.log.info("unconfirmed_resolved", "   🔎 {side} {signature}: {status}", side=fill.intent.side,
+                              signature=fill.signature, status=resolved.status.lower(),
+                              intent_id=fill.intent.intent_id)
+                self.engine.publish(resolved)
+    
+    def on_fill(self, fill):
+        """Apply an execution result to position and stats"""
+        self.pending_intents.pop(fill.intent.intent_id, None)
+        if fill.status == "UNCONFIRMED":
+            self.unconfirmed[fill.intent.intent_id] = fill
+        else:
+            self.unconfirmed.pop(fill.intent.intent_id, None)
+        self._fills.inc(side=fill.intent.side, status=fill.status)
+        
+        if not fill.filled:
+            self.log.warning("fill_failed", "   ❌ {side} {status}: {detail}", side=fill.intent.side,
+                             status=fill.status.lower(), detail=fill.detail, intent_id=fill.intent.intent_id)
+            if fill.status == "UNCONFIRMED":
+                # Sent but unconfirmed: it may still land. A buy keeps its slot, and a sold position
+                # stays without exits, until _resolve_unconfirmed settles it
+                self.log.warning("fill_unconfirmed", "   ⚠️ Transaction {signature} unconfirmed, checking on later ticks",
+                                 signature=fill.signature)
+                self._update_triggers()
+                return
+            position_id = fill.intent.metadata.get("position_id")
+            if fill.intent.side == "SELL" and position_id in self.positions:
+                self._place_exits(position_id)  # Re-arm the exits that fired
+            self._update_triggers()
+            return
         
-        # Can't sell if no position
-        if not self.position:
-            return False, "No position to sell"
+        if fill.intent.side == "BUY":
+            self._apply_buy_fill(fill)
+        else:
+            self._apply_sell_fill(fill)
+        self._update_triggers()
+    
+    def trigger_prices(self):
+        """Prices at which the bot would act next (buy dip, nearest stop / take profit)"""
+        levels = self.order_book.nearest_levels("SOL/USDC")
+        if len(self.positions) < self.max_positions:
+            levels += self.refresh_triggers().prices()
+        return levels
+    
+    def _place_exits(self, position_id):
+        pos = self.positions[position_id]
+        self.order_book.place_bracket(
+            "SOL/USDC",
+            pos["sol_amount"],
+            pos["entry_price"],
+            position_id,
+            stop_loss_pct=self.stop_loss_pct,
+            take_profit_pct=self.sell_rise_pct,
+            trailing_stop_pct=self.trailing_stop_pct,
+            strategy_id="simple",
+        )
+    
+    def _update_triggers(self):
+        if self.scheduler:
+            self.scheduler.set_triggers(self.trigger_prices())
+    
+    def _apply_buy_fill(self, fill):
+        sol_amount = fill.filled_amount
+        current_price = fill.fill_price
+        
+        # Update position and arm its exits
+        self._position_ids += 1
+        position_id = self._position_ids
+        self.positions[position_id] = {
+            "sol_amount": sol_amount,
+            "entry_price": current_price,
+            "entry_time": fill.timestamp
+        }
+        self._place_exits(position_id)
+        self.trades_today += 1
+        self.session_trades += 1
+        if self.ledger:
+            self.ledger.record_fill(fill)
+        self._journal("open", sync=True, position_id=position_id, sol_amount=sol_amount,
+                      entry_price=current_price, entry_time=fill.timestamp, signature=fill.signature)
+        
+        self.log.info("position_opened", "   ✅ Position #{position_id} opened: {sol_amount:.6f} SOL @ ${price:.2f}",
+                      position_id=position_id, sol_amount=sol_amount, price=current_price)
+        
+        # Send Discord notification
+        recent_high = fill.intent.metadata.get("recent_high")
+        drop_pct = ((recent_high - current_price) / recent_high) * 100 if recent_high else 0
+        details = f"Price dropped {drop_pct:.2f}% from ${recent_high or 0:.2f}\n"
+        details += f"Entry: ${current_price:.2f}\n"
+        details += f"Position size: ${sol_amount * current_price:.2f} USDC"
+        
+        self._notify("BUY", sol_amount, current_price, details)
+    
+    def _apply_sell_fill(self, fill):
+        position_id = fill.intent.metadata.get("position_id")
+        position = self.positions.pop(position_id, None)
+        if not position:
+            return
         
-        entry_price = self.position["entry_price"]
+        sol_amount = fill.filled_amount
+        current_price = fill.fill_price
+        entry_price = position["entry_price"]
+        usdc_received = sol_amount * current_price
+        profit = (current_price - entry_price) * sol_amount
+        profit_pct = ((current_price / entry_price) - 1) * 100
         
-        # Check stop loss
-        loss_pct = ((entry_price - current_price) / entry_price) * 100
-        if loss_pct >= self.stop_loss_pct:
-            return True, f"STOP LOSS: Down {loss_pct:.2f}% from ${entry_price:.2f}"
+        # Update stats
+        self.total_pnl += profit
+        self.trades_today += 1
+        self.session_pnl += profit
+        self.session_trades += 1
+        if self.ledger:
+            self.ledger.record_fill(fill)
+        self._journal("close", sync=True, position_id=position_id, sol_amount=sol_amount,
+                      exit_price=current_price, profit=profit, exit_time=fill.timestamp, signature=fill.signature)
+        
+        self.log.info("position_closed", "   ✅ Position #{position_id} closed. P&L: ${profit:+.2f}",
+                      position_id=position_id, sol_amount=sol_amount, entry_price=entry_price,
+                      price=current_price, profit=profit)
+        
+        # Send Discord notification
+        details = f"{fill.intent.reason}\n"
+        details += f"Entry: ${entry_price:.2f}\n"
+        details += f"Exit: ${current_price:.2f}\n"
+        details += f"Profit: ${profit:+.2f} ({profit_pct:+.2f}%)\n"
+        details += f"Received: ${usdc_received:.2f} USDC\n"
+        details += f"Total P&L today: ${self.total_pnl:+.2f}"
+        
+        self._notify("SELL", sol_amount, current_price, details)
+    
+    def _notify(self, trade_type, sol_amount, price, details):
+        """Queue a Discord trade notification (never blocks the trading loop)"""
+        if self.notifier:
+            self.notifier.notify(trade_embed(trade_type, sol_amount, price, details))
+    
+    # --- Execution (worker thread) ---
+    def execute_intent(self, intent):
+        """Execution worker entry point: run a BUY or SELL intent"""
+        if intent.side == "BUY":
+            return self.execute_buy(intent)
+        return self.execute_sell(intent)
+    
+    def _execute(self, intent):
+        """Swap automatically in live mode, otherwise confirm and simulate"""
+        if self.swap_executor:
+            fill = self.swap_executor(intent)
+            if fill.filled:
+                self.log.info("swap_confirmed", "   ✅ Swap confirmed: {signature}", signature=fill.signature)
+            return fill
         
-        # Check profit target
-        profit_pct = ((current_price - entry_price) / entry_price) * 100
-        if profit_pct >= self.sell_rise_pct:
-            return True, f"PROFIT TARGET: Up {profit_pct:.2f}% from ${entry_price:.2f}"
+        confirm = self._confirm()
         
-        return False, f"Waiting for {self.sell_rise_pct}% rise (current: {profit_pct:.2f}%)"
+        if confirm == "yes":
+            self.log.info("simulated_fill", "   ⚠️ SIMULATION MODE - Trade not executed", intent_id=intent.intent_id)
+            return FillEvent(intent, "FILLED", self.clock.time(), intent.amount, intent.price)
+        
+        return FillEvent(intent, "CANCELLED", self.clock.time(), detail="Trade cancelled")
     
-    def execute_buy(self, current_price):
+    def execute_buy(self, intent):
         """Execute buy order"""
         
-        sol_amount = self.position_size_usd / current_price
-        
-        print(f"\n🟢 BUY SIGNAL")
-        print(f"   Amount: {sol_amount:.6f} SOL")
-        print(f"   Price: ${current_price:.2f}")
-        print(f"   Cost: ${self.position_size_usd:.2f} USDC")
+        sol_amount = intent.amount
+        current_price = intent.price
         
-        confirm = input("\n   Execute this trade? (yes/no): ").strip().lower()
+        self.log.info(
+            "buy_signal",
+            "\n🟢 BUY SIGNAL\n   Amount: {sol_amount:.6f} SOL\n   Price: ${price:.2f}\n   Cost: ${cost:.2f} USDC",
+            intent_id=intent.intent_id, sol_amount=sol_amount, price=current_price, cost=sol_amount * current_price,
+        )
         
-        if confirm == "yes":
-            # TODO: Add real swap execution here
-            print("   ⚠️ SIMULATION MODE - Trade not executed")
-            
-            # Update position
-            self.position = {
-                "sol_amount": sol_amount,
-                "entry_price": current_price,
-                "entry_time": time.time()
-            }
-            self.trades_today += 1
-            
-            print(f"   ✅ Position opened: {sol_amount:.6f} SOL @ ${current_price:.2f}")
-            
-            # Send Discord notification
-            recent_high = self.get_recent_high()
-            drop_pct = ((recent_high - current_price) / recent_high) * 100 if recent_high else 0
-            details = f"Price dropped {drop_pct:.2f}% from ${recent_high:.2f}\n"
-            details += f"Entry: ${current_price:.2f}\n"
-            details += f"Position size: ${self.position_size_usd:.2f} USDC"
-            
-            send_discord_notification(
-                self.discord_webhook,
-                "BUY",
-                sol_amount,
-                current_price,
-                details
-            )
-        else:
-            print("   ❌ Trade cancelled")
+        return self._execute(intent)
     
-    def execute_sell(self, current_price):
+    def execute_sell(self, intent):
         """Execute sell order"""
         
-        if not self.position:
-            return
+        position = self.positions.get(intent.metadata.get("position_id"))
+        if not position:
+            return FillEvent(intent, "REJECTED", self.clock.time(), detail="No position to sell")
         
-        sol_amount = self.position["sol_amount"]
-        entry_price = self.position["entry_price"]
+        sol_amount = intent.amount
+        entry_price = position["entry_price"]
+        current_price = intent.price
         usdc_received = sol_amount * current_price
         profit = (current_price - entry_price) * sol_amount
         profit_pct = ((current_price / entry_price) - 1) * 100
         
-        print(f"\n🔴 SELL SIGNAL")
-        print(f"   Amount: {sol_amount:.6f} SOL")
-        print(f"   Entry Price: ${entry_price:.2f}")
-        print(f"   Current Price: ${current_price:.2f}")
-        print(f"   Receive: ${usdc_received:.2f} USDC")
-        print(f"   Profit: ${profit:+.2f} ({profit_pct:+.2f}%)")
-        
-        confirm = input("\n   Execute this trade? (yes/no): ").strip().lower()
+        self.log.info(
+            "sell_signal",
+            "\n🔴 SELL SIGNAL - {reason}\n   Amount: {sol_amount:.6f} SOL\n   Entry Price: ${entry_price:.2f}\n"
+            "   Current Price: ${price:.2f}\n   Receive: ${usdc_received:.2f} USDC\n"
+            "   Profit: ${profit:+.2f} ({profit_pct:+.2f}%)",
+            intent_id=intent.intent_id, reason=intent.reason, sol_amount=sol_amount, entry_price=entry_price,
+            price=current_price, usdc_received=usdc_received, profit=profit, profit_pct=profit_pct,
+        )
         
-        if confirm == "yes":
-            # TODO: Add real swap execution here
-            print("   ⚠️ SIMULATION MODE - Trade not executed")
-            
-            # Update stats
-            self.total_pnl += profit
-            self.trades_today += 1
-            self.position = None
-            
-            print(f"   ✅ Position closed. P&L: ${profit:+.2f}")
-            
-            # Send Discord notification
-            details = f"Entry: ${entry_price:.2f}\n"
-            details += f"Exit: ${current_price:.2f}\n"
-            details += f"Profit: ${profit:+.2f} ({profit_pct:+.2f}%)\n"
-            details += f"Received: ${usdc_received:.2f} USDC\n"
-            details += f"Total P&L today: ${self.total_pnl:+.2f}"
-            
-            send_discord_notification(
-                self.discord_webhook,
-                "SELL",
-                sol_amount,
-                current_price,
-                details
-            )
-        else:
-            print("   ❌ Trade cancelled")
+        return self._execute(intent)
     
-    def run(self, check_interval_seconds=20):
-        """Main trading loop"""
+    def run(self, check_interval_seconds=None, scheduler=None, metrics_port=None, config_watcher=None):
+        """Start feed, execution worker and event loop
+        
+        With an AdaptiveScheduler the check interval follows volatility and
+        distance to the next trigger price instead of staying fixed.
+        With a ConfigWatcher, edits to config.json are applied while running.
+        With metrics_port, /metrics (Prometheus) and /health are served on it.
+        """
+        self.scheduler = scheduler
+        check_interval_seconds = check_interval_seconds or self.settings.check_interval_seconds
         
         print("🚀 SOL TRADING BOT - LIVE MODE")
         print("=" * 70)
-        print(f"💼 Wallet: {self.wallet.pubkey()}")
-        
-        sol_balance = self.wallet.get_sol_balance()
-        print(f"   SOL Balance: {sol_balance:.6f} SOL")
-        
-        current_price = self.dex.get_current_sol_price()
-        print(f"   Current SOL Price: ${current_price:.2f}")
-        print(f"   SOL Value: ${sol_balance * current_price:.2f}")
+        if self.venue:
+            print("🧪 Execution: PAPER - swaps are filled by the simulated exchange")
+        elif self.swap_executor:
+            print("⚡ Execution: LIVE - swaps are sent automatically")
+        else:
+            print("⚠️ Execution: SIMULATION - trades are confirmed and logged, not sent")
+        if self.wallet:
+            print(f"💼 Wallet: {self.wallet.pubkey()}")
+            
+            sol_balance = self.wallet.get_sol_balance()
+            print(f"   SOL Balance: {sol_balance:.6f} SOL")
+            
+            current_price = self.dex.get_current_sol_price()
+            print(f"   Current SOL Price: ${current_price:.2f}")
+            print(f"   SOL Value: ${sol_balance * current_price:.2f}")
         
         print("\n📊 Trading Parameters:")
         print(f"   Buy on dip: {self.buy_dip_pct}%")
@@ -293,95 +704,269 @@ class SimpleTradingBot:
         print(f"   Stop loss: {self.stop_loss_pct}%")
         print(f"   Position size: ${self.position_size_usd}")
         print(f"   Max daily trades: {self.max_daily_trades}")
-        print(f"   Check interval: {check_interval_seconds} seconds")
+        print(f"   Max open positions: {self.max_positions}")
+        if self.risk:
+            limits = self.risk.limits
+            print(f"   Risk limits: {limits.max_positions or '∞'} positions, "
+                  f"{limits.stake_sol or '∞'} SOL stake, {limits.daily_loss_cap_sol or '∞'} SOL daily loss cap")
+        if self.trailing_stop_pct:
+            print(f"   Trailing stop: {self.trailing_stop_pct}%")
+        if scheduler:
+            print(f"   Check interval: adaptive {scheduler.min_interval:g}-{scheduler.max_interval:g} seconds")
+        else:
+            print(f"   Check interval: {check_interval_seconds} seconds")
+        
+        if self.journal:
+            started = time.perf_counter()
+            replayed = self.restore()
+            print(f"\n♻️ Restored from journal in {(time.perf_counter() - started) * 1000:.1f}ms "
+                  f"({replayed} records): {len(self.positions)} open positions, "
+                  f"{len(self.recent_window)} recent prices, P&L ${self.total_pnl:+.2f}")
+        
+        if self.risk and self.ledger and self.price_history.latest_price:
+            # Today's realized losses keep counting against the cap after a restart
+            self.risk.add_realized(self.ledger.realized_pnl() / self.price_history.latest_price)
         
         print("\n🔴 MONITORING STARTED - Press Ctrl+C to stop")
         print("=" * 70)
         
-        iteration = 0
+        engine = EventEngine(clock=self.clock, risk=self.risk)
+        if self.venue:
+            engine.register(self.venue)  # Before the bot, so pools move to a tick's price before signals
+        engine.register(self)
+        self.order_book.on_trigger = self.on_exit_triggered
+        engine.register(self.order_book)
+        feed = self.feed = PollingFeed(
+            engine,
+            self.dex.get_current_sol_price,
+            scheduler or check_interval_seconds,
+            on_error=lambda e: self.log.warning("feed_error", "   ⚠️ Price feed error: {error}", error=str(e)),
+            metrics=self.metrics,
+            tracer=self.tracer,
+        )
+        worker = ExecutionWorker(engine, self.execute_intent)
+        
+        self.metrics.gauge("event_queue_depth", "Events waiting for dispatch").set_function(engine.events.qsize)
+        server = None
+        if metrics_port:
+            server = MetricsServer(self.metrics, port=metrics_port, health=self.healthy)
+            server.start()
+            print(f"📈 Metrics: http://localhost:{server.port}/metrics")
+        
+        if config_watcher:
+            engine.register(config_watcher)
+            config_watcher.start()
+            print(f"🔧 Watching {config_watcher.path.name} for setting changes")
+        
+        if self.notifier:
+            self.notifier.start()
+            for key in ("dropped", "deduplicated", "sent_embeds", "failed"):
+                self.metrics.gauge(f"discord_{key}", f"Discord notifier {key.replace('_', ' ')}").set_function(
+                    lambda key=key: self.notifier.stats()[key])
         
         try:
-            while True:
-                iteration += 1
-                
-                # Get fresh price
-                current_price = self.update_price()
-                
-                print(f"\n📊 Check #{iteration} - {time.strftime('%H:%M:%S')}")
-                print(f"   LIVE Price: ${current_price:.2f}")
-                
-                # Check for signals
-                if not self.position:
-                    # Look for buy opportunity
-                    should_buy, reason = self.check_buy_signal(current_price)
-                    print(f"   📈 Buy check: {reason}")
-                    
-                    if should_buy:
-                        self.execute_buy(current_price)
-                
-                else:
-                    # Look for sell opportunity
-                    should_sell, reason = self.check_sell_signal(current_price)
-                    print(f"   📉 Sell check: {reason}")
-                    
-                    if should_sell:
-                        self.execute_sell(current_price)
-                    
-                    # Show current position
-                    pos = self.position
-                    current_value = pos["sol_amount"] * current_price
-                    unrealized_pnl = (current_price - pos["entry_price"]) * pos["sol_amount"]
-                    unrealized_pct = ((current_price / pos["entry_price"]) - 1) * 100
-                    
-                    print(f"\n   📍 Active Position:")
-                    print(f"      {pos['sol_amount']:.6f} SOL @ ${pos['entry_price']:.2f}")
-                    print(f"      Current: ${current_price:.2f}")
-                    print(f"      Value: ${current_value:.2f}")
-                    print(f"      P&L: ${unrealized_pnl:+.2f} ({unrealized_pct:+.2f}%)")
+            engine.run(feeds=[feed], workers=[worker])
                 
-                # Show stats
-                if self.trades_today > 0:
-                    print(f"\n   📈 Today: {self.trades_today} trades, P&L: ${self.total_pnl:+.2f}")
-                
-                # Heartbeat for Docker health check
-                try:
-                    with open("/app/logs/heartbeat.txt", "w") as f:
-                        f.write(str(time.time()))
-                except:
-                    pass  # Not in Docker, ignore
-                
-                # Wait before next check
-                print(f"   ⏳ Next check in {check_interval_seconds} seconds...")
-                time.sleep(check_interval_seconds)
-                
-        except KeyboardInterrupt:
-            print("\n\n🛑 Bot stopped by user")
+        except (KeyboardInterrupt, ReplayFinished) as e:
+            self.log.flush()
+            if isinstance(e, ReplayFinished):
+                print("\n\n🏁 Replay finished")
+            else:
+                print("\n\n🛑 Bot stopped by user")
             print(f"\n📊 Final Stats:")
-            print(f"   Total trades: {self.trades_today}")
-            print(f"   Total P&L: ${self.total_pnl:+.2f}")
+            print(f"   Total trades: {self.session_trades} ({self.trades_today} today)")
+            print(f"   Total P&L: ${self.session_pnl:+.2f} (today ${self.total_pnl:+.2f})")
+            if self.ledger:
+                prices = {"SOL/USDC": self.last_price} if self.last_price else {}
+                print(f"   Ledger: realized today ${self.ledger.realized_pnl():+.2f}, "
+                      f"unrealized ${self.ledger.unrealized_pnl(prices):+.2f} "
+                      f"({self.ledger.open_lot_count()} open lots)")
             
-            if self.position:
-                print(f"\n   ⚠️ Open position: {self.position['sol_amount']:.6f} SOL")
-
+            if self.venue:
+                stats = self.venue.stats()
+                print(f"   Paper venue: {stats['fills']} fills, {stats['failed']} failed, "
+                      f"{stats['send_errors']} send errors, {stats['unconfirmed']} unconfirmed, "
+                      f"balances {', '.join(f'{k} {v:,.4f}' for k, v in stats['balances'].items())}")
+            
+            for position_id, pos in self.positions.items():
+                print(f"\n   ⚠️ Open position #{position_id}: {pos['sol_amount']:.6f} SOL @ ${pos['entry_price']:.2f}")
+        
+        finally:
+            if self.journal:
+                self.journal.snapshot(self.journal_state())  # Fast restart: nothing to replay
+                self.journal.close()
+            if self.ledger:
+                self.ledger.close()
+            if config_watcher:
+                config_watcher.stop()
+            self.log.flush()
+            report = self.tracer.summary()
+            if report:
+                print("\n⏱️ Stage latency:")
+                print(format_summary(report))
+            self.tracer.close()
+            if server:
+                server.stop()
+            if self.notifier:
+                self.notifier.stop()
+                stats = self.notifier.stats()
+                print(f"   Discord: {stats['sent_embeds']} sent, {stats['dropped']} dropped, "
+                      f"{stats['deduplicated']} duplicates, {stats['failed']} failed")
 
 def main():
     """Initialize and run the bot"""
     
     load_dotenv()
+    
+    # HTTP/RPC capture: HTTP_RECORD writes every exchange to a tape; HTTP_REPLAY serves a
+    # tape instead of the network (offline), HTTP_REPLAY_SPEED times faster than recorded
+    tape = None
+    clock = RealClock()
+    if os.getenv("HTTP_REPLAY"):
+        speed = float(os.getenv("HTTP_REPLAY_SPEED", "1"))
+        tape = HttpReplayer(os.getenv("HTTP_REPLAY"), speed=speed, rpc_urls=[os.getenv("RPC_URL")]).install()
+        clock = ScaledClock(speed, start=tape.started_at)
+        print(f"📼 Replaying {len(tape.exchanges)} HTTP exchanges from {tape.path} at {speed:g}x")
+    elif os.getenv("HTTP_RECORD"):
+        tape = HttpRecorder(os.getenv("HTTP_RECORD"), rpc_urls=[os.getenv("RPC_URL")]).install()
+        print(f"📼 Recording HTTP exchanges to {tape.path}")
+    
+    # Structured logging: console text and/or JSON lines, written off the trading thread
+    configure_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        console=os.getenv("LOG_CONSOLE", "true").lower() in ("1", "true", "yes"),
+        json_path=os.getenv("LOG_FILE") or None,
+        json_stream=sys.stdout if os.getenv("LOG_JSON_STDOUT", "false").lower() in ("1", "true", "yes") else None,
+        sample=parse_sample(os.getenv("LOG_SAMPLE", "")),
+        clock=clock,
+    )
+    
     rpc_url = os.getenv("RPC_URL")
     wallet_key = os.getenv("WALLET_PRIVATE_KEY_JSON")
     discord_webhook = os.getenv("DISCORD_WEBHOOK_URL")
     
-    # Get check interval from .env (default: 20 seconds)
-    check_interval = int(os.getenv("CHECK_INTERVAL_SECONDS", "20"))
+    # Settings and risk limits from config.json; the check interval defaults to .env (20 seconds)
+    config_path = Path(os.getenv("CONFIG_PATH") or Path(__file__).parent.parent / "config.json")
+    if not config_path.exists():
+        print(f"⚠️ {config_path} not found, using default settings")
+    config = json.loads(config_path.read_text()) if config_path.exists() else {}
+    defaults = BotSettings(check_interval_seconds=float(os.getenv("CHECK_INTERVAL_SECONDS", "20")))
+    settings = BotSettings.from_config(config, defaults)
+    check_interval = settings.check_interval_seconds
+    
+    # Optional adaptive interval: faster near trigger prices, within a request budget
+    scheduler = None
+    if os.getenv("ADAPTIVE_INTERVAL", "false").lower() in ("1", "true", "yes"):
+        scheduler = AdaptiveScheduler(
+            min_interval=float(os.getenv("MIN_CHECK_INTERVAL_SECONDS", "5")),
+            max_interval=float(os.getenv("MAX_CHECK_INTERVAL_SECONDS", str(check_interval * 3))),
+            max_requests_per_hour=float(os.getenv("MAX_REQUESTS_PER_HOUR", str(3600 / check_interval))),
+        )
+    
+    # Execution mode: "simulate" (default, prompt then log), "paper" (automated swaps against
+    # a simulated exchange, no keys needed) or "live" (automated swaps)
+    execution_mode = os.getenv("EXECUTION_MODE", "simulate").lower()
+    if execution_mode not in ("simulate", "paper", "live"):
+        raise ValueError(f"EXECUTION_MODE must be 'simulate', 'paper' or 'live', got {execution_mode!r}")
+    
+    venue = None
+    if execution_mode == "paper":
+        venue = PaperExchange(
+            universe=Universe.from_config(config),
+            clock=clock,
+            liquidity_usd=float(os.getenv("PAPER_LIQUIDITY_USD", "2000000")),
+            fee_bps=float(os.getenv("PAPER_FEE_BPS", "30")),
+            latency_seconds=float(os.getenv("PAPER_LATENCY_SECONDS", "0.4")),
+            failure_rate=float(os.getenv("PAPER_FAILURE_RATE", "0")),
+            unconfirmed_rate=float(os.getenv("PAPER_UNCONFIRMED_RATE", "0")),
+            balances={"SOL": float(os.getenv("PAPER_SOL", "1")), "USDC": float(os.getenv("PAPER_USDC", "1000"))},
+        )
+        wallet = venue.wallet
+    else:
+        wallet = WalletManager(rpc_url=rpc_url)
+        wallet.load_keypair_from_json_array(wallet_key)
+    
+    # Metrics endpoint (also the Docker health check); METRICS_PORT=0 disables it
+    metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+    metrics = MetricsRegistry(prefix="solbot_")
+    
+    # Latency spans; TRACE_FILE also appends them as JSON lines (scripts/trace_summary.py)
+    tracer = Tracer(export_path=os.getenv("TRACE_FILE") or None, clock=clock)
+    
+    dex = LivePriceOrcaClient(clock=clock, metrics=metrics)
     
-    wallet = WalletManager(rpc_url=rpc_url)
-    wallet.load_keypair_from_json_array(wallet_key)
+    # Risk limits from config.json (hot-reloaded with the settings)
+    risk = RiskEngine(settings.risk, universe=Universe.from_config(config), clock=clock, metrics=metrics)
     
-    dex = LivePriceOrcaClient()
+    # Edits to config.json apply without a restart (CONFIG_RELOAD=false disables)
+    config_watcher = None
+    if os.getenv("CONFIG_RELOAD", "true").lower() in ("1", "true", "yes") and config_path.exists():
+        config_watcher = ConfigWatcher(
+            config_path,
+            parse=lambda data: BotSettings.from_config(data, defaults),
+            on_error=lambda message: get_logger().warning("config_error", "   ⚠️ {message}", message=message),
+        )
     
-    bot = SimpleTradingBot(wallet, dex, discord_webhook=discord_webhook)
-    bot.run(check_interval_seconds=check_interval)
+    swap_executor = None
+    if execution_mode in ("paper", "live"):
+        swap_executor = SwapExecutor(
+            venue or JupiterClient(os.getenv("JUPITER_BASE_URL", "https://quote-api.jup.ag")),
+            wallet,
+            universe=Universe.from_config(config),
+            clock=clock,
+            slippage_bps=settings.slippage_bps,
+            max_price_impact_pct=float(os.getenv("MAX_PRICE_IMPACT_PCT", "1.0")),
+            max_price_deviation_pct=float(os.getenv("MAX_PRICE_DEVIATION_PCT", "1.0")),
+            min_sol_reserve=float(os.getenv("MIN_SOL_RESERVE", "0.02")),
+            metrics=metrics,
+            tracer=tracer,
+        )
+    
+    # Simulated and paper sessions keep their own state: their fills must not reach the live
+    # ledger (which seeds the daily loss cap) nor their positions the live journal
+    data_dir = Path("data") if execution_mode == "live" else Path("data") / execution_mode
+    
+    # Crash recovery journal (JOURNAL_DIR= disables)
+    journal_dir = os.getenv("JOURNAL_DIR", str(data_dir / "journal"))
+    
+    # Trade ledger (LEDGER_PATH= disables); query with scripts/ledger_report.py
+    ledger_path = os.getenv("LEDGER_PATH", str(data_dir / "trades.db"))
+    
+    if isinstance(tape, HttpReplayer):
+        # An offline replay starts flat and must not touch the live journal and ledger
+        replay_dir = Path(tempfile.mkdtemp(prefix="solbot-replay-"))
+        journal_dir = str(replay_dir / "journal") if journal_dir else ""
+        ledger_path = str(replay_dir / "trades.db") if ledger_path else ""
+        print(f"📼 Replay journal and ledger: {replay_dir}")
+    
+    journal = StateJournal(journal_dir) if journal_dir else None
+    ledger = TradeLedger(
+        ledger_path,
+        clock=clock,
+        on_error=lambda message: get_logger().warning("ledger_error", "   ⚠️ {message}", message=message),
+    ) if ledger_path else None
+    
+    bot = SimpleTradingBot(
+        wallet, dex,
+        discord_webhook=discord_webhook,
+        clock=clock,
+        max_positions=risk.limits.max_positions or 1,
+        swap_executor=swap_executor,
+        metrics=metrics,
+        tracer=tracer,
+        journal=journal,
+        ledger=ledger,
+        risk=risk,
+        settings=settings,
+        venue=venue,
+    )
+    try:
+        bot.run(scheduler=scheduler, metrics_port=metrics_port, config_watcher=config_watcher)
+    finally:
+        if tape:
+            tape.close()
+            if isinstance(tape, HttpReplayer):
+                print(f"📼 Replay: {tape.served} served, {tape.misses} not on tape, {tape.remaining()} unused")
 
 
 if __name__ == "__main__":
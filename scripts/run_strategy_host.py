@@ -0,0 +1,153 @@
+"""
+🧩 STRATEGY HOST - run several strategy variants in one process
+All variants share one price feed, one quote cache and one execution worker,
+so ten variants cost about as many outbound requests as one. Every pair in
+config.json is polled in the same cycle
+
+Usage:
+    python scripts/run_strategy_host.py --variants variants.json
+    python scripts/run_strategy_host.py --synthetic-days 1          # replay, no network
+
+variants.json maps a variant id to SOLTradingStrategy parameters (plus an
+optional "pair" from the config.json universe, default SOL/USDC):
+    {"tight": {"buy_dip_threshold": 1.5, "sell_rise_threshold": 2.0, "stop_loss_pct": 1.0},
+     "wide":  {"buy_dip_threshold": 4.0, "sell_rise_threshold": 6.0, "stop_loss_pct": 3.0},
+     "jup":   {"pair": "JUP/USDC", "buy_dip_threshold": 3.0}}
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.adaptive_interval import AdaptiveScheduler  # noqa: E402
+from backend.core.backtest import load_ticks, synthetic_ticks  # noqa: E402
+from backend.core.clock import SimulatedClock  # noqa: E402
+from backend.core.engine import EventEngine, ExecutionWorker, PollingFeed  # noqa: E402
+from backend.core.metrics import MetricsRegistry, MetricsServer  # noqa: E402
+from backend.core.replay_feed import ReplayFinished, ReplayPriceFeed  # noqa: E402
+from backend.core.risk import RiskEngine, RiskLimits  # noqa: E402
+from backend.core.strategy_host import StrategyHost  # noqa: E402
+from backend.core.universe import Universe  # noqa: E402
+
+DEFAULT_VARIANTS = {
+    f"dip{dip:g}_rise{rise:g}": {"buy_dip_threshold": dip, "sell_rise_threshold": rise, "stop_loss_pct": 2.0}
+    for dip in (1.0, 2.0, 3.0)
+    for rise in (2.0, 5.0)
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many strategy variants on one feed")
+    parser.add_argument("--variants", help="JSON file: {variant_id: SOLTradingStrategy kwargs}")
+    parser.add_argument("--config", default=str(ROOT / "config.json"), help="Universe of tokens/pairs")
+    parser.add_argument("--interval", type=float, default=20.0, help="Feed poll interval (seconds)")
+    parser.add_argument("--adaptive", action="store_true", help="Poll faster near any variant's trigger prices")
+    parser.add_argument("--budget", type=float, default=None, help="Adaptive: max polls per hour (default 3600/interval)")
+    parser.add_argument("--quote-ttl", type=float, default=5.0, help="Quote cache lifetime (seconds)")
+    parser.add_argument("--initial-usdc", type=float, default=1000.0, help="Paper USDC per variant")
+    parser.add_argument("--ticks", help="Replay this tick file (.npz or .csv) in simulated time")
+    parser.add_argument("--synthetic-days", type=float, default=None, help="Replay N days of synthetic ticks")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus /metrics on this port")
+    parser.add_argument("--risk", action="store_true",
+                        help="Enforce the config.json risk limits across all variants")
+    args = parser.parse_args()
+
+    variants = DEFAULT_VARIANTS
+    if args.variants:
+        with open(args.variants) as f:
+            variants = json.load(f)
+
+    metrics = MetricsRegistry(prefix="solbot_")
+
+    if args.ticks or args.synthetic_days:
+        # Recorded ticks cover SOL/USDC only
+        ticks = load_ticks(args.ticks) if args.ticks else synthetic_ticks(args.synthetic_days)
+        universe = Universe.default()
+        clock = SimulatedClock(start=float(ticks.timestamps[0]))
+        client = ReplayPriceFeed(ticks, clock)
+        mode = "REPLAY"
+    else:
+        from backend.core.dynamic_price_feed import LivePriceOrcaClient
+
+        universe = Universe.load(args.config)
+        clock = None
+        client = LivePriceOrcaClient(universe=universe, metrics=metrics)
+        mode = "LIVE (paper fills)"
+
+    scheduler = None
+    if args.adaptive:
+        scheduler = AdaptiveScheduler(
+            min_interval=min(5.0, args.interval),
+            max_interval=args.interval * 3,
+            max_requests_per_hour=args.budget or 3600 / args.interval,
+        )
+
+    risk = None
+    if args.risk:
+        risk = RiskEngine(RiskLimits.load(args.config), universe=universe, clock=clock, metrics=metrics)
+    engine = EventEngine(clock=clock, risk=risk)
+    host = StrategyHost.from_variants(
+        engine, client, variants,
+        initial_usdc=args.initial_usdc,
+        quote_ttl_seconds=args.quote_ttl,
+        universe=universe,
+        scheduler=scheduler,
+    )
+    feed = PollingFeed(
+        engine,
+        host.quotes.get_prices,
+        scheduler or args.interval,
+        on_error=lambda e: print(f"⚠️ Price feed error: {e}"),
+        metrics=metrics,
+    )
+    worker = ExecutionWorker(engine, host.execute)
+
+    metrics.gauge("quote_cache_hit_ratio", "Quote cache hits / lookups").set_function(host.quotes.hit_ratio)
+    metrics.gauge("quote_cache_upstream_calls", "Quote cache misses").set_function(lambda: host.quotes.misses)
+    metrics.gauge("variant_positions", "Variants holding a position").set_function(
+        lambda: sum(1 for s in host.strategies.values() if s.sol_position > 0))
+    server = None
+    if args.metrics_port:
+        server = MetricsServer(metrics, port=args.metrics_port)
+        server.start()
+
+    print(f"🧩 STRATEGY HOST - {mode}")
+    print("=" * 70)
+    print(f"   Pairs: {', '.join(universe.pairs)}")
+    print(f"   Variants: {len(host.strategies)} ({', '.join(host.strategies)})")
+    print(f"   Poll interval: {args.interval:g}s, quote cache TTL: {args.quote_ttl:g}s")
+
+    started = time.perf_counter()
+    try:
+        engine.run(feeds=[feed], workers=[worker])
+    except (KeyboardInterrupt, ReplayFinished):
+        pass
+    finally:
+        if server:
+            server.stop()
+    elapsed = time.perf_counter() - started
+
+    marks = host.quotes.get_prices() if mode != "REPLAY" else {client.pair: float(client.prices[-1])}
+    print(f"\n🏁 Stopped after {elapsed:.2f}s")
+    print(f"   Upstream calls: {host.quotes.misses:,} (cache hits: {host.quotes.hits:,})")
+    print(f"\n   {'Variant':<20} {'Pair':<10} {'Trades':>6} {'Base':>10} {'Quote':>10} {'Realized':>10} {'Unrealized':>10}")
+    for strategy_id, row in host.summary(marks).items():
+        print(
+            f"   {strategy_id:<20} {row['pair']:<10} {row['trades']:>6} {row['sol_position']:>10.4f} {row['usdc_balance']:>10.2f} "
+            f"{row['realized_pnl_usdc']:>+10.2f} {row['unrealized_pnl_usdc']:>+10.2f}"
+        )
+    if risk:
+        summary = risk.summary()
+        print(f"\n   Risk: {summary['open_positions']} open positions, {summary['exposure_sol']:.4f} SOL exposure, "
+              f"today {summary['daily_pnl_sol']:+.4f} SOL, {summary['rejected']:,} orders refused")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+🔭 POOL SCANNER - watch every Orca whirlpool for volume spikes and momentum
+One whirlpool list request per refresh covers the whole venue
+
+Usage:
+    python scripts/scan_pools.py --interval 60 --top 15
+    python scripts/scan_pools.py --min-tvl 50000 --change 2 --spike 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.orca_client import OrcaClient  # noqa: E402
+from backend.core.pool_scanner import PoolScanner  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank Orca pools by volume spike and momentum")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between refreshes")
+    parser.add_argument("--top", type=int, default=15, help="Candidates to show")
+    parser.add_argument("--min-tvl", type=float, default=10_000.0)
+    parser.add_argument("--min-volume", type=float, default=1_000.0, help="Minimum 24h volume (USD)")
+    parser.add_argument("--spike", type=float, default=4.0, help="Volume spike multiplier")
+    parser.add_argument("--spike-window", type=int, default=20, help="Refreshes in the volume average")
+    parser.add_argument("--change", type=float, default=3.0, help="Momentum threshold (%%)")
+    parser.add_argument("--lookback", type=int, default=10, help="Refreshes in the momentum lookback")
+    args = parser.parse_args()
+
+    scanner = PoolScanner(
+        OrcaClient(),
+        max_points=max(args.spike_window, args.lookback) + 1,
+        min_tvl=args.min_tvl,
+        min_volume_day=args.min_volume,
+        spike_multiplier=args.spike,
+        spike_window=args.spike_window,
+        min_change_pct=args.change,
+        momentum_lookback=args.lookback,
+    )
+
+    print("🔭 POOL SCANNER")
+    print("=" * 70)
+    print(f"   Refresh: {args.interval:g}s, momentum {args.change:g}% over {args.lookback}, "
+          f"spike {args.spike:g}x over {args.spike_window}")
+
+    try:
+        while True:
+            fetch_started = time.perf_counter()
+            try:
+                scanner.refresh()
+            except Exception as e:
+                print(f"⚠️ Pool list fetch failed: {e}")
+                time.sleep(args.interval)
+                continue
+            scan_started = time.perf_counter()
+            candidates = scanner.scan(top_n=args.top)
+            scan_ms = (time.perf_counter() - scan_started) * 1000
+
+            print(f"\n📊 Refresh #{scanner.refresh_count} - {time.strftime('%H:%M:%S')}: "
+                  f"{len(scanner):,} pools, fetch {scan_started - fetch_started:.2f}s, scan {scan_ms:.1f}ms")
+            if not candidates:
+                warming = scanner.refresh_count < max(args.lookback, args.spike_window)
+                print("   (warming up)" if warming else "   No candidates")
+            for rank, c in enumerate(candidates, 1):
+                flags = ("🚀" if c.momentum else "  ") + ("📈" if c.volume_spike else "  ")
+                print(f"   {rank:>2}. {flags} {c.pair:<16} {c.change_pct:+6.2f}%  vol x{c.volume_ratio:5.1f}  "
+                      f"TVL ${c.tvl:>12,.0f}  score {c.score:5.2f}  {c.address[:8]}…")
+
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Scanner stopped")
+
+
+if __name__ == "__main__":
+    main()
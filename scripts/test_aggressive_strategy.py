@@ -59,7 +59,7 @@ class AggressivePriceStrategy(SOLTradingStrategy):
             sol_usdc_rate=self.base_price,
             volume_indicator=random.uniform(0.5, 2.0)
         )
-        self.price_history.append(point)
+        self.record_price(point)
         
         return self.base_price
 
@@ -101,7 +101,7 @@ def run_aggressive_simulation():
         
         # Show price change
         if len(strategy.price_history) > 1:
-            prev_price = strategy.price_history[-2].sol_usdc_rate
+            prev_price = float(strategy.price_history.prices[-2])
             change_pct = ((price - prev_price) / prev_price) * 100
             
             if abs(change_pct) >= 2.0:
@@ -179,7 +179,7 @@ def run_aggressive_simulation():
     print()
     
     # Final analysis
-    final_price = strategy.price_history[-1].sol_usdc_rate
+    final_price = strategy.price_history.latest_price
     final_value = strategy.usdc_balance + (strategy.sol_position * final_price)
     total_pnl = final_value - 300
     roi_pct = (total_pnl / 300) * 100
@@ -205,7 +205,7 @@ def run_aggressive_simulation():
     else:
         print("⚠️ LOSS! Consider adjusting parameters")
     
-    print(f"\n💡 Price range: ${min(p.sol_usdc_rate for p in strategy.price_history):.2f} - ${max(p.sol_usdc_rate for p in strategy.price_history):.2f}")
+    print(f"\n💡 Price range: ${strategy.price_history.prices.min():.2f} - ${strategy.price_history.prices.max():.2f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""
+Test HTTP tape credential masking, recording through httpx and replay matching
+"""
+
+import gzip
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import httpx
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.http_tape import HttpRecorder, HttpReplayer, read_tape, redact_url  # noqa: E402
+
+RPC_URL = "https://x.solana-mainnet.quiknode.pro/SECRETKEY/"
+
+
+def test_credentials_are_masked():
+    assert "SECRETKEY" not in redact_url(RPC_URL)
+    assert "SECRET" not in redact_url("https://mainnet.helius-rpc.com/?api-key=SECRET")
+    assert "TOKEN" not in redact_url("https://discord.com/api/webhooks/123/TOKEN")
+    assert "PATHKEY" not in redact_url("https://node.example.org/PATHKEY", {"node.example.org"})
+    jupiter = "https://quote-api.jup.ag/v6/quote?inputMint=a&amount=1"
+    assert redact_url(jupiter) == jupiter
+
+
+def test_replay_serves_recorded_responses_in_order():
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "session.tape.gz"
+        recorder = HttpRecorder(path, rpc_urls=[RPC_URL])
+        body = b'{"jsonrpc":"2.0","id":1,"method":"getBalance"}'
+        for n in (1, 2):
+            recorder.record("POST", RPC_URL, body, time.perf_counter(), 0.01, 200, {}, f'{{"n":{n}}}'.encode())
+        recorder.close()
+
+        _, exchanges = read_tape(path)
+        assert all("SECRETKEY" not in e.url for e in exchanges)
+
+        replayer = HttpReplayer(path, speed=0, rpc_urls=[RPC_URL])
+        # A different request id still matches by JSON-RPC method, in recorded order
+        other_id = b'{"jsonrpc":"2.0","id":7,"method":"getBalance"}'
+        assert replayer.match("POST", RPC_URL, other_id).content == b'{"n":1}'
+        assert replayer.match("POST", RPC_URL, body).content == b'{"n":2}'
+        assert replayer.match("POST", RPC_URL, body) is None
+        assert replayer.misses == 1
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a gzip-encoded JSON-RPC result."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = gzip.compress(b'{"jsonrpc":"2.0","id":1,"result":42}')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_recorder_passes_gzip_responses_through_httpx():
+    server = HTTPServer(("127.0.0.1", 0), _GzipHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    body = b'{"jsonrpc":"2.0","id":1,"method":"getSlot"}'
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "session.tape.gz"
+            with HttpRecorder(path, rpc_urls=[url]):
+                with httpx.Client(headers={"Accept-Encoding": "gzip"}) as client:
+                    response = client.post(url, content=body)
+            assert response.json()["result"] == 42
+
+            with HttpReplayer(path, speed=0, rpc_urls=[url]):
+                with httpx.Client() as client:
+                    assert client.post(url, content=body).json()["result"] == 42
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -125,7 +125,7 @@ def simulate_trading_session():
     print("🏁 Trading session complete!")
     
     # Final summary
-    final_price = strategy.price_history[-1].sol_usdc_rate if strategy.price_history else 0
+    final_price = strategy.price_history.latest_price if strategy.price_history else 0
     final_value = strategy.usdc_balance + (strategy.sol_position * final_price)
     
     print(f"📈 Final Results:")
@@ -50,7 +50,7 @@ class SimulatedPriceStrategy(SOLTradingStrategy):
             sol_usdc_rate=self.base_price,
             volume_indicator=random.uniform(0.8, 1.2)  # Simulated volume
         )
-        self.price_history.append(point)
+        self.record_price(point)
         
         return self.base_price
 
@@ -97,7 +97,7 @@ def simulate_volatile_trading():
             
             # Show price movement
             if len(strategy.price_history) > 1:
-                prev_price = strategy.price_history[-2].sol_usdc_rate
+                prev_price = float(strategy.price_history.prices[-2])
                 change_pct = ((current_price - prev_price) / prev_price) * 100
                 change_symbol = "📈" if change_pct > 0 else "📉" if change_pct < 0 else "➡️"
                 print(f"   {change_symbol} SOL: ${current_price:.2f} ({change_pct:+.1f}%)")
@@ -175,7 +175,7 @@ def simulate_volatile_trading():
     print("🏁 SIMULATION COMPLETE")
     
     # Final results
-    final_price = strategy.price_history[-1].sol_usdc_rate
+    final_price = strategy.price_history.latest_price
     final_value = strategy.usdc_balance + (strategy.sol_position * final_price)
     total_return = final_value - 200.0
     roi_pct = (total_return / 200.0) * 100
@@ -0,0 +1,105 @@
+"""
+Test SwapExecutor pre-trade checks and settlement against the paper exchange
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.clock import SimulatedClock  # noqa: E402
+from backend.core.events import OrderIntent  # noqa: E402
+from backend.core.paper_exchange import PaperExchange  # noqa: E402
+from backend.core.swap_executor import SwapExecutor  # noqa: E402
+
+PRICE = 150.0
+
+
+def make_executor(sol=1.0, usdc=1_000.0, **venue_kwargs):
+    clock = SimulatedClock(start=1_700_000_000.0)
+    venue = PaperExchange(clock=clock, volatility=0.0, balances={"SOL": sol, "USDC": usdc}, seed=1, **venue_kwargs)
+    venue.set_price("SOL/USDC", PRICE)
+    return venue, SwapExecutor(venue, venue.wallet, clock=clock, min_sol_reserve=0.02, sell_fee_sol=0.003)
+
+
+def buy(usdc, price=PRICE):
+    return OrderIntent("test", "SOL/USDC", "BUY", usdc / price, price, 0.0, metadata={"usdc_amount": usdc})
+
+
+def sell(sol, price=PRICE):
+    return OrderIntent("test", "SOL/USDC", "SELL", sol, price, 0.0, metadata={"position_id": 1})
+
+
+def test_buy_fills_and_moves_balances():
+    venue, executor = make_executor()
+    fill = executor(buy(10.0))
+    assert fill.status == "FILLED", fill.detail
+    assert abs(fill.filled_amount - 10.0 / PRICE) / (10.0 / PRICE) < 0.01
+    assert abs(venue.balances["USDC"] - 990.0) < 1e-9
+
+
+def test_buy_needs_sol_fee_reserve():
+    _, executor = make_executor(sol=0.01)
+    fill = executor(buy(10.0))
+    assert fill.status == "REJECTED"
+    assert "fee reserve" in fill.detail
+
+
+def test_buy_above_pair_max_trade_is_rejected():
+    _, executor = make_executor(usdc=10_000.0)
+    fill = executor(buy(500.0))
+    assert fill.status == "REJECTED"
+    assert "exceeds max" in fill.detail
+
+
+def test_buy_without_enough_quote_is_rejected():
+    _, executor = make_executor(usdc=5.0)
+    fill = executor(buy(10.0))
+    assert fill.status == "REJECTED"
+    assert "USDC balance" in fill.detail
+
+
+def test_exit_sells_whole_position_on_thin_sol_balance():
+    # The wallet holds little more than the position: the exit must not be
+    # blocked by the buy-side reserve, only trimmed by the swap fee
+    venue, executor = make_executor(sol=0.05)
+    fill = executor(sell(0.05))
+    assert fill.status == "FILLED", fill.detail
+    assert abs(fill.filled_amount - (0.05 - 0.003)) < 1e-9
+    assert venue.balances["SOL"] > 0
+
+
+def test_exit_with_sol_below_fee_is_rejected():
+    _, executor = make_executor(sol=0.002)
+    fill = executor(sell(0.05))
+    assert fill.status == "REJECTED"
+    assert "for fees" in fill.detail
+
+
+def test_quote_far_from_signal_price_is_rejected():
+    _, executor = make_executor()
+    fill = executor(buy(10.0, price=PRICE * 0.95))
+    assert fill.status == "REJECTED"
+    assert "worse than" in fill.detail
+
+
+def test_high_price_impact_is_rejected():
+    _, executor = make_executor(liquidity_usd=2_000.0)
+    fill = executor(buy(50.0))
+    assert fill.status == "REJECTED"
+    assert "Price impact" in fill.detail
+
+
+def test_unconfirmed_swap_resolves_to_fill():
+    venue, executor = make_executor(unconfirmed_rate=1.0)
+    fill = executor(buy(10.0))
+    assert fill.status == "UNCONFIRMED"
+    assert fill.filled_amount > 0
+    venue.unconfirmed_rate = 0.0
+    resolved = executor.resolve(fill)
+    assert resolved.status == "FILLED"
+    assert resolved.intent is fill.intent
+    assert resolved.filled_amount == fill.filled_amount
@@ -0,0 +1,43 @@
+"""
+⏱️ TRACE SUMMARY - p50/p95/p99 per tick-to-trade stage
+Reads spans exported with TRACE_FILE (run_live_bot.py) or --trace-file (replay_session.py)
+
+Usage:
+    python scripts/trace_summary.py logs/trace.jsonl
+    python scripts/trace_summary.py logs/trace.jsonl --last 1000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.tracing import format_summary, load_spans, summarize  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency percentiles from a span file")
+    parser.add_argument("path", help="JSONL span file")
+    parser.add_argument("--last", type=int, default=None, help="Only the last N spans")
+    parser.add_argument("--stage", action="append", help="Only these stages (repeatable)")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    if args.last:
+        spans = spans[-args.last:]
+    if args.stage:
+        spans = [s for s in spans if s.stage in args.stage]
+    if not spans:
+        print("No spans")
+        return
+
+    print(f"⏱️ {len(spans):,} spans from {args.path}")
+    print(format_summary(summarize(spans)))
+
+
+if __name__ == "__main__":
+    main()